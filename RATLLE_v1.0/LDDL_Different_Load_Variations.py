@@ -3,6 +3,10 @@ import os, sys
 import psse35
 import psspy
 
+# channel catalogue written next to the simulation csv (LDDL_<bus>_channels.csv), one row per channel:
+# column (position in the csv, time = 0), name, type (FREQ, VOLT, GEN_P, LINE_P, LOAD_P), bus, id, to_bus
+CHANNEL_CATALOGUE_SUFFIX = '_channels.csv'
+
 # setting up some common functions required for all load variation types
 
 def get_loads_at_bus(busnum):
@@ -65,40 +69,83 @@ def initialize_dynamic_simulation():
 
 def set_up_channels(cfg):
     # function for setting up PSSE channel outputs
+    # voltages, generator and load powers are added with one chsb call per quantity over a bus subsystem (as in Step4),
+    # instead of one psspy call per channel. The catalogue rows for those channels come from the a*int/a*char arrays of
+    # the same subsystem, which list elements in the order chsb adds them
     import pandas as pd
     import numpy as np
+    from collections import defaultdict
     network_info = pd.read_csv('Results_'+str(cfg.load_model.load_bus_number)+'\\sys_bus_summary.csv')
     gens = network_info[network_info.PGEN>0]
     branches = pd.read_csv('Results_'+str(cfg.load_model.load_bus_number)+'\\filtered_lines.csv')
     loads = pd.read_csv('Results_'+str(cfg.load_model.load_bus_number)+'\\filtered_load.csv')
     
-    ### Setup plot chanels ###
-    psspy.text(r"""<<< ------ Channel setup ------ >>>""")
-    psspy.delete_all_plot_channels()
-    psspy.bus_frequency_channel([-1, cfg.load_model.load_bus_number])
+    # every channel added is also recorded in a catalogue (type, bus, id, to-bus), in channel order,
+    # so the outputs can later be grouped without parsing channel names (see export_sim_to_csv)
+    channels = []
+    def _record(ierr, kind, bus, ch_id='', to_bus=-1):
+        if ierr == 0:
+            channels.append({'type': kind, 'bus': int(bus), 'id': str(ch_id).strip(), 'to_bus': int(to_bus)})
     
-    for bus_number in network_info.BUS_NUMBER:
-        psspy.voltage_channel([-1,-1,-1,bus_number])
+    # bus -> machine ids and bus -> load ids (in-service), built once for the per-channel fallback
     ierr, gen_bus = psspy.amachint(-1,1,'NUMBER')
     ierr, gen_id = psspy.amachchar(-1,1,'ID')
-    for gen in gens.BUS_NUMBER:
-        idx = [i for i, x in enumerate(gen_bus[0]) if x == gen]
-        for iter_ in idx:
-            psspy.machine_array_channel([-1, 2, gen],gen_id[0][iter_])  #ideally this line should be used. If issues obsreved uncomment chsb command
-    # psspy.chsb(0,1,[-1,-1,-1,1,2,0])
-    for i in range(len(branches)):
-        frombus = branches.iloc[i]['FROMBUS']
-        tobus = branches.iloc[i]['TOBUS']
-        psspy.branch_p_channel([-1,-1,-1,int(frombus),int(tobus)])
+    machines_at = defaultdict(list)
+    for b, i in zip(gen_bus[0], gen_id[0]):
+        machines_at[b].append(i)
     ierr, load_bus = psspy.aloadint(-1,1,'NUMBER')
     ierr, load_id = psspy.aloadchar(-1,1,'ID')
-    tt = loads.BUS_NUMBER.values
-    tt = np.append(tt,cfg.load_model.load_bus_number)
-    for load in tt:
-        idx = [i for i, x in enumerate(load_bus[0]) if x == load]
-        for iter_ in idx:
-            psspy.load_array_channel([-1, 1, load],load_id[0][iter_])  #ideally this line should be used. If issues obsreved uncomment chsb command
-    #psspy.chsb(0,1,[-1,-1,-1,1,25,0])
+    loads_at = defaultdict(list)
+    for b, i in zip(load_bus[0], load_id[0]):
+        loads_at[b].append(i)
+    
+    def _subsystem(sid, buses):
+        buses = [int(x) for x in pd.unique(np.asarray(buses))]
+        psspy.bsys(sid,0,[0.0,0.0],0,[],len(buses),buses,0,[],0,[])
+        return buses
+    
+    ### Setup plot chanels ###
+    psspy.text(r"""<<< ------ Channel setup ------ >>>""")
+    psspy.delete_all_plot_channels()
+    _record(psspy.bus_frequency_channel([-1, cfg.load_model.load_bus_number]), 'FREQ', cfg.load_model.load_bus_number)
+    
+    # bus voltages - subsystem 6
+    buses = _subsystem(6, network_info.BUS_NUMBER)
+    if psspy.chsb(6,0,[-1,-1,-1,1,13,0]) == 0:    # VOLT
+        ierr, sub_bus = psspy.abusint(6,2,'NUMBER')
+        for bus_number in sub_bus[0]:
+            _record(0, 'VOLT', bus_number)
+    else:
+        for bus_number in buses:
+            _record(psspy.voltage_channel([-1,-1,-1,bus_number]), 'VOLT', bus_number)
+    
+    # generator electrical power - subsystem 4
+    buses = _subsystem(4, gens.BUS_NUMBER)
+    if psspy.chsb(4,0,[-1,-1,-1,1,2,0]) == 0:     # PELEC
+        ierr, sub_bus = psspy.amachint(4,1,'NUMBER')
+        ierr, sub_id = psspy.amachchar(4,1,'ID')
+        for gen, mid in zip(sub_bus[0], sub_id[0]):
+            _record(0, 'GEN_P', gen, mid)
+    else:
+        for gen in buses:
+            for mid in machines_at[gen]:
+                _record(psspy.machine_array_channel([-1, 2, gen],mid), 'GEN_P', gen, mid)
+    
+    # tie-line flows - only the filtered lines, one channel each
+    for frombus, tobus in zip(branches['FROMBUS'], branches['TOBUS']):
+        _record(psspy.branch_p_channel([-1,-1,-1,int(frombus),int(tobus)]), 'LINE_P', frombus, '', tobus)
+    
+    # load power, including the loads at the LDDL bus - subsystem 5
+    buses = _subsystem(5, np.append(loads.BUS_NUMBER.values, cfg.load_model.load_bus_number))
+    if psspy.chsb(5,0,[-1,-1,-1,1,25,0]) == 0:    # PLOAD
+        ierr, sub_bus = psspy.aloadint(5,1,'NUMBER')
+        ierr, sub_id = psspy.aloadchar(5,1,'ID')
+        for load, lid in zip(sub_bus[0], sub_id[0]):
+            _record(0, 'LOAD_P', load, lid)
+    else:
+        for load in buses:
+            for lid in loads_at[load]:
+                _record(psspy.load_array_channel([-1, 1, load],lid), 'LOAD_P', load, lid)
     
     #if plotting all channels is desired, then uncomment the following lines instead of the set_up_channels() function
 
@@ -110,8 +157,9 @@ def set_up_channels(cfg):
     # psspy.chsb(0,1,[-1,-1,-1,1,2,0]) # Pelec
     # psspy.chsb(0,1,[-1,-1,-1,1,3,0]) # Qelec
     # psspy.chsb(0,1,[-1,-1,-1,1,25,0]) # Pload
+    return pd.DataFrame(channels, columns=['type', 'bus', 'id', 'to_bus'])
         
-def export_sim_to_csv(outFile,csvFile):
+def export_sim_to_csv(outFile,csvFile,channels=None):
     # =============================================================================
     # Export simulation outputs to csv
     # =============================================================================
@@ -127,6 +175,17 @@ def export_sim_to_csv(outFile,csvFile):
         csv_dict[ch_id[chn_idx]] = ch_data[chn_idx] ### ch_id added as the keys (headings) and ch_data is added as the values (measurements)
     df = pd.DataFrame(csv_dict)
     df.to_csv(csvFile, index=False)
+    
+    # channel catalogue sidecar (from set_up_channels), only when it lines up one-to-one with the csv columns
+    if channels is not None:
+        names = list(df.columns[1:])
+        if len(channels) == len(plot_chns) == len(names) and all(str(b) in n for b, n in zip(channels['bus'], names)):
+            channels = channels.copy()
+            channels.insert(0, 'column', range(1, len(channels)+1))
+            channels.insert(1, 'name', names)
+            channels.to_csv(str(csvFile)[:-len('.csv')] + CHANNEL_CATALOGUE_SUFFIX, index=False)
+        else:
+            print('Channel catalogue does not match the exported channels, not written')
     return df
 #------------------------------------------------
 
@@ -203,7 +262,7 @@ def LDDL_MonoPeriodic_Load_Var(cfg):
         psspy.dyre_add([val_i,val_i,val_i,val_i], dyrFile_CMLD, "","")
     
     initialize_dynamic_simulation()
-    set_up_channels(cfg)
+    channels = set_up_channels(cfg)
 
     ## Setting PSS/E simulation parameters for the dynamic simulation
     dyn_max_iter = 99 
@@ -238,7 +297,7 @@ def LDDL_MonoPeriodic_Load_Var(cfg):
     ## Running without load variation for remaining time
     psspy.run(0, Tot_sim_time, n_prt, n_out_channel, n_CRT_PLT)
         
-    df = export_sim_to_csv(outFile,csvFile)
+    df = export_sim_to_csv(outFile,csvFile,channels)
     
     return(df)
 
@@ -314,7 +373,7 @@ def LDDL_BiPeriodic_Load_Var(cfg):
         psspy.dyre_add([val_i,val_i,val_i,val_i], dyrFile_CMLD, "","")
     
     initialize_dynamic_simulation()
-    set_up_channels(cfg)
+    channels = set_up_channels(cfg)
     
     ## Setting PSS/E simulation parameters for the dynamic simulation
     dyn_max_iter = 99 
@@ -353,7 +412,7 @@ def LDDL_BiPeriodic_Load_Var(cfg):
     ## Running without load variation for remaining time
     psspy.run(0, Tot_sim_time, n_prt, n_out_channel, n_CRT_PLT)
     
-    df = export_sim_to_csv(outFile,csvFile)
+    df = export_sim_to_csv(outFile,csvFile,channels)
     return(df)    
 
 
@@ -422,7 +481,7 @@ def LDDL_Tria_Load_Var(cfg): ## Function to Emulate Triangular Load Variation
         psspy.dyre_add([val_i,val_i,val_i,val_i], dyrFile_CMLD, "","")
     
     initialize_dynamic_simulation()
-    set_up_channels(cfg)
+    channels = set_up_channels(cfg)
     
     ## Setting PSS/E simulation parameters for the dynamic simulation
     dyn_max_iter = 99 
@@ -461,5 +520,5 @@ def LDDL_Tria_Load_Var(cfg): ## Function to Emulate Triangular Load Variation
                 
     ## Running without load variation for remaining time
     psspy.run(0, Tot_sim_time, n_prt, n_out_channel, n_CRT_PLT)
-    df = export_sim_to_csv(outFile,csvFile)
+    df = export_sim_to_csv(outFile,csvFile,channels)
     return(df)
\ No newline at end of file
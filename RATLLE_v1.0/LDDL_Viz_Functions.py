@@ -9,10 +9,15 @@ import cartopy.crs as ccrs
 from matplotlib import cm, colors            # cm & colors both needed
 import cartopy.feature as cfeature
 import os
+import json
+import hashlib
 import matplotlib.lines as mlines
+from matplotlib.collections import LineCollection
 
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
+CHANNEL_CATALOGUE_SUFFIX = "_channels.csv"   # same as in LDDL_Different_Load_Variations.py
+
 # ───────────────────────────────────────────────────────────────
 # 1)  some computation functions
 # ───────────────────────────────────────────────────────────────
@@ -97,6 +102,18 @@ def Read_System_Bus_Lat_Long(BUS_FILE, cfg):
     return(bus_info)
 
 
+def read_channel_catalogue(csv_file, signal_names):
+    # channel catalogue sidecar written by export_sim_to_csv (LDDL_<bus>_channels.csv next to the simulation csv),
+    # one row per channel: column, name, type, bus, id, to_bus. Returns None if missing or not matching the csv columns
+    cat_file = str(csv_file)[:-len('.csv')] + CHANNEL_CATALOGUE_SUFFIX
+    if not os.path.exists(cat_file):
+        return None
+    channels = pd.read_csv(cat_file, dtype={'id': str}, keep_default_na=False).sort_values('column')
+    if len(channels) != len(signal_names) or (channels['column'].to_numpy() != np.arange(1, len(signal_names)+1)).any():
+        print('Channel catalogue '+cat_file+' does not match the simulation csv, parsing channel names instead')
+        return None
+    return channels.reset_index(drop=True)
+
 # ───────────────────────────────────────────────────────────────
 # 3)  Read system data
 # ───────────────────────────────────────────────────────────────
@@ -115,18 +132,28 @@ def Process_LDDL_out_for_Viz(df, cfg):
     signal_vals  = df.iloc[:, 1:].to_numpy()
     
     # Divvying up PSSE output to generator, load, and line values. Currently not logging outputs from other elements
-    # masks with whitespace-tolerant regex
-    is_line = [bool(re.match(r"POWR\s*\d+\s*TO\s*\d+", n)) for n in signal_names] # re.match may fail if there are trailing spaces. can try re.search
-    is_gen  = [bool(re.match(r"POWR\s*\d+", n)) and not l
-               for n, l in zip(signal_names, is_line)]
-    is_load = []
-    for n in signal_names:
-        m = re.search(r"PLOD\s*(\d+)", n)
-        if m:
-            is_load.append(True)
-        else:
-            is_load.append(False)
-    is_v = [x for x in signal_names if 'VOLT' in x]
+    # column groups come from the channel catalogue written with the simulation csv (integer positions, no name parsing);
+    # outputs without a catalogue (older runs) are split with regex on the channel names
+    channels = read_channel_catalogue('Results_'+str(LDDL_bus_number)+'\\LDDL_'+str(LDDL_bus_number)+'.csv', signal_names)
+    if channels is not None:
+        kind = channels['type'].to_numpy()
+        is_line = np.flatnonzero(kind == 'LINE_P')
+        is_gen  = np.flatnonzero(kind == 'GEN_P')
+        is_load = np.flatnonzero(kind == 'LOAD_P')
+        is_v = list(signal_names[np.flatnonzero(kind == 'VOLT')])
+    else:
+        # masks with whitespace-tolerant regex
+        is_line = [bool(re.match(r"POWR\s*\d+\s*TO\s*\d+", n)) for n in signal_names] # re.match may fail if there are trailing spaces. can try re.search
+        is_gen  = [bool(re.match(r"POWR\s*\d+", n)) and not l
+                   for n, l in zip(signal_names, is_line)]
+        is_load = []
+        for n in signal_names:
+            m = re.search(r"PLOD\s*(\d+)", n)
+            if m:
+                is_load.append(True)
+            else:
+                is_load.append(False)
+        is_v = [x for x in signal_names if 'VOLT' in x]
     
     # visually inspecting voltage deviations. Future plans to automate extracting elements where limit violations are observed
     plt.figure()
@@ -168,18 +195,24 @@ def Process_LDDL_out_for_Viz(df, cfg):
     # osc_gen  = vals_gen [time > cfg.load_variation.start_time_s].max(0) - vals_gen [time > cfg.load_variation.start_time_s].min(0)
     # osc_load = vals_load[time > cfg.load_variation.start_time_s].max(0) - vals_load[time > cfg.load_variation.start_time_s].min(0)
 
-    lddl_idx = [i for i, x in enumerate(names_load) if str(LDDL_bus_number) in x and 'LL' in x]
-    lddl_idx = lddl_idx[-1]
-    
     # ───────────────────────────────────────────────────────────────
-    # 4)  Parse bus numbers (skip if fails → -1)
+    # 4)  LDDL source channel and bus numbers (catalogue, or parsed from names - skip if fails → -1)
     # ───────────────────────────────────────────────────────────────
-    def _bus(regex: str, txt: str) -> int:
-        m = re.search(regex, txt)
-        return int(m.group(1)) if m else -1
-    
-    gen_buses  = np.array([_bus(r"POWR\s*(\d+)", n) for n in names_gen])
-    load_buses = np.array([_bus(r"PLOD\s*(\d+)", n) for n in names_load])
+    if channels is not None:
+        load_ch = channels.iloc[is_load]
+        lddl_idx = np.flatnonzero((load_ch['bus'].to_numpy() == int(LDDL_bus_number)) & (load_ch['id'].to_numpy() == 'LL'))[-1]
+        gen_buses  = channels['bus'].to_numpy()[is_gen]
+        load_buses = load_ch['bus'].to_numpy()
+    else:
+        lddl_idx = [i for i, x in enumerate(names_load) if str(LDDL_bus_number) in x and 'LL' in x]
+        lddl_idx = lddl_idx[-1]
+        
+        def _bus(regex: str, txt: str) -> int:
+            m = re.search(regex, txt)
+            return int(m.group(1)) if m else -1
+        
+        gen_buses  = np.array([_bus(r"POWR\s*(\d+)", n) for n in names_gen])
+        load_buses = np.array([_bus(r"PLOD\s*(\d+)", n) for n in names_load])
     
     # keep only valid generator/load entries
     mask = gen_buses != -1
@@ -342,16 +375,131 @@ def LDDL_OscAna_Viz(location, MW_THRESHOLD, osc_line, names_line, osc_gen, gen_b
         return
     
     # ───────────────────────────────────────────────────────────────
-    # 5)  Figure & map - only if latitude and longitude information provided
+    # 5)  Map - projected background is cached per network (section 6), only the overlay is drawn per run
     # ───────────────────────────────────────────────────────────────
-    cmap = plt.get_cmap("jet", 64)   # modern, no deprecation
-    max1 = max(osc_gen)
-    max2 = max(osc_line)
-    max3 = max(osc_load)
-    CMAX = max(max1,max2,max3)
-    norm = colors.Normalize(vmin=MW_THRESHOLD,vmax=CMAX)
-    
-    # --- performance settings ---
+    perturb_bus = int(re.match(r"^(\d+)", location).group(1))
+    render_risk_map(get_base_map(bus_info), location, MW_THRESHOLD,
+                    osc_line, names_line, osc_gen, gen_buses, osc_load, load_buses,
+                    'Results_'+str(perturb_bus)+"\\LDDL_risk_eval_viz_"+str(perturb_bus)+".png")
+
+
+# ───────────────────────────────────────────────────────────────
+# 6)  Cached base map & fast geographic rendering
+# ───────────────────────────────────────────────────────────────
+# Loading and projecting the cartopy features (land, ocean, borders, states) is the
+# slow part of the map. It is done once per network lat/long data: the background with
+# all bus locations is rendered to an image, kept in memory and in BASEMAP_CACHE_DIR
+# (shared by batch workers and later runs), and every run only draws its impacted
+# lines, generators and loads on top. PlateCarree is a plain lon/lat grid, so the
+# overlay uses ordinary matplotlib axes in degrees.
+
+BASEMAP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "basemap_cache")
+BASEMAP_SCALE = "50m"        ## 110m for faster, 10m for high quality
+BASEMAP_MARGIN_DEG = 1.0     # padding around the outermost buses
+BASEMAP_WIDTH_PX = 2400
+_BASE_MAPS = {}              # in-process cache, key -> base map
+
+def _bus_lonlat(bus_info):
+    # one row per bus with coordinates, indexed by bus number
+    xy = bus_info.dropna(subset=["Lat", "Lon"]).drop_duplicates("BUS_NUMBER")
+    return xy.set_index("BUS_NUMBER")[["Lon", "Lat", "BUS_NAME"]]
+
+def get_base_map(bus_info, scale=BASEMAP_SCALE, extent=None, cache_dir=BASEMAP_CACHE_DIR):
+    """
+    Projected background map with every bus of the network, rendered once.
+
+    Parameters
+    ----------
+    bus_info : DataFrame from Read_System_Bus_Lat_Long (needs Lat / Lon).
+    scale : cartopy feature resolution ("110m", "50m", "10m").
+    extent : [lon_min, lon_max, lat_min, lat_max]; default fits all buses.
+    cache_dir : folder for the rendered image (None = memory only).
+
+    Returns
+    -------
+    base : dict with image (RGBA array), extent [lon_min, lon_max, lat_min, lat_max]
+        and xy (DataFrame Lon, Lat, BUS_NAME indexed by bus number).
+    """
+    xy = _bus_lonlat(bus_info)
+    if extent is None:
+        extent = [xy.Lon.min() - BASEMAP_MARGIN_DEG, xy.Lon.max() + BASEMAP_MARGIN_DEG,
+                  xy.Lat.min() - BASEMAP_MARGIN_DEG, xy.Lat.max() + BASEMAP_MARGIN_DEG]
+    extent = [float(v) for v in extent]
+    sha = hashlib.sha1(xy[["Lon", "Lat"]].to_numpy(dtype=float).tobytes())
+    sha.update(json.dumps([scale, extent, BASEMAP_WIDTH_PX]).encode())
+    key = sha.hexdigest()[:16]
+    if key in _BASE_MAPS:
+        return _BASE_MAPS[key]
+
+    png_file = os.path.join(cache_dir, "basemap_"+key+".png") if cache_dir else None
+    meta_file = os.path.join(cache_dir, "basemap_"+key+".json") if cache_dir else None
+    base = None
+    if png_file and os.path.exists(png_file) and os.path.exists(meta_file):
+        try:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            base = {"image": plt.imread(png_file), "extent": meta["extent"], "xy": xy}
+        except (OSError, ValueError, KeyError):
+            base = None                                 # unreadable cache entry: render again
+    if base is None:
+        base = {"image": None, "extent": None, "xy": xy}
+        base["image"], base["extent"] = _render_base_map(xy, scale, extent)
+        if png_file:
+            # parallel batch workers may render the same map: both files go through a
+            # per-process temp file and os.replace, metadata first, so a reader that
+            # finds the PNG always finds complete metadata
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = "."+str(os.getpid())+".tmp"
+            with open(meta_file+tmp, "w") as f:
+                json.dump({"extent": base["extent"], "scale": scale, "n_buses": len(xy)}, f)
+            os.replace(meta_file+tmp, meta_file)
+            plt.imsave(png_file+tmp+".png", base["image"])
+            os.replace(png_file+tmp+".png", png_file)
+    _BASE_MAPS[key] = base
+    return base
+
+def _render_base_map(xy, scale, extent):
+    # the only place cartopy features are loaded and projected
+    aspect = (extent[3] - extent[2]) / (extent[1] - extent[0])
+    dpi = 100
+    fig = plt.figure(figsize=(BASEMAP_WIDTH_PX / dpi, BASEMAP_WIDTH_PX * aspect / dpi), dpi=dpi)
+    ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.PlateCarree())
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+    ax.add_feature(cfeature.LAND.with_scale(scale),   facecolor="lightgray")
+    ax.add_feature(cfeature.OCEAN.with_scale(scale),  facecolor="whitesmoke")
+    ax.add_feature(cfeature.BORDERS.with_scale(scale), linewidth=0.6)
+    ax.add_feature(cfeature.STATES.with_scale(scale),  linewidth=0.4)
+    ax.scatter(xy.Lon, xy.Lat, s=4, c="dimgray", linewidths=0, transform=ccrs.PlateCarree())
+    ax.axis("off")
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    drawn = [float(v) for v in ax.get_extent(crs=ccrs.PlateCarree())]
+    plt.close(fig)
+    return image, drawn
+
+def _degree_label(v, pos, east, west):
+    return f"{abs(v):g}°{east if v >= 0 else west}"
+
+def render_risk_map(base, location, MW_THRESHOLD, osc_line, names_line, osc_gen, gen_buses,
+                    osc_load, load_buses, out_file, cmax=None):
+    """
+    Draws the impacted tie-lines, generators and loads of one run on a cached base
+    map (get_base_map) and saves the figure to out_file. cmax fixes the top of the
+    colour scale (e.g. shared across a sweep); default is the largest amplitude.
+    """
+    xy = base["xy"]
+    osc_line = np.asarray(osc_line if osc_line is not None else [], dtype=float)
+    osc_gen = np.asarray(osc_gen if osc_gen is not None else [], dtype=float)
+    osc_load = np.asarray(osc_load if osc_load is not None else [], dtype=float)
+    names_line = list(names_line if names_line is not None else [])
+    gen_buses = np.asarray(gen_buses if gen_buses is not None else [], dtype=int)
+    load_buses = np.asarray(load_buses if load_buses is not None else [], dtype=int)
+
+    cmap = plt.get_cmap("jet", 64)
+    CMAX = cmax if cmax is not None else max([MW_THRESHOLD] + [a.max() for a in (osc_gen, osc_line, osc_load) if len(a)])
+    norm = colors.Normalize(vmin=MW_THRESHOLD, vmax=CMAX)
+    color_of = lambda mag: cmap(norm(np.minimum(mag, CMAX)))
+
     mpl.rcParams.update({
         "figure.dpi": 110,
         "path.simplify": True,
@@ -359,31 +507,17 @@ def LDDL_OscAna_Viz(location, MW_THRESHOLD, osc_line, names_line, osc_gen, gen_b
         "agg.path.chunksize": 20000,
         "font.size": 8,
     })
-    
-    # --- figure and axis ---
-    fig = plt.figure(figsize=(12, 9))
-    ax = plt.axes(projection=ccrs.PlateCarree())
-    # ax.set_extent([-122, -107, 30, 52], crs=ccrs.PlateCarree())
-    #ax.set_extent([-125, -106.7, 29.7, 54], crs=ccrs.PlateCarree())
-        
-    ax.add_feature(cfeature.LAND.with_scale("50m"),   facecolor="lightgray") ## 110m for faster, 10m for high quality
-    ax.add_feature(cfeature.OCEAN.with_scale("50m"),  facecolor="whitesmoke")
-    ax.add_feature(cfeature.BORDERS.with_scale("50m"), linewidth=0.6)
-    ax.add_feature(cfeature.STATES.with_scale("50m"),  linewidth=0.4)
-    plt.tight_layout()
-    plt.show() 
-    
-    # grid with lat/lon labels
-    gl = ax.gridlines(draw_labels=True, linewidth=0.3, color="gray",
-                      alpha=0.7, linestyle="--")
-    gl.top_labels   = False
-    gl.right_labels = False
-    gl.xlabel_style = {"size": 8}
-    gl.ylabel_style = {"size": 8}
-    
-    # ───────────────────────────────────────────────────────────────
-    # 6)  Plot tie-lines
-    # ───────────────────────────────────────────────────────────────
+    fig, ax = plt.subplots(figsize=(12, 9))
+    ax.imshow(base["image"], extent=base["extent"], origin="upper", zorder=0, interpolation="bilinear")
+    ax.set_xlim(base["extent"][0], base["extent"][1])
+    ax.set_ylim(base["extent"][2], base["extent"][3])
+    ax.set_aspect("equal")
+    ax.grid(linewidth=0.3, color="gray", alpha=0.7, linestyle="--")
+    ax.xaxis.set_major_formatter(mpl.ticker.FuncFormatter(lambda v, p: _degree_label(v, p, "E", "W")))
+    ax.yaxis.set_major_formatter(mpl.ticker.FuncFormatter(lambda v, p: _degree_label(v, p, "N", "S")))
+
+    # tie-lines
+    segs, mags = [], []
     for mag, sig in zip(osc_line, names_line):
         if mag <= MW_THRESHOLD:
             continue
@@ -391,87 +525,83 @@ def LDDL_OscAna_Viz(location, MW_THRESHOLD, osc_line, names_line, osc_gen, gen_b
         if not m:
             continue
         b1, b2 = map(int, m.groups())
-        try:
-            lat_pair = bus_info.loc[bus_info['BUS_NUMBER'] == b1, "Lat"].iat[0], \
-                       bus_info.loc[bus_info['BUS_NUMBER'] == b2, "Lat"].iat[0]
-            lon_pair = bus_info.loc[bus_info['BUS_NUMBER'] == b1, "Lon"].iat[0], \
-                       bus_info.loc[bus_info['BUS_NUMBER'] == b2, "Lon"].iat[0]
-        except IndexError:
-            continue
-        ax.plot(lon_pair, lat_pair, transform=ccrs.Geodetic(),
-                lw=3.5, alpha = 0.8, zorder = 2,c=cmap(norm(min(mag, CMAX))))
-        ax.scatter(lon_pair, lat_pair, s=25, c="k", transform=ccrs.Geodetic())
-    
-    # ───────────────────────────────────────────────────────────────
-    # 7)  Plot generators (triangles, labels)
-    # ───────────────────────────────────────────────────────────────
-     
-    for mag, bus in zip(osc_gen, gen_buses):
-        if mag <= MW_THRESHOLD:
-            continue
-        row = bus_info.loc[bus_info['BUS_NUMBER'] == bus]
-        if row.empty:
-            continue
-        ax.scatter(row.Lon, row.Lat, marker="^", s=500,
-                   edgecolors="k", linewidth=0.4, zorder = 3, transform=ccrs.Geodetic(),c=cmap(norm(min(mag, CMAX)))    )
-        # text label
-        ax.text(row.Lon.values[0] + 0.15,
-                row.Lat.values[0] + 0.15,
-                row['BUS_NAME'].values[0],
-                fontsize=8, weight="bold", transform=ccrs.PlateCarree(),c=cmap(norm(min(mag, CMAX))))
-        
-    # ───────────────────────────────────────────────────────────────
-    # 8)  Plot loads (squares)
-    # ───────────────────────────────────────────────────────────────
-    for mag, bus in zip(osc_load, load_buses):
-        if mag <= MW_THRESHOLD:
-            continue
-        row = bus_info.loc[bus_info['BUS_NUMBER'] == bus]
-        if row.empty:
-            continue
-        ax.scatter(row.Lon, row.Lat, marker="s", s=600,
-                   edgecolors="k", linewidth=0.4, transform=ccrs.Geodetic(),c=cmap(norm(min(mag, CMAX))))
-       
-    # ───────────────────────────────────────────────────────────────
-    # 9)  Perturbation (big empty square)
-    # ───────────────────────────────────────────────────────────────
+        if b1 in xy.index and b2 in xy.index:
+            segs.append([(xy.at[b1, "Lon"], xy.at[b1, "Lat"]), (xy.at[b2, "Lon"], xy.at[b2, "Lat"])])
+            mags.append(mag)
+    if segs:
+        ax.add_collection(LineCollection(segs, colors=color_of(np.array(mags)), linewidths=3.5, alpha=0.8, zorder=2))
+        ends = np.array(segs).reshape(-1, 2)
+        ax.scatter(ends[:, 0], ends[:, 1], s=25, c="k", zorder=2)
+
+    # generators (triangles, labels)
+    keep = (osc_gen > MW_THRESHOLD) & np.isin(gen_buses, xy.index)
+    if keep.any():
+        pts = xy.loc[gen_buses[keep]]
+        c = color_of(osc_gen[keep])
+        ax.scatter(pts.Lon, pts.Lat, marker="^", s=500, c=c, edgecolors="k", linewidth=0.4, zorder=3)
+        for (lon, lat, name), ci in zip(pts.itertuples(index=False), c):
+            ax.text(lon + 0.15, lat + 0.15, name, fontsize=8, weight="bold", c=ci, zorder=4)
+
+    # loads (squares)
+    keep = (osc_load > MW_THRESHOLD) & np.isin(load_buses, xy.index)
+    if keep.any():
+        pts = xy.loc[load_buses[keep]]
+        ax.scatter(pts.Lon, pts.Lat, marker="s", s=600, c=color_of(osc_load[keep]),
+                   edgecolors="k", linewidth=0.4, zorder=2.5)
+
+    # perturbation (big empty square)
     perturb_bus = int(re.match(r"^(\d+)", location).group(1))
-    row = bus_info.loc[bus_info['BUS_NUMBER'] == perturb_bus]
-    ax.scatter(row.Lon, row.Lat, marker="s", s=300,
-               facecolors="none", edgecolors="k", linewidth=1.4,
-               transform=ccrs.Geodetic())
-    
-    # ----- Custom legend handles -----
+    if perturb_bus in xy.index:
+        ax.scatter(xy.at[perturb_bus, "Lon"], xy.at[perturb_bus, "Lat"], marker="s", s=300,
+                   facecolors="none", edgecolors="k", linewidth=1.4, zorder=5)
+
     gen_handle = mlines.Line2D([], [], color="k", marker="^", linestyle="None",
                                markersize=10, label="Generator")
     load_handle = mlines.Line2D([], [], color="k", marker="s", linestyle="None",
                                 markersize=10, label="Load")
     line_handle = mlines.Line2D([], [], color="k", linewidth=2, label="Line")
-     
-    # Add legend
     ax.legend(handles=[gen_handle, load_handle, line_handle],
               loc="lower left", fontsize=10, frameon=True)
 
-    
-    # colour-bar
     sm = cm.ScalarMappable(norm=norm, cmap=cmap)
-    cbar = plt.colorbar(sm, ax=ax, pad=0.02, aspect=25)
+    cbar = fig.colorbar(sm, ax=ax, pad=0.02, aspect=25)
     cbar.set_label("Oscillation Magnitude (ΔMW)", fontsize=12, weight="bold")
     cbar.ax.tick_params(labelsize=10)
-    
-    plt.title(f"Locations where amplitudes >{MW_THRESHOLD} MW are observed for source at {location.replace('_', ' ')}",
-        fontsize=14, weight="bold")
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
-    # # save instead of show
-    plt.savefig(
-        'Results_'+str(perturb_bus)+"\\LDDL_risk_eval_viz_"+str(perturb_bus)+".png",
-        dpi=300,                # resolution
-        bbox_inches="tight",    # trim whitespace
-        pad_inches=0.2          # add a bit of breathing room
-        )
 
+    ax.set_title(f"Locations where amplitudes >{MW_THRESHOLD} MW are observed for source at {location.replace('_', ' ')}",
+                 fontsize=14, weight="bold")
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
+    fig.savefig(out_file, dpi=300, bbox_inches="tight", pad_inches=0.2)
+    plt.close(fig)
+    return out_file
 
-    
-   
-    
+def render_risk_maps(runs, bus_info, MW_THRESHOLD, common_scale=False, **base_map_kw):
+    """
+    Maps for a whole sweep in one call: the base map is rendered (or loaded) once and
+    each run only adds its overlay.
+
+    Parameters
+    ----------
+    runs : list of dicts with keys location, osc_line, names_line, osc_gen, gen_buses,
+        osc_load, load_buses and out_file (first seven as returned by / passed to
+        LDDL_OscAna_Viz).
+    common_scale : same colour scale for every map, so amplitudes compare across runs.
+    base_map_kw : passed to get_base_map (scale, extent, cache_dir).
 
+    Returns
+    -------
+    list of the written image files.
+    """
+    base = get_base_map(bus_info, **base_map_kw)
+    cmax = None
+    if common_scale:
+        cmax = max([MW_THRESHOLD] + [float(np.max(r[k])) for r in runs
+                                     for k in ("osc_line", "osc_gen", "osc_load")
+                                     if r.get(k) is not None and len(r[k])])
+    files = []
+    for r in runs:
+        files.append(render_risk_map(base, r["location"], MW_THRESHOLD,
+                                     r["osc_line"], r["names_line"], r["osc_gen"], r["gen_buses"],
+                                     r["osc_load"], r["load_buses"], r["out_file"], cmax=cmax))
+        print("map saved: " + str(r["out_file"]))
+    return files
@@ -0,0 +1,182 @@
+r'''
+Headless batch mode for the Large Load Risk Assessment tool.
+
+Runs a list of configuration CSVs (same format as input_config_wecc240.csv)
+through the same pipeline as option R of the interactive menu - PSS/E
+simulation, post-processing and visualization - without any prompts, and
+writes one consolidated summary of all runs.
+
+Each configuration runs in its own worker process (PSS/E keeps one case per
+process) and in its own working folder <out>\<config name>, because the
+simulation edits ZIP_Load_.dyr / CMLD_Load_.dyr in place and writes
+Results_<load bus> relative to the working folder. Configurations that use
+the same load bus therefore never overwrite each other.
+
+Usage:
+    python batch_LL_risk_assessment.py                                  # every input_config_*.csv
+    python batch_LL_risk_assessment.py input_config_wecc240.csv input_config_68bus.csv --workers 2
+    python batch_LL_risk_assessment.py sweep\*.csv --out sweep_runs
+'''
+import argparse
+import glob
+import os
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from scenario_menu import load_config_from_csv
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# dyr templates edited in place by the simulation - every run gets its own copy
+RUN_FILES = ['ZIP_Load_.dyr', 'CMLD_Load_.dyr']
+SUMMARY_FILE = 'batch_summary.csv'
+# LDDL_summary_<bus>.csv rows -> column prefix in batch_summary.csv
+SUMMARY_CATEGORIES = {'Generator Injections': 'gen',
+                      'Load Injections': 'load',
+                      'Tie-line flows': 'line'}
+
+
+# ─── helpers ───────────────────────────────────────────────────────────────
+
+def _absolute(path, base):
+    '''Path relative to base unless already absolute (empty stays empty).'''
+    if not path:
+        return path
+    p = Path(str(path))
+    return str(p if p.is_absolute() else Path(base) / p)
+
+
+def collect_outputs(results_folder, bus):
+    '''
+    Per-category figures for the consolidated summary, read from the
+    LDDL_summary_<bus>.csv written by LDDL_OscAna_Viz (gen / load / line:
+    number of instances above the threshold, how many are in the source
+    zone, and the largest oscillation with its location).
+    '''
+    summary_file = results_folder / ('LDDL_summary_' + str(bus) + '.csv')
+    if not summary_file.exists():
+        return {}
+    summary = pd.read_csv(summary_file, index_col=0).set_index('Category')
+    out = {}
+    for category, key in SUMMARY_CATEGORIES.items():
+        if category not in summary.index:
+            continue
+        s = summary.loc[category]
+        inside = float(s['Max Osc. in Source Zone (MW)'])
+        outside = float(s['Max Osc. outside Source Zone (MW)'])
+        out[key + '_instances'] = int(s['Instances >20 MW'])
+        out[key + '_in_source_zone'] = int(s['Instances in Source Zone'])
+        out[key + '_max_osc_MW'] = max(inside, outside)
+        out[key + '_max_loc'] = s['Max Loc. in Source Zone'] if inside >= outside else s['Max Loc. outside Source Zone']
+    return out
+
+
+# ─── one configuration ─────────────────────────────────────────────────────
+
+def run_config(csv_path, out_root):
+    r'''
+    Runs one configuration CSV in <out_root>\<config name> and returns a
+    summary row. Never raises: failures are reported in the 'status' column
+    and the traceback is written to batch_error.txt in the run folder.
+    '''
+    csv_path = Path(csv_path).resolve()
+    launch_dir = Path.cwd()
+    work_dir = Path(out_root).resolve() / csv_path.stem
+    row = {'config': csv_path.name, 'work_dir': str(work_dir), 'status': 'ok'}
+    t0 = time.time()
+    try:
+        cfg = load_config_from_csv(str(csv_path))
+        bus = cfg.load_model.load_bus_number
+        row.update({'load_bus': bus,
+                    'model_type': cfg.load_model.model_type,
+                    'total_load_MW': cfg.load_model.total_load_MW,
+                    'shape': cfg.load_variation.shape,
+                    'freq_primary_hz': cfg.load_variation.freq_primary_hz,
+                    'freq_secondary_hz': cfg.load_variation.freq_secondary_hz})
+
+        work_dir.mkdir(parents=True, exist_ok=True)
+        for name in RUN_FILES:
+            shutil.copy(SCRIPT_DIR / name, work_dir / name)
+        cfg.files.case_file_location = _absolute(cfg.files.case_file_location, launch_dir)
+        cfg.viz.network_latlong_file = _absolute(cfg.viz.network_latlong_file, launch_dir)
+        cfg.files.output_file_location = str(work_dir)
+        os.chdir(work_dir)
+
+        import matplotlib.pyplot as plt
+        from main_LL_risk_assessment import run_scenario
+        plt.switch_backend('Agg')   # no windows in batch mode, figures are saved only
+
+        run_scenario(cfg)
+        plt.close('all')
+        row.update(collect_outputs(work_dir / ('Results_' + str(bus)), bus))
+    except SystemExit as e:
+        row['status'] = 'stopped (exit ' + str(e.code) + ')'
+    except Exception as e:
+        row['status'] = 'error: ' + type(e).__name__ + ': ' + str(e)
+        if work_dir.exists():
+            (work_dir / 'batch_error.txt').write_text(traceback.format_exc())
+    finally:
+        os.chdir(launch_dir)
+    row['runtime_s'] = round(time.time() - t0, 1)
+    return row
+
+
+# ─── batch ─────────────────────────────────────────────────────────────────
+
+def run_batch(config_files, out_root='batch_runs', workers=None):
+    r'''
+    Runs every configuration CSV in parallel worker processes and writes
+    <out_root>\batch_summary.csv (one row per configuration, in input order).
+    '''
+    config_files = [str(Path(f).resolve()) for f in config_files]
+    Path(out_root).mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(config_files)))
+    print('Running ' + str(len(config_files)) + ' configuration(s) on ' + str(workers) + ' worker(s)')
+
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_config, f, out_root): f for f in config_files}
+        for fut in as_completed(futures):
+            row = fut.result()
+            rows[futures[fut]] = row
+            print('  ' + row['config'] + ': ' + row['status'] + ' (' + str(row['runtime_s']) + ' s)')
+
+    summary = pd.DataFrame([rows[f] for f in config_files])
+    summary_file = Path(out_root) / SUMMARY_FILE
+    summary.to_csv(summary_file, index=False)
+    print('Batch summary written to ' + str(summary_file))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run LDDL risk assessment configurations without the interactive menu.')
+    parser.add_argument('configs', nargs='*', help='configuration CSVs or glob patterns (default: input_config_*.csv)')
+    parser.add_argument('--workers', type=int, default=None, help='parallel worker processes (default: number of CPUs); PSS/E licences may limit this')
+    parser.add_argument('--out', default='batch_runs', help='folder for the per-configuration run folders and batch_summary.csv')
+    args = parser.parse_args()
+
+    patterns = args.configs or ['input_config_*.csv']
+    config_files = list(dict.fromkeys(f for p in patterns for f in (sorted(glob.glob(p)) or [p])))
+    missing = [f for f in config_files if not Path(f).is_file()]
+    if missing:
+        print('Configuration file(s) not found: ' + ', '.join(missing))
+        sys.exit(1)
+    stems = [Path(f).stem for f in config_files]
+    if len(set(stems)) != len(stems):
+        print('Configuration file names must be unique (each names its run folder)')
+        sys.exit(1)
+
+    summary = run_batch(config_files, args.out, args.workers)
+    failed = summary[summary['status'] != 'ok']
+    print(str(len(summary) - len(failed)) + ' of ' + str(len(summary)) + ' configuration(s) completed')
+    if len(failed):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,39 @@
+import sys
+from pathlib import Path
+
+# raw_parser.py lives in the repository root, one level up
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+
+def read_case_raw(rawFile):
+    '''
+    Same bus, generator, load and branch tables as the PSS/E queries in
+    system_summary, read from the RAW file with raw_parser (no PSS/E needed):
+    in-service buses, in-service machines aggregated per bus, in-service
+    loads (actual MW) and in-service non-transformer branches (from-end MW).
+    '''
+    import pandas as pd
+    import raw_parser
+
+    tables = raw_parser.parse_raw(rawFile)
+    buses, gens, loads, branches = (tables[k] for k in ('buses', 'generators', 'loads', 'branches'))
+    bus_info = pd.DataFrame({
+        'BUS_NUMBER': buses['BUS_NUM'],
+        'BUS_NAME': buses['NAME'],
+        'BASE_KV': buses['BASKV'],
+        'ZONE': buses['ZONE'],
+        'AREA': buses['AREA'],
+    })
+    name_map = dict(zip(bus_info['BUS_NUMBER'], bus_info['BUS_NAME']))
+    on = gens['STAT'] != 0
+    gen_df = pd.DataFrame({'BUS_NUMBER': gens['BUS_NUM'][on], 'PGEN': gens['PGEN_MW'][on]})
+    gen_df['BUS_NAME'] = gen_df['BUS_NUMBER'].map(name_map)
+    load_df = pd.DataFrame({'BUS_NUMBER': loads['BUS_NUM'], 'PLOAD': loads['PTOTAL_MW']})
+    load_df['BUS_NAME'] = load_df['BUS_NUMBER'].map(name_map)
+    return bus_info, gen_df, load_df, ([branches['FROM_BUS']], [branches['TO_BUS']],
+                                       [branches['CKT']], [branches['P_FROM_MW']])
+
+
 def system_summary(rawFile,target_bus):
     '''
     Setting up which elements in the grid to inspect, 
@@ -5,10 +41,14 @@ def system_summary(rawFile,target_bus):
     Code should be run for set-up before running the main_LL_risk_assessment
     Initial logic - all buses>200kV within specified area, all generator buses with aggregated generation>50 MW, all buses with load connected>100MW
     all lines>100kV within speified area, and lines connecting different zones or areas outside that area higher than 100 kV
+    Without PSS/E (e.g. on Linux) the RAW file is read with raw_parser instead.
     '''
-    import psse35
-    import psspy
     import pandas as pd
+    try:
+        import psse35
+        import psspy
+    except ImportError:
+        psspy = None
     
     # ===============================
     # User selectable inputs
@@ -20,54 +60,58 @@ def system_summary(rawFile,target_bus):
     KV_HIGH_LINE = 100   # kV
     KV_HIGH_LINE_OUTSIDE = 100 #kV
     
-    # ===============================
-    # Initialize and suppress output
-    # ===============================
-    psspy.psseinit(100000)
-    psspy.report_output(2, 'log.txt', [])
-    psspy.progress_output(2, 'log_p.txt', [])
-    psspy.alert_output(1, '', [])
-    psspy.prompt_output(1, '', [])
-    print(rawFile)
-    psspy.readrawversion(1, '35', rawFile) 
-    
-    # ===============================
-    # 1️⃣ Get all buses and metadata
-    # ===============================
-    ierr, all_buses = psspy.abusint(-1, 1, 'NUMBER')
-    ierr, all_bus_names = psspy.abuschar(-1, 1, 'NAME')
-    ierr, base_kv = psspy.abusreal(-1, 1, 'BASE')
-    ierr, zone = psspy.abusint(-1, 1, 'ZONE')
-    ierr, area = psspy.abusint(-1, 1, 'AREA')
-    
-    bus_info = pd.DataFrame({
-        'BUS_NUMBER': all_buses[0],
-        'BUS_NAME': all_bus_names[0],
-        'BASE_KV': base_kv[0],
-        'ZONE': zone[0],
-        'AREA': area[0],
-    })
+    if psspy is None:
+        print(rawFile + ' (PSS/E not available, reading the RAW file directly)')
+        bus_info, gen_df, load_df, (from_bus, to_bus, ckt_id, flow) = read_case_raw(rawFile)
+    else:
+        # ===============================
+        # Initialize and suppress output
+        # ===============================
+        psspy.psseinit(100000)
+        psspy.report_output(2, 'log.txt', [])
+        psspy.progress_output(2, 'log_p.txt', [])
+        psspy.alert_output(1, '', [])
+        psspy.prompt_output(1, '', [])
+        print(rawFile)
+        psspy.readrawversion(1, '35', rawFile) 
+    
+        # ===============================
+        # 1️⃣ Get all buses and metadata
+        # ===============================
+        ierr, all_buses = psspy.abusint(-1, 1, 'NUMBER')
+        ierr, all_bus_names = psspy.abuschar(-1, 1, 'NAME')
+        ierr, base_kv = psspy.abusreal(-1, 1, 'BASE')
+        ierr, zone = psspy.abusint(-1, 1, 'ZONE')
+        ierr, area = psspy.abusint(-1, 1, 'AREA')
+    
+        bus_info = pd.DataFrame({
+            'BUS_NUMBER': all_buses[0],
+            'BUS_NAME': all_bus_names[0],
+            'BASE_KV': base_kv[0],
+            'ZONE': zone[0],
+            'AREA': area[0],
+        })
+    
+        # ===============================
+        # 2️⃣ Generator aggregation per bus
+        # ===============================
+        ierr, gen_buses = psspy.agenbusint(-1, 1, 'NUMBER')
+        ierr, gen_bus_names = psspy.agenbuschar(-1, 1, 'NAME')
+        ierr, pgen = psspy.agenbusreal(-1, 1, 'PGEN')
+    
+        gen_df = pd.DataFrame({'BUS_NUMBER': gen_buses[0], 'BUS_NAME': gen_bus_names[0], 'PGEN': pgen[0]})
+    
+        # ===============================
+        # 3️⃣ Load aggregation per bus
+        # ===============================
+        ierr, load_buses = psspy.aloadint(-1, 1, 'NUMBER')
+        ierr, load_bus_names = psspy.aloadchar(-1, 1, 'NAME')
+        ierr, pload = psspy.aloadreal(-1, 1, 'TOTALACT')
+    
+        load_df = pd.DataFrame({'BUS_NUMBER': load_buses[0], 'BUS_NAME': load_bus_names[0], 'PLOAD': pload[0]})
     
     TARGET_AREA = bus_info[bus_info.BUS_NUMBER==target_bus].AREA.iloc[0]
-    
-    # ===============================
-    # 2️⃣ Generator aggregation per bus
-    # ===============================
-    ierr, gen_buses = psspy.agenbusint(-1, 1, 'NUMBER')
-    ierr, gen_bus_names = psspy.agenbuschar(-1, 1, 'NAME')
-    ierr, pgen = psspy.agenbusreal(-1, 1, 'PGEN')
-    
-    gen_df = pd.DataFrame({'BUS_NUMBER': gen_buses[0], 'BUS_NAME': gen_bus_names[0], 'PGEN': pgen[0]})
     bus_gen = gen_df.groupby('BUS_NUMBER', as_index=False)['PGEN'].sum()
-    
-    # ===============================
-    # 3️⃣ Load aggregation per bus
-    # ===============================
-    ierr, load_buses = psspy.aloadint(-1, 1, 'NUMBER')
-    ierr, load_bus_names = psspy.aloadchar(-1, 1, 'NAME')
-    ierr, pload = psspy.aloadreal(-1, 1, 'TOTALACT')
-    
-    load_df = pd.DataFrame({'BUS_NUMBER': load_buses[0], 'BUS_NAME': load_bus_names[0], 'PLOAD': pload[0]})
     bus_load = load_df.groupby('BUS_NUMBER', as_index=False)['PLOAD'].sum()
     
     # ===============================
@@ -91,10 +135,11 @@ def system_summary(rawFile,target_bus):
     # ===============================
     # 6️⃣ Transmission lines
     # ===============================
-    ierr, from_bus = psspy.abrnint(-1, 1, 1, 1, 1, ['FROMNUMBER'])
-    ierr, to_bus = psspy.abrnint(-1, 1, 1, 1, 1, ['TONUMBER'])
-    ierr, ckt_id = psspy.abrnchar(-1, 1, 1, 1, 1, ['ID'])
-    ierr, flow = psspy.abrnreal(sid=-1, string='P')
+    if psspy is not None:
+        ierr, from_bus = psspy.abrnint(-1, 1, 1, 1, 1, ['FROMNUMBER'])
+        ierr, to_bus = psspy.abrnint(-1, 1, 1, 1, 1, ['TONUMBER'])
+        ierr, ckt_id = psspy.abrnchar(-1, 1, 1, 1, 1, ['ID'])
+        ierr, flow = psspy.abrnreal(sid=-1, string='P')
     
     import numpy as np
     kv_filtered = bus_combined.set_index('BUS_NUMBER').loc[from_bus[0]]
@@ -134,14 +179,13 @@ def system_summary(rawFile,target_bus):
     # ===============================
     # 8️⃣ Save outputs
     # ===============================
-    from pathlib import Path
     folder_name = f"Results_{target_bus}"
     Path(folder_name).mkdir(parents=True, exist_ok=True)
 
-    gen_filtered.to_csv(folder_name + "\\filtered_gen.csv",index=False)
-    load_filtered.to_csv(folder_name + "\\filtered_load.csv",index=False)
-    bus_filtered.to_csv(folder_name + "\\filtered_buses.csv", index=False)
-    lines_filtered.to_csv(folder_name + "\\filtered_lines.csv", index=False)
+    gen_filtered.to_csv(Path(folder_name) / "filtered_gen.csv",index=False)
+    load_filtered.to_csv(Path(folder_name) / "filtered_load.csv",index=False)
+    bus_filtered.to_csv(Path(folder_name) / "filtered_buses.csv", index=False)
+    lines_filtered.to_csv(Path(folder_name) / "filtered_lines.csv", index=False)
     
     line_filtered_A = lines_filtered[['FROMBUS','FROM_KV','FROM_ZONE','FROM_AREA']]
     line_filtered_A.columns = ['BUS_NUMBER', 'BASE_KV', 'ZONE', 'AREA']
@@ -151,7 +195,7 @@ def system_summary(rawFile,target_bus):
     line_filtered_B['BUS_NAME']=None
     
     combined = pd.concat([gen_filtered,load_filtered,bus_filtered, line_filtered_A, line_filtered_B], ignore_index=True).drop_duplicates()
-    combined.to_csv(folder_name + '\\sys_bus_summary.csv')
+    combined.to_csv(Path(folder_name) / 'sys_bus_summary.csv')
     
     print("\n✅ Saved filtered_buses.csv and filtered_lines.csv")
     print(f"Gen retained: {len(gen_filtered)}")
@@ -5,6 +5,11 @@ To provide feedback or report bugs, please email shuchismita.biswas@pnnl.gov
 This script extracts case information from PSSE raw files for convenient data 
 processing in the subsequent analysis. This script needs to be run only once
 when starting to analyze a new case. Tested with PSSE 35.
+Re-running it is cheap: if the RAW file and solver options match the
+fingerprint recorded in Processing/case_fingerprint.json and all outputs
+exist, extraction is skipped (force_recompute = 1 in the config overrides).
+Without PSS/E (or with extract_engine = raw) the tables are read straight
+from the RAW file by raw_parser.py.
 
 Outputs (one CSV per element type):
   <case>_buses.csv        - Bus topology + voltage limits + solved V/theta + injections
@@ -14,13 +19,23 @@ Outputs (one CSV per element type):
   <case>_zones.csv        - Zone names
   <case>_areas.csv        - Area interchange schedule vs. actual
   <case>_interarea.csv    - Inter-area tie-line transfers
+  <case>_case.h5 / .npz   - All of the above in one typed columnar store
+                            (see case_store.py; HDF5 if h5py is installed)
+
+Each table is assembled as NumPy columns straight from the abus*/abrn*/
+amach*/aload* array outputs; bus attributes are joined by bus number with
+a sorted search instead of per-row dictionary lookups.
 """
 
 
 import os, sys, csv
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from psse_config import configure_psse
+import case_store
+import case_fingerprint
+import raw_parser
 
 
 
@@ -32,6 +47,9 @@ def init_psse():
     import redirect
     redirect.psse2py()
 
+# Power flow solution options (fnsl/fdns option array); part of the case fingerprint
+PF_OPTIONS = [0, 0, 0, 1, 1, 0, 0, 0]
+
 # Power flow solver
 def solve_power_flow(method='FNSL'):
     """
@@ -42,9 +60,9 @@ def solve_power_flow(method='FNSL'):
         'FDNS' - Fast Decoupled Newton-Raphson
     """
     if method == 'FDNS':
-        ierr = psspy.fdns([0, 0, 0, 1, 1, 0, 0, 0])
+        ierr = psspy.fdns(PF_OPTIONS)
     else:
-        ierr = psspy.fnsl([0, 0, 0, 1, 1, 0, 0, 0])
+        ierr = psspy.fnsl(PF_OPTIONS)
 
     if ierr == 0:
         print("  Power flow converged successfully.")
@@ -53,16 +71,54 @@ def solve_power_flow(method='FNSL'):
               "Results extracted from last iteration.")
     return ierr
 
+# Helper: psspy array outputs -> NumPy columns
+#   A table is a dict {column name: 1-D NumPy array}, all of equal length.
+
+def _col(arr, n, dtype=float, default=0.0):
+    """Real/int psspy array as a column (default-filled when not returned)."""
+    if arr and arr[0]:
+        return np.asarray(arr[0], dtype=dtype)
+    return np.full(n, default, dtype=dtype)
+
+def _cplx(arr, n):
+    """Complex psspy array split into (real, imag) columns."""
+    z = _col(arr, n, dtype=complex, default=0.0)
+    return z.real.copy(), z.imag.copy()
+
+def _chr(arr, n, default=''):
+    """Character psspy array as a stripped str column."""
+    if arr and arr[0]:
+        return np.char.strip(np.asarray(arr[0], dtype=str)).astype(object)
+    return np.full(n, default, dtype=object)
+
+def _bus_attr(buses, bus, col, default):
+    """Vectorized per-row lookup of a bus attribute (default if bus unknown)."""
+    nums  = buses['BUS_NUM']
+    if len(nums) == 0:
+        return np.full(len(bus), default, dtype=type(default))
+    order = np.argsort(nums, kind='stable')
+    pos   = np.clip(np.searchsorted(nums[order], bus), 0, len(nums) - 1)
+    hit   = nums[order][pos] == bus
+    return np.where(hit, buses[col][order][pos], default)
+
+def write_table(output_file, table, label):
+    """Write a table to CSV in its column order."""
+    cols = [v.tolist() for v in table.values()]
+    n    = len(cols[0]) if cols else 0
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(table))
+        writer.writerows(zip(*cols))
+    print(f"  {output_file}: {n} {label}")
+
 # Helper: Bus information lookup
 
-def build_bus_lookups():
+def build_bus_table():
     """
-    Query bus attributes and return lookup dicts keyed by bus number.
+    Query bus attributes in bulk and return the bus table.
 
-    Returns
-    -------
-    dict of {bus_num -> value} for: kv, vm_pu, va_deg, area, zone
-    Also returns the raw arrays for use in extract_buses().
+    The table also serves as the bus lookup (kV, V, angle, area, zone) for
+    the branch, generator and load extractors via _bus_attr().
     """
     ierr, bus_num = psspy.abusint(-1, 1, 'NUMBER')
     ierr, bus_type = psspy.abusint(-1, 1, 'TYPE')
@@ -81,65 +137,25 @@ def build_bus_lookups():
     ierr, bus_name = psspy.abuschar(-1, 1, 'NAME')
 
     n = len(bus_num[0])
-    nums = bus_num[0]
-
-    # Pre-build lookup dicts for downstream use
-    kv_lu = {nums[i]: bus_kv[0][i] for i in range(n)}
-    vm_lu = {nums[i]: bus_vm[0][i] for i in range(n)}
-    va_lu = {nums[i]: bus_va[0][i] for i in range(n)}
-    area_lu = {nums[i]: bus_area[0][i] for i in range(n)}
-    zone_lu = {nums[i]: bus_zone[0][i] for i in range(n)}
-
-    # Bundle raw arrays
-    raw = dict(
-        num=bus_num, type=bus_type, area=bus_area, zone=bus_zone, owner=bus_owner,
-        kv=bus_kv, vm=bus_vm, va=bus_va,
-        nvhi=bus_nvhi, nvlo=bus_nvlo, evhi=bus_evhi, evlo=bus_evlo,
-        name=bus_name
-    )
-
-    return kv_lu, vm_lu, va_lu, area_lu, zone_lu, raw
-
-# CSV Extractors
-
-def extract_buses(output_file, raw):
-    """
-    Write bus CSV combining:
-      - Static topology  : base kV, type, area, zone, owner, voltage limits
-      - Solved power flow results   : solved V (pu), angle (deg)
-    """
-    headers = [
-        'BUS_NUM', 'NAME', 'BASKV', 'TYPE', 'AREA', 'ZONE', 'OWNER',
-        'VM_PU', 'VA_DEG',
-        'NVHI', 'NVLO', 'EVHI', 'EVLO'
-    ]
-
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-
-        n = len(raw['num'][0])
-        for i in range(n):
-
-            writer.writerow([
-                raw['num'][0][i],
-                raw['name'][0][i].strip() if raw['name'] and raw['name'][0] else '',
-                raw['kv'][0][i],
-                raw['type'][0][i],
-                raw['area'][0][i],
-                raw['zone'][0][i],
-                raw['owner'][0][i],
-                raw['vm'][0][i],
-                raw['va'][0][i],
-                raw['nvhi'][0][i], raw['nvlo'][0][i],
-                raw['evhi'][0][i], raw['evlo'][0][i],
-                           ])
-
-    print(f"  {output_file}: {n} buses")
-
-def extract_branches(output_file, kv_lu):
+    return {
+        'BUS_NUM': _col(bus_num, n, int, 0),
+        'NAME':    _chr(bus_name, n),
+        'BASKV':   _col(bus_kv, n),
+        'TYPE':    _col(bus_type, n, int, 0),
+        'AREA':    _col(bus_area, n, int, 0),
+        'ZONE':    _col(bus_zone, n, int, 0),
+        'OWNER':   _col(bus_owner, n, int, 0),
+        'VM_PU':   _col(bus_vm, n),
+        'VA_DEG':  _col(bus_va, n),
+        'NVHI':    _col(bus_nvhi, n), 'NVLO': _col(bus_nvlo, n),
+        'EVHI':    _col(bus_evhi, n), 'EVLO': _col(bus_evlo, n),
+    }
+
+# Table extractors
+
+def extract_branches(buses):
     """
-    Write branch CSV combining:
+    Branch table combining:
       - Static parameters : R, X, B, RATE A/B/C, length, meter end
       - Solved results    : MW & Mvar flows, MVA loading %, MW & Mvar losses
     """
@@ -165,46 +181,30 @@ def extract_branches(output_file, kv_lu):
     ierr, br_ploss = psspy.abrnreal(-1, 1, 1, 1, 1, 'PLOSS')
     ierr, br_qloss = psspy.abrnreal(-1, 1, 1, 1, 1, 'QLOSS')
 
-    headers = [
-        'FROM_BUS', 'TO_BUS', 'CKT', 'STAT',
-        'R_PU', 'X_PU', 'B_PU',
-        'RATE_A_MVA', 'RATE_B_MVA', 'RATE_C_MVA', 'LENGTH', 'MET',
-        'FROM_KV', 'TO_KV', 'P_FROM_MW', 'Q_FROM_MVAR',
-        'MVA', 'LOADING_PCT', 'PLOSS_MW', 'QLOSS_MVAR'
-    ]
-
-    def _r(arr, i, default=0.0):
-        return arr[0][i] if arr and arr[0] else default
-
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-
-        n = len(br_from[0])
-        for i in range(n):
-            fb, tb = br_from[0][i], br_to[0][i]
-            writer.writerow([
-                fb, tb,
-                br_id[0][i].strip() if br_id and br_id[0] else '',
-                br_stat[0][i],
-                br_rx[0][i].real if br_rx and br_rx[0] else 0.0,
-                br_rx[0][i].imag if br_rx and br_rx[0] else 0.0,
-                _r(br_b, i),
-                _r(br_rate1, i), _r(br_rate2, i), _r(br_rate3, i),
-                _r(br_len, i),
-                br_met[0][i],
-                kv_lu.get(fb, 0.0), kv_lu.get(tb, 0.0),
-                br_pq_from[0][i].real if br_pq_from and br_pq_from[0] else 0.0,
-                br_pq_from[0][i].imag if br_pq_from and br_pq_from[0] else 0.0,
-                _r(br_mva, i), _r(br_pct, i),
-                _r(br_ploss, i), _r(br_qloss, i)
-            ])
-
-    print(f"  {output_file}: {n} branches")
-
-def extract_generators(output_file, kv_lu, vm_lu, va_lu, area_lu, zone_lu):
+    n = len(br_from[0])
+    fb, tb = _col(br_from, n, int, 0), _col(br_to, n, int, 0)
+    r, x = _cplx(br_rx, n)
+    p, q = _cplx(br_pq_from, n)
+
+    return {
+        'FROM_BUS': fb, 'TO_BUS': tb,
+        'CKT':  _chr(br_id, n),
+        'STAT': _col(br_stat, n, int, 0),
+        'R_PU': r, 'X_PU': x, 'B_PU': _col(br_b, n),
+        'RATE_A_MVA': _col(br_rate1, n), 'RATE_B_MVA': _col(br_rate2, n),
+        'RATE_C_MVA': _col(br_rate3, n),
+        'LENGTH': _col(br_len, n),
+        'MET':  _col(br_met, n, int, 0),
+        'FROM_KV': _bus_attr(buses, fb, 'BASKV', 0.0),
+        'TO_KV':   _bus_attr(buses, tb, 'BASKV', 0.0),
+        'P_FROM_MW': p, 'Q_FROM_MVAR': q,
+        'MVA': _col(br_mva, n), 'LOADING_PCT': _col(br_pct, n),
+        'PLOSS_MW': _col(br_ploss, n), 'QLOSS_MVAR': _col(br_qloss, n),
+    }
+
+def extract_generators(buses):
     """
-    Write generator CSV combining:
+    Generator table combining:
       - Static info : Pmax/Pmin, Qmax/Qmin, Mbase, area, zone
       - Solved dispatch   : Pgen, Qgen, loading % relative to Pmax
     """
@@ -221,45 +221,28 @@ def extract_generators(output_file, kv_lu, vm_lu, va_lu, area_lu, zone_lu):
     ierr, gen_mbase = psspy.amachreal(-1, 4, 'MBASE')
     ierr, gen_pct = psspy.amachreal(-1, 4, 'PERCENT')   # solved loading %
 
-    headers = [
-        'BUS_NUM', 'ID', 'STAT', 'AREA', 'ZONE',
-        'PGEN_MW', 'QGEN_MVAR',
-        'PMAX_MW', 'PMIN_MW', 'QMAX_MVAR', 'QMIN_MVAR',
-        'MBASE_MVA', 'LOADING_PCT',
-        'BUS_KV', 'VM_PU', 'VA_DEG'
-    ]
-
-    def _r(arr, i, default=0.0):
-        return arr[0][i] if arr and arr[0] else default
-
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-
-        n = len(gen_bus[0])
-        for i in range(n):
-            bus = gen_bus[0][i]
-            writer.writerow([
-                bus,
-                gen_id[0][i].strip() if gen_id and gen_id[0] else '',
-                gen_stat[0][i],
-                area_lu.get(bus, 0),
-                zone_lu.get(bus, 0),
-                _r(gen_pg, i), _r(gen_qg, i),
-                _r(gen_pt, i), _r(gen_pb, i),
-                _r(gen_qt, i), _r(gen_qb, i),
-                _r(gen_mbase, i),
-                _r(gen_pct, i),
-                kv_lu.get(bus, 0.0),
-                vm_lu.get(bus, 0.0),
-                va_lu.get(bus, 0.0)
-            ])
-
-    print(f"  {output_file}: {n} generators")
-
-def extract_loads(output_file, kv_lu, vm_lu, va_lu):
+    n = len(gen_bus[0])
+    bus = _col(gen_bus, n, int, 0)
+
+    return {
+        'BUS_NUM': bus,
+        'ID':   _chr(gen_id, n),
+        'STAT': _col(gen_stat, n, int, 0),
+        'AREA': _bus_attr(buses, bus, 'AREA', 0),
+        'ZONE': _bus_attr(buses, bus, 'ZONE', 0),
+        'PGEN_MW': _col(gen_pg, n), 'QGEN_MVAR': _col(gen_qg, n),
+        'PMAX_MW': _col(gen_pt, n), 'PMIN_MW': _col(gen_pb, n),
+        'QMAX_MVAR': _col(gen_qt, n), 'QMIN_MVAR': _col(gen_qb, n),
+        'MBASE_MVA': _col(gen_mbase, n),
+        'LOADING_PCT': _col(gen_pct, n),
+        'BUS_KV': _bus_attr(buses, bus, 'BASKV', 0.0),
+        'VM_PU':  _bus_attr(buses, bus, 'VM_PU', 0.0),
+        'VA_DEG': _bus_attr(buses, bus, 'VA_DEG', 0.0),
+    }
+
+def extract_loads(buses):
     """
-    Write load CSV combining:
+    Load table combining:
       - ZIP model components  : constant-power (PL/QL), constant-current (IP/IQ),
                                 constant-admittance (YP/YQ)
       - Solved actual totals  : MVAACT (voltage-adjusted), TOTALACT
@@ -283,50 +266,34 @@ def extract_loads(output_file, kv_lu, vm_lu, va_lu):
     # Solved total (voltage-corrected sum of all ZIP components)
     ierr, load_total = psspy.aloadcplx(-1, 1, 'TOTALACT')
 
-    headers = [
-        'BUS_NUM', 'ID', 'STAT', 'AREA', 'ZONE', 'OWNER',
-        'PL_MW', 'QL_MVAR',         # constant-power (Z)
-        'IP_MW', 'IQ_MVAR',         # constant-current (I)
-        'YP_MW', 'YQ_MVAR',         # constant-admittance (P)
-        'PTOTAL_MW', 'QTOTAL_MVAR',  # solved total (all components)
-        'BUS_KV', 'VM_PU', 'VA_DEG'
-    ]
-
-    def _c(arr, i, part='real', default=0.0):
-        if not (arr and arr[0]):
-            return default
-        return arr[0][i].real if part == 'real' else arr[0][i].imag
-
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-
-        n = len(load_bus[0])
-        for i in range(n):
-            bus = load_bus[0][i]
-            writer.writerow([
-                bus,
-                load_id[0][i].strip() if load_id and load_id[0] else '',
-                load_stat[0][i],
-                load_area[0][i],
-                load_zone[0][i],
-                load_owner[0][i],
-                _c(load_mva, i, 'real'), _c(load_mva, i, 'imag'),
-                _c(load_il,  i, 'real'), _c(load_il,  i, 'imag'),
-                _c(load_yl,  i, 'real'), _c(load_yl,  i, 'imag'),
-                _c(load_total, i, 'real'), _c(load_total, i, 'imag'),
-                kv_lu.get(bus, 0.0),
-                vm_lu.get(bus, 0.0),
-                va_lu.get(bus, 0.0)
-            ])
-
-    print(f"  {output_file}: {n} loads")
+    n = len(load_bus[0])
+    bus = _col(load_bus, n, int, 0)
+    pl, ql = _cplx(load_mva, n)
+    ip, iq = _cplx(load_il, n)
+    yp, yq = _cplx(load_yl, n)
+    pt, qt = _cplx(load_total, n)
+
+    return {
+        'BUS_NUM': bus,
+        'ID':    _chr(load_id, n),
+        'STAT':  _col(load_stat, n, int, 0),
+        'AREA':  _col(load_area, n, int, 0),
+        'ZONE':  _col(load_zone, n, int, 0),
+        'OWNER': _col(load_owner, n, int, 0),
+        'PL_MW': pl, 'QL_MVAR': ql,              # constant-power (Z)
+        'IP_MW': ip, 'IQ_MVAR': iq,              # constant-current (I)
+        'YP_MW': yp, 'YQ_MVAR': yq,              # constant-admittance (P)
+        'PTOTAL_MW': pt, 'QTOTAL_MVAR': qt,      # solved total (all components)
+        'BUS_KV': _bus_attr(buses, bus, 'BASKV', 0.0),
+        'VM_PU':  _bus_attr(buses, bus, 'VM_PU', 0.0),
+        'VA_DEG': _bus_attr(buses, bus, 'VA_DEG', 0.0),
+    }
     
 
 # optional - area information is just for information and decision making
 
-def extract_areas(output_file):
-    """Write area interchange schedule vs. actual generation/load."""
+def extract_areas():
+    """Area table: interchange schedule vs. actual generation/load."""
     ierr, area_num = psspy.aareaint(-1, 1, 'NUMBER')
     ierr, area_isw = psspy.aareaint(-1, 1, 'ISW')
     ierr, area_pdes = psspy.aareareal(-1, 1, 'PDES')
@@ -336,27 +303,19 @@ def extract_areas(output_file):
     ierr, area_pload = psspy.aareareal(-1, 1, 'PLOAD')
     ierr, area_name = psspy.aareachar(-1, 1, 'ARNAME')
 
-    def _r(arr, i, default=0.0):
-        return arr[0][i] if arr and arr[0] else default
+    n = len(area_num[0])
+    return {
+        'AREA_NUM':  _col(area_num, n, int, 0),
+        'AREA_NAME': _chr(area_name, n),
+        'ISW':   _col(area_isw, n, int, 0),
+        'PDES':  _col(area_pdes, n), 'PTOL': _col(area_ptol, n),
+        'PNET':  _col(area_pnet, n),
+        'PGEN':  _col(area_pgen, n), 'PLOAD': _col(area_pload, n),
+    }
 
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['AREA_NUM', 'AREA_NAME', 'ISW',
-                        'PDES', 'PTOL', 'PNET', 'PGEN', 'PLOAD'])
-        for i in range(len(area_num[0])):
-            writer.writerow([
-                area_num[0][i],
-                area_name[0][i].strip() if area_name and area_name[0] else '',
-                _r(area_isw, i, 0),
-                _r(area_pdes, i), _r(area_ptol, i), _r(area_pnet, i),
-                _r(area_pgen, i), _r(area_pload, i)
-            ])
-
-    print(f"  {output_file}: {len(area_num[0])} areas")
-
-
-def extract_interarea(output_file):
-    """Write inter-area tie scheduled vs. actual transfers (gracefully handles missing data)."""
+
+def extract_interarea():
+    """Inter-area tie table: scheduled vs. actual transfers (empty if none defined)."""
     headers = ['FROM_AREA', 'TO_AREA', 'CKT', 'PDES', 'PTOL', 'PACT']
 
     try:
@@ -370,60 +329,47 @@ def extract_interarea(output_file):
         if ierr != 0 or not ixfr_from or not ixfr_from[0]:
             raise ValueError("No inter-area data found")
 
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            for i in range(len(ixfr_from[0])):
-                writer.writerow([
-                    ixfr_from[0][i],
-                    ixfr_to[0][i],
-                    ixfr_id[0][i].strip() if ixfr_id else '1',
-                    ixfr_pdes[0][i],
-                    ixfr_ptol[0][i],
-                    ixfr_pact[0][i]
-                ])
-        print(f"  {output_file}: {len(ixfr_from[0])} inter-area transfers")
+        n = len(ixfr_from[0])
+        return dict(zip(headers, [
+            _col(ixfr_from, n, int, 0),
+            _col(ixfr_to, n, int, 0),
+            _chr(ixfr_id, n, default='1'),
+            _col(ixfr_pdes, n),
+            _col(ixfr_ptol, n),
+            _col(ixfr_pact, n),
+        ]))
 
     except Exception:
-        with open(output_file, 'w', newline='') as f:
-            csv.writer(f).writerow(headers)
-        print(f"  {output_file}: 0 inter-area transfers (none defined in case)")
+        print("  inter-area transfers: none defined in case")
+        dtypes = [int, int, object, float, float, float]
+        return {h: np.array([], dtype=d) for h, d in zip(headers, dtypes)}
 
 # ---------------------------------------------------------------------------
 # System summary  (printed to console)
 # ---------------------------------------------------------------------------
 
-def print_system_summary(raw, kv_lu):
+def print_system_summary(tables):
     """
-    Print a system-wide MW/Mvar balance using data already held in memory.
-    Uses the raw bus arrays from build_bus_lookups() for bus/branch counts,
-    and makes two small additional queries for generation/loss totals.
+    Print a system-wide MW/Mvar balance from the extracted tables
+    (no further PSS/E queries).
     """
-    ierr, gen_pg = psspy.amachreal(-1, 4, 'PGEN')
-    ierr, gen_qg = psspy.amachreal(-1, 4, 'QGEN')
-    ierr, load_tot = psspy.aloadcplx(-1, 1, 'TOTALACT')
-    ierr, br_ploss = psspy.abrnreal(-1, 1, 1, 1, 1, 'PLOSS')
-    ierr, br_qloss = psspy.abrnreal(-1, 1, 1, 1, 1, 'QLOSS')
-    ierr, gen_bus = psspy.amachint(-1, 4, 'NUMBER')
-    ierr, load_bus = psspy.aloadint(-1, 1, 'NUMBER')
-    ierr, br_from = psspy.abrnint(-1, 1, 1, 1, 1, 'FROMNUMBER')
+    buses, branches = tables['buses'], tables['branches']
+    gens, loads     = tables['generators'], tables['loads']
 
-    total_pgen = sum(gen_pg[0]) if gen_pg and gen_pg[0] else 0.0
-    total_qgen = sum(gen_qg[0]) if gen_qg and gen_qg[0] else 0.0
-    total_pload = sum(
-        l.real for l in load_tot[0]) if load_tot and load_tot[0] else 0.0
-    total_qload = sum(
-        l.imag for l in load_tot[0]) if load_tot and load_tot[0] else 0.0
-    total_ploss = sum(br_ploss[0]) if br_ploss and br_ploss[0] else 0.0
-    total_qloss = sum(br_qloss[0]) if br_qloss and br_qloss[0] else 0.0
+    total_pgen  = float(gens['PGEN_MW'].sum())
+    total_qgen  = float(gens['QGEN_MVAR'].sum())
+    total_pload = float(loads['PTOTAL_MW'].sum())
+    total_qload = float(loads['QTOTAL_MVAR'].sum())
+    total_ploss = float(branches['PLOSS_MW'].sum())
+    total_qloss = float(branches['QLOSS_MVAR'].sum())
 
     print("\n" + "=" * 55)
     print("SYSTEM SUMMARY")
     print("=" * 55)
-    print(f"  Buses:        {len(raw['num'][0])}")
-    print(f"  Generators:   {len(gen_bus[0])}")
-    print(f"  Loads:        {len(load_bus[0])}")
-    print(f"  Branches:     {len(br_from[0])}")
+    print(f"  Buses:        {len(buses['BUS_NUM'])}")
+    print(f"  Generators:   {len(gens['BUS_NUM'])}")
+    print(f"  Loads:        {len(loads['BUS_NUM'])}")
+    print(f"  Branches:     {len(branches['FROM_BUS'])}")
     print("-" * 55)
     print(
         f"  Total Generation:  {total_pgen:10.2f} MW  {total_qgen:10.2f} Mvar")
@@ -440,9 +386,11 @@ def run(raw_file, output_dir='.', pf_method='FNSL'):
       1. Initialise PSS/E
       2. Load RAW case
       3. Solve power flow
-      4. Build bus lookups
-      5. Extract all element types to CSV [Will be utilized in subsequent steps, but the
-                                          information extraction needed only once per case
+      4. Build bus table (also the bus lookup)
+      5. Extract all element types as NumPy column tables and write them to
+         CSV and to the columnar case store [Will be utilized in subsequent
+                                          steps, but the information extraction
+                                          needed only once per case
                                           you can simulate any number of large load simulations
                                           at different buses/frequencies/amplitudes]
       6. Print system summary
@@ -463,37 +411,75 @@ def run(raw_file, output_dir='.', pf_method='FNSL'):
     ierr = psspy.read(0, raw_file)
     if ierr != 0:
         print(f"ERROR: could not load RAW file (code {ierr}). Aborting.")
-        return
+        return False
 
     # 3. Solve
     print(f"\nSolving power flow ({pf_method})...")
     solve_power_flow(pf_method)
 
-    # 4. Build bus lookup functions
+    # 4. Build bus table
     print("\nBuilding bus lookups...")
-    kv_lu, vm_lu, va_lu, area_lu, zone_lu, raw = build_bus_lookups()
+    buses = build_bus_table()
 
     # 5. Extract
     print("\nExtracting results:")
-    extract_buses(output_dir / f"{base}_buses.csv",      raw)
-    extract_branches(output_dir / f"{base}_branches.csv",   kv_lu)
-    extract_generators(
-        output_dir / f"{base}_generators.csv", kv_lu, vm_lu, va_lu, area_lu, zone_lu)
-    extract_loads(output_dir / f"{base}_loads.csv",      kv_lu, vm_lu, va_lu)
-    extract_areas(output_dir / f"{base}_areas.csv")
-    extract_interarea(output_dir / f"{base}_interarea.csv")
+    tables = {
+        'buses':      buses,
+        'branches':   extract_branches(buses),
+        'generators': extract_generators(buses),
+        'loads':      extract_loads(buses),
+        'areas':      extract_areas(),
+        'interarea':  extract_interarea(),
+    }
+    labels = {'buses': 'buses', 'branches': 'branches', 'generators': 'generators',
+              'loads': 'loads', 'areas': 'areas', 'interarea': 'inter-area transfers'}
+    for name, table in tables.items():
+        write_table(output_dir / f"{base}_{name}.csv", table, labels[name])
+
+    store = case_store.write_case_store(output_dir, base, tables)
+    print(f"  {store}: case store ({len(tables)} tables)")
 
     # 6. Summary
-    print_system_summary(raw, kv_lu)
+    print_system_summary(tables)
+
+    print("\nDone.")
+    return True
+
+def run_raw(raw_file, output_dir='.'):
+    """
+    Same outputs as run(), read directly from the RAW file with raw_parser
+    (no PSS/E session and no power flow; the solution stored in the file is used).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+    base = Path(raw_file).stem
+
+    print("-" * 55)
+    print(f"Case : {raw_file}  (RAW parser, no PSS/E)")
+    print("-" * 55)
+
+    tables = raw_parser.parse_raw(raw_file)
+    head   = tables.pop('header')
+    print(f"\nRAW revision {head['rev']}, SBASE {head['sbase']} MVA")
+
+    print("\nExtracting results:")
+    labels = {'interarea': 'inter-area transfers'}
+    for name, table in tables.items():
+        write_table(output_dir / f"{base}_{name}.csv", table, labels.get(name, name))
+
+    store = case_store.write_case_store(output_dir, base, tables)
+    print(f"  {store}: case store ({len(tables)} tables)")
+
+    print_system_summary(tables)
 
     print("\nDone.")
+    return True
 
 # Run
 if __name__ == '__main__':
     
     psse_version = 35
     psspy_version = 311
-    psspy = configure_psse(psse_version, psspy_version)
     
     
     # pointing to case location and output directory
@@ -504,6 +490,17 @@ if __name__ == '__main__':
     config_name = 'Pre_Screening_config.csv'
     config = pd.read_csv(root/config_name)
     case_name = config[config.Variable == 'case_name']['Value'][0]
+
+    # PSS/E by default; the pure-Python RAW reader when asked for or when PSS/E is missing
+    engine_row = config[config.Variable == 'extract_engine']
+    engine = 'psse' if engine_row.empty else str(engine_row['Value'].iloc[0]).strip().lower()
+    if engine != 'raw':
+        try:
+            psspy = configure_psse(psse_version, psspy_version)
+        except (FileNotFoundError, ImportError) as e:
+            print(f"PSS/E not available ({str(e).splitlines()[0]}); reading the RAW file directly.")
+            engine = 'raw'
+
     raw_case_name = case_name+'.raw'
     sav_case_name = case_name+'.sav'
     
@@ -511,6 +508,29 @@ if __name__ == '__main__':
     raw_case = case_dir / raw_case_name
     sav_case = case_dir / sav_case_name
 
-    run(str(raw_case), output_dir, pf_method='FNSL')
-    
-    psspy.save(str(sav_case))
+    pf_method = 'FNSL'
+    force_row = config[config.Variable == 'force_recompute']
+    force = not force_row.empty and str(force_row['Value'].iloc[0]).strip().lower() in ('1', 'true', 'yes')
+
+    # Skip extraction when the RAW file and solver options are unchanged
+    fp = case_fingerprint.fingerprint(
+        {'raw': raw_case},
+        {'engine': engine, 'pf_method': pf_method, 'pf_options': PF_OPTIONS,
+         'psse_version': psse_version})
+    outputs = [output_dir / f"{case_name}_{t}.csv" for t in case_store.TABLES]
+    outputs.append(case_store.store_file(output_dir, case_name))
+    if engine != 'raw':
+        outputs.append(sav_case)
+    fresh, reason = case_fingerprint.check('step1', fp, outputs, output_dir)
+    if fresh and not force:
+        print(f"-> Case unchanged (fingerprint {fp['digest']}); "
+              f"using existing outputs in {output_dir}")
+        print("   Set force_recompute = 1 in Pre_Screening_config.csv to re-extract.")
+    else:
+        print(f"-> Extracting case: {'forced' if force else reason}")
+        if engine == 'raw':
+            if run_raw(str(raw_case), output_dir):
+                case_fingerprint.record('step1', fp, outputs, output_dir)
+        elif run(str(raw_case), output_dir, pf_method=pf_method):
+            psspy.save(str(sav_case))
+            case_fingerprint.record('step1', fp, outputs, output_dir)
@@ -6,6 +6,8 @@ Buses considered:
   - Voltage sensitivity : PQ buses without switched shunts, 69 kV <= base kV <= 138 kV (user can change)
   - Angle sensitivity   : in-service generator buses with PMAX > min_mw (config-driven)
 Voltage levels and area filter can be changed via configuration input
+Results are cached: if the .sav, the Step1 bus table and all settings match
+the fingerprint in Processing/case_fingerprint.json, the run returns at once
 @author: bisw757
 '''
 
@@ -18,6 +20,7 @@ import numpy as np
 import pandas as pd
 
 from psse_config import configure_psse
+import case_fingerprint
 psse_version = 35
 psspy_version = 311
 psspy = configure_psse(psse_version, psspy_version)
@@ -27,6 +30,7 @@ psspy = configure_psse(psse_version, psspy_version)
 DELTA_Q = 1.0
 DELTA_P = 1.0
 LOAD_ID = 'ZZ'   # fictitious load ID used for perturbations
+PF_OPTIONS = [0, 0, 0, 1, 0, 0, 0, 0]   # fnsl options; part of the case fingerprint
 #-------------------------------------------------------------
 
 def initialize_psse():
@@ -42,7 +46,7 @@ def load_case(case_file):
     print(f"Loaded case: {case_file}")
 
 def solve_power_flow():
-    ierr = psspy.fnsl([0, 0, 0, 1, 0, 0, 0, 0])
+    ierr = psspy.fnsl(PF_OPTIONS)
     # ierr = psspy.fdns([0, 0, 0, 1, 1, 0, 0, 0]) # uncomment if fast-decoupled N_R desired
     return ierr == 0
 
@@ -428,6 +432,26 @@ def main():
         area_filter = None
         print("No area filter — studying all areas")
 
+    min_mw_row = config[config.Variable == 'angle_sensitivity_minMW']
+    min_mw = float(min_mw_row['Value'].iloc[0]) if not min_mw_row.empty else 10.0
+    force_row = config[config.Variable == 'force_recompute']
+    force = not force_row.empty and str(force_row['Value'].iloc[0]).strip().lower() in ('1', 'true', 'yes')
+
+    # Return cached sensitivities when the case, base voltages and settings are unchanged
+    fp = case_fingerprint.fingerprint(
+        {'sav': sav_case, 'buses': meta_dir / temp},
+        {'min_kv': min_kv, 'max_kv': max_kv, 'area': area_filter, 'min_mw': min_mw,
+         'delta_p': DELTA_P, 'delta_q': DELTA_Q, 'load_id': LOAD_ID, 'pf_options': PF_OPTIONS})
+    outputs = [meta_dir / 'voltage_sensitivities.csv', meta_dir / 'voltage_sensitivities_scatter.png',
+               meta_dir / 'angle_sensitivities.csv', meta_dir / 'angle_sensitivities_scatter.png']
+    fresh, reason = case_fingerprint.check('step2a', fp, outputs, meta_dir)
+    if fresh and not force:
+        print(f"-> Case and settings unchanged (fingerprint {fp['digest']}); "
+              f"cached sensitivities in {meta_dir}")
+        print("   Set force_recompute = 1 in Pre_Screening_config.csv to recompute.")
+        return
+    print(f"-> Computing sensitivities: {'forced' if force else reason}")
+
     base_voltage_df = pd.read_csv(meta_dir/temp)
     base_voltage_lookup = base_voltage_df.set_index('BUS_NUM')[['VM_PU', 'VA_DEG']].to_dict('index') 
 
@@ -452,8 +476,6 @@ def main():
     plot_sensitivities(df, plot_path, min_kv, max_kv, area_filter)
 
     # ── ANGLE SENSITIVITY BLOCK ──────────────────────────────────────────────
-    min_mw_row = config[config.Variable == 'angle_sensitivity_minMW']
-    min_mw = float(min_mw_row['Value'].iloc[0]) if not min_mw_row.empty else 10.0
     print(f"\nAngle sensitivity threshold: PMAX > {min_mw:.0f} MW")
 
     gen_buses = get_generator_buses(min_mw, area_filter)
@@ -472,6 +494,8 @@ def main():
     plot_angle_sensitivities(df_ang, ang_plot_path, min_mw, area_filter)
     # ── END ANGLE SENSITIVITY BLOCK ──────────────────────────────────────────
 
+    case_fingerprint.record('step2a', fp, outputs, meta_dir)
+
     print(f"\nTotal runtime: {time.time() - start:.2f} seconds")
 
 
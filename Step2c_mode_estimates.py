@@ -9,6 +9,9 @@ import numpy as np
 from scipy.signal import find_peaks, decimate
 from scipy.optimize import least_squares
 from scipy.linalg import svd
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.sparse.linalg import LinearOperator, svds
+from numpy.lib.stride_tricks import sliding_window_view
 import matplotlib.pyplot as plt
 
 
@@ -31,6 +34,11 @@ TARGET_SPS        = 15     # target sample rate after decimation (sps)
 FFT_SPS           = 5      # sample rate used exclusively for FFT peak picking
                            # Nyquist = 2.5 Hz — sufficient for inter-area / local mode detection
                            # VARPRO always uses the full-rate signal
+N_BOOT            = 200    # bootstrap replicates for mode confidence intervals
+CI_LEVEL          = 0.95   # two-sided confidence level
+HANKEL_N_SV       = 30     # leading singular values requested from the truncated SVD
+HANKEL_N_SV_MAX   = 120    # upper limit when the request is doubled (noisy signals)
+HANKEL_DENSE_MAX  = 1500   # signals up to this length use the exact dense SVD
 
 # 1. Select peaks from the frequency spectrum
 
@@ -67,17 +75,11 @@ def fft_peak_picking(h, dt, freq_min=FREQ_MIN, freq_max=FREQ_MAX,
 
 # 2. Estimate Model order via Hankel SVD
 
-def hankel_model_order(h, energy_threshold=ENERGY_THRESHOLD,
-                       max_order=None, noise_floor_ratio=NOISE_FLOOR_RATIO):
-    """Estimate model order from SVD of Hankel matrix.
-    Returns (N_order [even int], S [singular values])."""
-
-    L     = len(h) // 3
-    K     = len(h) - L + 1
-    H_mat = np.array([h[i:i + K] for i in range(L)])
-    _, S, _ = svd(H_mat, full_matrices=False)
-
-    cap = max_order or len(h) // 4
+def _order_from_singular_values(S, energy_total, cap, energy_threshold,
+                                noise_floor_ratio):
+    """Apply the three order-selection criteria to the leading singular values S.
+    energy_total is the sum of *all* squared singular values (||H||_F^2), so a
+    truncated S gives the same energy fractions as the full spectrum."""
 
     # Method 1: count singular values above relative noise floor
     N_count = int(np.sum(S > noise_floor_ratio * S[0]))
@@ -92,7 +94,7 @@ def hankel_model_order(h, energy_threshold=ENERGY_THRESHOLD,
         N_gap = 2
 
     # Method 3: cumulative energy
-    energy   = np.cumsum(S ** 2) / np.sum(S ** 2)
+    energy   = np.cumsum(S ** 2) / energy_total
     N_energy = int(np.searchsorted(energy, energy_threshold)) + 1
 
     N_order = max(N_count, N_energy)
@@ -102,6 +104,91 @@ def hankel_model_order(h, energy_threshold=ENERGY_THRESHOLD,
         N_order += 1   # round to even — conjugate pairs
     if N_order>10:
         N_order=10
+    return N_order
+
+
+def hankel_model_order(h, energy_threshold=ENERGY_THRESHOLD,
+                       max_order=None, noise_floor_ratio=NOISE_FLOOR_RATIO):
+    """Estimate model order from SVD of Hankel matrix.
+    Returns (N_order [even int], S [singular values])."""
+
+    L     = len(h) // 3
+    K     = len(h) - L + 1
+    H_mat = sliding_window_view(h, K)[:L]   # strided view, no copy
+    _, S, _ = svd(H_mat, full_matrices=False)
+
+    cap = max_order or len(h) // 4
+    N_order = _order_from_singular_values(S, np.sum(S ** 2), cap,
+                                          energy_threshold, noise_floor_ratio)
+    return N_order, S
+
+
+def _hankel_operator(h, L, K):
+    """Implicit L x K Hankel operator H[i, j] = h[i + j].
+    Products with H and H^T are correlations, evaluated with one real FFT
+    each (O(N log N)) instead of forming the matrix."""
+
+    n     = next_fast_len(len(h) + max(L, K) - 1)
+    h_f   = rfft(h, n)
+
+    def matmat(X):
+        X = X.reshape(K, -1)
+        Y = irfft(h_f[:, None] * rfft(X[::-1], n, axis=0), n, axis=0)
+        return Y[K - 1:K - 1 + L]
+
+    def rmatmat(U):
+        U = U.reshape(L, -1)
+        Y = irfft(h_f[:, None] * rfft(U[::-1], n, axis=0), n, axis=0)
+        return Y[L - 1:L - 1 + K]
+
+    return LinearOperator((L, K), dtype=float,
+                          matvec=lambda x: matmat(x).ravel(),
+                          rmatvec=lambda u: rmatmat(u).ravel(),
+                          matmat=matmat, rmatmat=rmatmat)
+
+
+def hankel_model_order_fast(h, energy_threshold=ENERGY_THRESHOLD,
+                            max_order=None, noise_floor_ratio=NOISE_FLOOR_RATIO,
+                            n_sv=HANKEL_N_SV, n_sv_max=HANKEL_N_SV_MAX,
+                            dense_max=HANKEL_DENSE_MAX):
+    """Same criteria as hankel_model_order, for long full-rate signals.
+
+    The Hankel matrix is never formed: an FFT-based LinearOperator feeds
+    scipy.sparse.linalg.svds, which returns only the leading n_sv singular
+    values. ||H||_F^2 comes from a running sum of h^2, so the energy
+    criterion is unchanged. If every returned value is still above the noise
+    floor the request is doubled (up to n_sv_max) so the gap scan is covered;
+    on very noisy signals the gap scan then sees only the leading n_sv_max
+    values.
+    Signals with len(h) <= dense_max use the exact dense SVD.
+    Returns (N_order [even int], S [leading singular values])."""
+
+    h = np.asarray(h, dtype=float)
+    if len(h) <= dense_max:
+        return hankel_model_order(h, energy_threshold, max_order, noise_floor_ratio)
+
+    L     = len(h) // 3
+    K     = len(h) - L + 1
+    k_max = min(min(L, K) - 1, max(n_sv, n_sv_max))
+    cap   = max_order or len(h) // 4
+
+    # ||H||_F^2 = sum_i ||h[i:i+K]||^2, one cumulative sum
+    c2           = np.concatenate([[0.0], np.cumsum(h ** 2)])
+    energy_total = float(np.sum(c2[K:K + L] - c2[:L]))
+
+    H_op  = _hankel_operator(h, L, K)
+    k     = min(n_sv, k_max)
+    while True:
+        S = svds(H_op, k=k, return_singular_vectors=False,
+                 random_state=0, tol=1e-10)
+        S = np.sort(S)[::-1]
+        N_count = int(np.sum(S > noise_floor_ratio * S[0]))
+        if N_count + 11 <= k or k >= k_max:
+            break
+        k = min(2 * k, k_max)
+
+    N_order = _order_from_singular_values(S, energy_total, cap,
+                                          energy_threshold, noise_floor_ratio)
     return N_order, S
 
 
@@ -133,14 +220,16 @@ def _varpro_residual(params, t, h):
 def varpro_fit(t, h, omega_init, zeta_init=ZETA_INIT,
                omega_tol=OMEGA_TOL, zeta_bounds=ZETA_BOUNDS):
     """VARPRO fit: nonlinear params (omega_n, zeta), linear params solved analytically.
+    zeta_init may be a scalar or one value per mode (warm start).
     Returns (omega_n_fit, zeta_fit, c_fit)."""
 
     N_modes = len(omega_init)
+    zeta0   = np.clip(np.broadcast_to(zeta_init, (N_modes,)), *zeta_bounds)
 
     p0 = np.zeros(2 * N_modes)
     for r, w in enumerate(omega_init):
         p0[2 * r]     = w
-        p0[2 * r + 1] = zeta_init
+        p0[2 * r + 1] = zeta0[r]
 
     lo, hi = [], []
     for w in omega_init:
@@ -268,7 +357,7 @@ def extract_modes(h, dt, freq_min=FREQ_MIN, freq_max=FREQ_MAX,
             print(f"      {w / (2 * np.pi):.4f} Hz")
 
     # Stage 2 — model order from full signal
-    N_order, S_vals = hankel_model_order(h, energy_threshold)
+    N_order, S_vals = hankel_model_order_fast(h, energy_threshold)
     N_modes = N_order // 2
     if verbose:
         print(f"[2] Model order (Hankel SVD): N = {N_order}  ->  {N_modes} modes")
@@ -356,6 +445,110 @@ def extract_modes(h, dt, freq_min=FREQ_MIN, freq_max=FREQ_MAX,
     return modes, rms_residual, N_order, h_rec, freqs, H_mag, omega_fft
 
 
+# ---------------------------------------------------------------------------
+# Bootstrap confidence intervals
+# ---------------------------------------------------------------------------
+
+def _bootstrap_batch(t, h_fit, resid, omega0, zeta0, omega_tol, method,
+                     block_len, n_rep, seed):
+    """Refit VARPRO on n_rep resampled signals h_fit + resampled residuals.
+    Runs in a worker process; returns (n_rep, N_modes, 3) array of
+    (freq_hz, zeta, amplitude), NaN rows for fits that fail."""
+
+    rng = np.random.default_rng(seed)
+    N   = len(resid)
+    out = np.full((n_rep, len(omega0), 3), np.nan)
+    for b in range(n_rep):
+        if method == 'block':
+            # moving-block bootstrap keeps residual autocorrelation
+            n_blk  = -(-N // block_len)
+            starts = rng.integers(0, N - block_len + 1, n_blk)
+            idx    = (starts[:, None] + np.arange(block_len)).ravel()[:N]
+        else:
+            idx = rng.integers(0, N, N)
+        h_b = h_fit + resid[idx]
+        try:
+            w, z, c = varpro_fit(t, h_b, omega0, zeta0, omega_tol)
+        except (ValueError, np.linalg.LinAlgError):
+            continue
+        out[b, :, 0] = w / (2 * np.pi)
+        out[b, :, 1] = z
+        out[b, :, 2] = np.hypot(c[0::2], c[1::2])
+    return out
+
+
+def bootstrap_modes(h, dt, modes, n_boot=N_BOOT, method='residual', block_len=None,
+                    ci=CI_LEVEL, omega_tol=OMEGA_TOL, n_workers=None, seed=0):
+    """Per-mode confidence intervals for frequency, damping and amplitude.
+
+    The base fit (modes from extract_modes) is reconstructed, its residual
+    is resampled — i.i.d. ('residual') or in moving blocks ('block') — and
+    VARPRO is refitted on every replicate, warm-started from the base
+    (omega_n, zeta). Replicates are split into batches over a process pool.
+
+    Parameters
+    ----------
+    method    : 'residual' or 'block'
+    block_len : block length in samples for 'block' (default: one period of
+                the slowest mode, capped at N/10, at least N**(1/3))
+    n_workers : processes for ProcessPoolExecutor (None = os.cpu_count())
+
+    Returns
+    -------
+    DataFrame, one row per mode in the order of `modes`, with columns
+    freq_hz, freq_lo, freq_hi, zeta, zeta_lo, zeta_hi, amplitude, amp_lo,
+    amp_hi, n_boot (successful replicates).
+    """
+    import os
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not modes:
+        return pd.DataFrame()
+
+    h      = np.asarray(h, dtype=float)
+    t      = np.arange(len(h)) * dt
+    omega0 = np.array([m['omega_n'] for m in modes])
+    zeta0  = np.array([m['zeta'] for m in modes])
+
+    # Base fit on the full signal with the retained modes only
+    w, z, c = varpro_fit(t, h, omega0, zeta0, omega_tol)
+    h_fit   = _build_basis(t, np.column_stack([w, z]).ravel()) @ c
+    resid   = h - h_fit
+    resid  -= resid.mean()
+
+    if block_len is None:
+        block_len = int(round(2 * np.pi / (omega0.min() * dt)))
+        block_len = max(min(block_len, len(h) // 10), int(np.ceil(len(h) ** (1 / 3))))
+    block_len = int(min(max(block_len, 1), len(h)))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_batches = max(1, min(n_workers * 4, n_boot))
+    sizes     = np.diff(np.linspace(0, n_boot, n_batches + 1).astype(int))
+    seeds     = np.random.SeedSequence(seed).spawn(n_batches)
+
+    print(f"[bootstrap] {n_boot} {method} replicates on {n_workers} worker(s)"
+          + (f", block length {block_len} samples" if method == 'block' else ""))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_bootstrap_batch, t, h_fit, resid, w, z, omega_tol,
+                               method, block_len, int(n), sq)
+                   for n, sq in zip(sizes, seeds) if n > 0]
+        reps = np.concatenate([f.result() for f in futures], axis=0)
+
+    a  = (1 - ci) / 2
+    lo = np.nanquantile(reps, a, axis=0)
+    hi = np.nanquantile(reps, 1 - a, axis=0)
+    return pd.DataFrame({
+        'freq_hz'  : [m['freq_hz'] for m in modes],
+        'freq_lo'  : lo[:, 0], 'freq_hi': hi[:, 0],
+        'zeta'     : zeta0,
+        'zeta_lo'  : lo[:, 1], 'zeta_hi': hi[:, 1],
+        'amplitude': [m['amplitude'] for m in modes],
+        'amp_lo'   : lo[:, 2], 'amp_hi' : hi[:, 2],
+        'n_boot'   : np.sum(~np.isnan(reps[:, :, 0]), axis=0),
+    })
+
+
 # ---------------------------------------------------------------------------
 # Plotting
 # ---------------------------------------------------------------------------
@@ -453,6 +646,8 @@ if __name__ == '__main__':
     freq_min   = _cfg('freq_min',   float, default=FREQ_MIN)
     freq_max   = _cfg('freq_max',   float, default=FREQ_MAX)
     prom_ratio = _cfg('prominence_ratio', float, default=PROMINENCE_RATIO)
+    n_boot     = _cfg('bootstrap_n',      int,   default=0)
+    boot_meth  = _cfg('bootstrap_method', str,   default='residual')
 
     impulse_csv = data_dir / f'impulse_{bus_number}.csv'
     print(f"Reading impulse response: {impulse_csv}")
@@ -480,5 +675,21 @@ if __name__ == '__main__':
     # Save mode table to CSV
     if modes:
         modes_df = pd.DataFrame(modes)
+        if n_boot > 0:
+            ci_df = bootstrap_modes(h_norm, dt, modes, n_boot=n_boot, method=boot_meth)
+            ci_cols = ['freq_lo', 'freq_hi', 'zeta_lo', 'zeta_hi', 'amp_lo', 'amp_hi', 'n_boot']
+            modes_df = pd.concat([modes_df, ci_df[ci_cols]], axis=1)
+            print(f"\n{'Freq [Hz]':<22} {'Damp% (CI)':<22} {'Amplitude (CI)'}")
+            for _, r in ci_df.iterrows():
+                print(f"{r.freq_hz:.4f} [{r.freq_lo:.4f}-{r.freq_hi:.4f}]  "
+                      f"{100 * r.zeta:5.2f} [{100 * r.zeta_lo:.2f}-{100 * r.zeta_hi:.2f}]   "
+                      f"{r.amplitude:.4f} [{r.amp_lo:.4f}-{r.amp_hi:.4f}]")
         modes_df.to_csv(data_dir / f'mode_estimates_{bus_number}.csv', index=False)
-        print(f"Mode estimates saved: {data_dir / f'mode_estimates_{bus_number}.csv'}")
\ No newline at end of file
+        print(f"Mode estimates saved: {data_dir / f'mode_estimates_{bus_number}.csv'}")
+
+        # Register in the system-wide mode atlas (Processing/mode_atlas.sqlite)
+        import mode_atlas
+        case_name = _cfg('case_name', str)
+        n_atlas = mode_atlas.add_modes(modes_df, bus_number, mode_atlas.case_hash(case_name),
+                                       case_name=case_name, source=impulse_csv.name)
+        print(f"Mode atlas updated: {n_atlas} mode(s) for bus {bus_number}")
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Modal Estimation — Sliding-Window Matrix Pencil
+Companion to Step2c_mode_estimates.py for long or live simulations.
+
+Samples are consumed one block at a time. Each sample (after block-average
+decimation and first differencing, as in Step2c) forms one new row of the
+Hankel data matrix; only the (P+1) x (P+1) covariance R = Y^T Y is kept and
+is updated with rank-one terms — a row is added when it enters the window
+and subtracted when it leaves (or R is exponentially forgotten instead).
+At a configurable cadence the leading eigenvectors of R give the signal
+subspace, and the shift-invariance (matrix pencil / ESPRIT) step returns
+the poles. Memory is constant: R plus a ring buffer of the last window.
+
+Several channels can be fed together; they share one R and hence one set
+of poles (multi-channel matrix pencil).
+
+Outputs (replay mode, written to Processing/):
+  streaming_modes_<bus>.csv   — time, freq_hz, zeta, per estimate
+
+Feeding a running PSS/E simulation: advance psspy.run() in short steps,
+read the monitored channels with psspy.chnval() and pass them to update().
+"""
+
+import numpy as np
+
+from Step2c_mode_estimates import (FREQ_MIN, FREQ_MAX, ZETA_MAX, TARGET_SPS,
+                                   ENERGY_THRESHOLD, NOISE_FLOOR_RATIO,
+                                   _order_from_singular_values)
+
+
+WINDOW_SEC     = 20.0   # sliding window length (s) at the decimated rate
+UPDATE_SEC     = 1.0    # cadence of emitted estimates (s of signal time)
+PENCIL_SEC     = 5.0    # pencil (Hankel row) length (s); sets frequency resolution
+MAX_ORDER      = 10     # same cap as the batch Hankel order estimate
+
+
+def window_lengths(record_sec, window_sec=None, pencil_sec=None):
+    """(window_sec, pencil_sec) for replaying a record of record_sec seconds.
+
+    Values not given default to WINDOW_SEC / PENCIL_SEC, shortened for short
+    records to the batch Step2c split — pencil one third of the record,
+    window the rest — so that the record holds at least one full window.
+    """
+    if pencil_sec is None:
+        pencil_sec = min(PENCIL_SEC, record_sec / 3)
+    if window_sec is None:
+        window_sec = min(WINDOW_SEC, record_sec - pencil_sec)
+    return window_sec, pencil_sec
+
+
+class StreamingModeEstimator:
+    """Sliding-window matrix pencil with rank-one covariance updates.
+
+    Parameters
+    ----------
+    dt           : float  sample interval of the incoming data (s)
+    n_channels   : int    number of channels per sample
+    target_sps   : float  rate after block-average decimation (None = no decimation)
+    window_sec   : float  sliding window length (s); ignored if forgetting is set
+    update_sec   : float  emit an estimate every update_sec of signal time
+    pencil_sec   : float  pencil parameter P expressed in seconds
+    order        : int    fixed model order (even); None = Hankel criteria each update
+    forgetting   : float  exponential forgetting factor in (0, 1); None = rectangular window
+    """
+
+    def __init__(self, dt, n_channels=1, target_sps=TARGET_SPS,
+                 window_sec=WINDOW_SEC, update_sec=UPDATE_SEC, pencil_sec=PENCIL_SEC,
+                 order=None, forgetting=None,
+                 freq_min=FREQ_MIN, freq_max=FREQ_MAX, zeta_max=ZETA_MAX):
+
+        self.n_ch  = int(n_channels)
+        self.q     = 1 if target_sps is None else max(1, int(round(1.0 / (dt * target_sps))))
+        self.dt    = dt * self.q
+        self.P     = max(4, int(round(pencil_sec / self.dt)))
+        self.W     = max(self.P + 2, int(round(window_sec / self.dt)))
+        self.every = max(1, int(round(update_sec / self.dt)))
+        self.order = order
+        self.lam   = forgetting
+        self.freq_min, self.freq_max, self.zeta_max = freq_min, freq_max, zeta_max
+
+        n = self.P + 1
+        self.R      = np.zeros((n, n))
+        self.energy = 0.0                                  # trace of R
+        # ring buffer of differenced samples: last W + P + 1 per channel
+        self.buf    = np.zeros((self.W + self.P + 1, self.n_ch))
+        self.n      = 0                                    # differenced samples seen
+        self.t      = 0.0                                  # signal time of last sample
+
+        self._acc   = np.zeros(self.n_ch)                  # decimation accumulator
+        self._n_acc = 0
+        self._prev  = None                                 # last decimated sample
+
+    # ── sample ingestion ──────────────────────────────────────────────────
+
+    def _row(self, end):
+        """Hankel rows (one per channel) ending at differenced sample index end."""
+        idx = np.arange(end - self.P, end + 1) % len(self.buf)
+        return self.buf[idx].T                             # (n_ch, P+1)
+
+    def _push(self, x):
+        """Add one decimated sample (n_ch,), return an estimate list when due."""
+        if self._prev is None:
+            self._prev = x
+            return None
+        d, self._prev = x - self._prev, x
+        self.buf[self.n % len(self.buf)] = d
+        self.n += 1
+        if self.n <= self.P:
+            return None
+
+        new = self._row(self.n - 1)
+        if self.lam is not None:
+            self.R *= self.lam
+            self.energy *= self.lam
+        self.R      += new.T @ new                         # rank-n_ch update
+        self.energy += float(np.sum(new ** 2))
+
+        if self.lam is None and self.n - self.P > self.W:  # row leaves the window
+            old = self._row(self.n - 1 - self.W)
+            self.R      -= old.T @ old                     # rank-n_ch downdate
+            self.energy -= float(np.sum(old ** 2))
+
+        if (self.n - self.P) % self.every == 0 and self.n - self.P >= min(self.W, 2 * self.P):
+            return self.estimate()
+        return None
+
+    def update(self, samples):
+        """Consume a block of samples, shape (n,) or (n, n_channels).
+        Returns the list of estimates emitted during this block; each one is
+        a dict with keys t, order, modes (list of mode dicts)."""
+        samples = np.asarray(samples, dtype=float).reshape(-1, self.n_ch)
+        out = []
+        for x in samples:
+            self._acc   += x
+            self._n_acc += 1
+            self.t      += self.dt / self.q
+            if self._n_acc < self.q:
+                continue
+            est = self._push(self._acc / self.q)
+            self._acc[:] = 0.0
+            self._n_acc  = 0
+            if est is not None:
+                out.append(est)
+        return out
+
+    # ── estimation ────────────────────────────────────────────────────────
+
+    def estimate(self):
+        """Current modes from the covariance R (matrix pencil on its eigenvectors)."""
+        evals, evecs = np.linalg.eigh(self.R)
+        order_idx    = np.argsort(evals)[::-1]
+        S            = np.sqrt(np.clip(evals[order_idx], 0.0, None))
+        V            = evecs[:, order_idx]
+
+        if self.order is not None:
+            N_order = int(self.order)
+        else:
+            N_order = _order_from_singular_values(S, max(self.energy, 1e-30), MAX_ORDER,
+                                                  ENERGY_THRESHOLD, NOISE_FLOOR_RATIO)
+        N_order = min(N_order, self.P - 1)
+
+        Vs     = V[:, :N_order]
+        V1, V2 = Vs[:-1], Vs[1:]
+        z      = np.linalg.eigvals(np.linalg.pinv(V1) @ V2)
+        z      = z[np.abs(z) > 1e-12]
+        lam    = np.log(z) / self.dt
+
+        modes = []
+        for s in lam[lam.imag > 0]:
+            omega_n = abs(s)
+            freq    = s.imag / (2 * np.pi)
+            zeta    = -s.real / omega_n
+            if not (self.freq_min <= freq <= self.freq_max) or zeta > self.zeta_max:
+                continue
+            modes.append({'omega_n': omega_n, 'omega_d': s.imag,
+                          'freq_hz': freq, 'zeta': zeta})
+        modes.sort(key=lambda m: m['freq_hz'])
+        return {'t': self.t, 'order': N_order, 'modes': modes}
+
+
+# ---------------------------------------------------------------------------
+# Replay of a recorded response (stand-in for a live feed)
+# ---------------------------------------------------------------------------
+
+def replay(t, Y, chunk=50, final=True, **kwargs):
+    """Feed a recorded response (t, Y[n, n_channels]) to the estimator in
+    chunks of `chunk` samples. Returns a DataFrame with one row per mode per
+    estimate (time, order, freq_hz, zeta).
+
+    With final=True one more estimate is taken at the end of the record when
+    the last cadence point was missed and at least one pencil of Hankel rows
+    is available (the record is over, so nothing later would emit it)."""
+    import pandas as pd
+
+    Y   = np.asarray(Y, dtype=float).reshape(len(t), -1)
+    est = StreamingModeEstimator(float(np.median(np.diff(t))), n_channels=Y.shape[1], **kwargs)
+    emitted = []
+    for i in range(0, len(Y), chunk):
+        emitted.extend(est.update(Y[i:i + chunk]))
+    if final and est.n - est.P > est.P and (not emitted or emitted[-1]['t'] < est.t - est.dt / 2):
+        emitted.append(est.estimate())
+
+    rows = []
+    for e in emitted:
+        tt = t[0] + e['t']
+        for m in e['modes']:
+            rows.append({'time': tt, 'order': e['order'],
+                         'freq_hz': m['freq_hz'], 'zeta': m['zeta']})
+        print(f"  t = {tt:7.2f} s  order {e['order']:>2}  " +
+              "  ".join(f"{m['freq_hz']:.3f} Hz/{100 * m['zeta']:.1f}%" for m in e['modes']))
+    return pd.DataFrame(rows, columns=['time', 'order', 'freq_hz', 'zeta'])
+
+
+if __name__ == '__main__':
+    import pandas as pd
+    from pathlib import Path
+
+    root     = Path.cwd()
+    data_dir = root / "Processing"
+
+    config = pd.read_csv(root / 'modal_analysis_config.csv')
+
+    def _cfg(var, cast=str, default=None):
+        row = config[config.Variable == var]
+        if row.empty:
+            return default
+        v = row['Value'].iloc[0]
+        return default if (str(v).strip().lower() == 'nan' or str(v).strip() == '') else cast(v)
+
+    bus_number = _cfg('bus_number', int)
+    window_sec = _cfg('stream_window_sec', float)
+    pencil_sec = _cfg('stream_pencil_sec', float)
+    update_sec = _cfg('stream_update_sec', float, default=UPDATE_SEC)
+
+    impulse_csv = data_dir / f'impulse_{bus_number}.csv'
+    print(f"Replaying impulse response: {impulse_csv}")
+
+    data = pd.read_csv(impulse_csv)
+    data = data[data['time'] > 2]
+    t    = data['time'].to_numpy()
+    Y    = data[data.columns[2]].to_numpy()
+
+    window_sec, pencil_sec = window_lengths(t[-1] - t[0], window_sec, pencil_sec)
+    print(f"Record {t[-1] - t[0]:.1f} s, window {window_sec:.2f} s, pencil {pencil_sec:.2f} s, "
+          f"update every {update_sec:.2f} s")
+
+    track = replay(t, Y, window_sec=window_sec, pencil_sec=pencil_sec, update_sec=update_sec)
+
+    out = data_dir / f'streaming_modes_{bus_number}.csv'
+    if track.empty:
+        print(f"WARNING: no mode estimate emitted for a {t[-1] - t[0]:.1f} s record; "
+              f"shorten stream_window_sec / stream_pencil_sec. {out.name} not written.")
+    else:
+        track.to_csv(out, index=False)
+        print(f"Streaming estimates saved: {out}")
@@ -6,9 +6,12 @@ and a oscillation injection block (const P load periodically varied with Python
 """
 
 from pathlib import Path
+from functools import lru_cache
 import os
 import sys
 
+from dyr_catalog import DyrCatalog
+
 from psse_config import configure_psse
 psse_version = 35
 psspy_version = 311
@@ -18,26 +21,26 @@ psspy = configure_psse(psse_version, psspy_version)
 # =============================================================================
 # INPUT
 # =============================================================================
-def edit_dyr(dyr_filename, lddl_bus, base_load_id):
+@lru_cache(maxsize=None)
+def _dyr_template(dyr_file):
+    """DYR template parsed once per process (sweeps reuse the catalogue)."""
+    return DyrCatalog.read(dyr_file)
+
+def edit_dyr(dyr_filename, lddl_bus, base_load_id, out_file=None):
     # Modify existing load connected to LDDL bus to represent data center dynamics
     # LDDL represented as a composite load with composition matching the NERC LL survey
-    from pathlib import Path
-    lddl_bus = str(lddl_bus)
-
-    # Path to your DYR file
-    dyr_file = Path.cwd()/dyr_filename
-
-    # Read all lines
-    lines = dyr_file.read_text().splitlines()
-    line = lines[0]
-    parts = line.strip().split()
-    parts[0] = lddl_bus
-    parts[2] = base_load_id
-    line = " ".join(parts)
-    lines[0] = line
-
-    # Overwrite the same file
-    dyr_file.write_text("\n".join(lines) + "\n")
+    # The template is left untouched; its records are re-targeted to the LDDL
+    # bus / load id in memory and written as a per-bus fragment for dyre_add.
+    dyr_file = Path(dyr_filename)
+    if not dyr_file.is_absolute():
+        dyr_file = Path.cwd()/dyr_file
+    if out_file is None:
+        out_file = Path.cwd()/"Processing"/f"{dyr_file.stem}{lddl_bus}.dyr"
+
+    template = _dyr_template(str(dyr_file))
+    records  = [template.patch(rec, bus=int(lddl_bus), id=base_load_id)
+                for rec in template.records]
+    return template.write(out_file, records=records)
 
 def add_ll_at_bus(sav_case, dyr_case, bus_number, load_id, csvpath, dyr_file = 'CMLD_Load_.dyr',osc_amp = 0):
     
@@ -166,10 +169,10 @@ def add_ll_at_bus(sav_case, dyr_case, bus_number, load_id, csvpath, dyr_file = '
 
     
     
-    edit_dyr(dyr_file, bus_number, 'll') 
+    dyr_lddl = edit_dyr(dyr_file, bus_number, 'll', csvpath / f"{Path(dyr_file).stem}{bus_number}.dyr")
     psspy.dyre_new([1,1,1,1], dyr_case, "","","")
     val_i = psspy.getdefaultint()
-    psspy.dyre_add([val_i,val_i,val_i,val_i], dyr_file, "","")
+    psspy.dyre_add([val_i,val_i,val_i,val_i], str(dyr_lddl), "","")
     psspy.snap([-1,-1,-1,-1,-1], str(snpFile))
     psspy.dynamicsmode(1)
 
@@ -9,73 +9,133 @@ Value thresholds can be edited
   monitored_lines.csv       - In-service lines > 100 kV in the source area
                               + all in-service inter-area tie lines
 
-All filters consider only in-service elements.
+All filters consider only in-service elements. Each Processing CSV is read
+once into typed NumPy columns and every filter is a vectorized mask or
+group-by over those columns.
+
+Neighbourhood selection (monitor_selection = neighbourhood in simulation_config.csv)
+replaces the source-area criterion with the electrical neighbourhood of the
+source bus: elements within monitor_max_hops branches and/or within
+monitor_max_z_pu of accumulated series reactance, plus all tie lines.
+An optional channel_budget keeps the electrically closest elements.
 """
 
 import csv
 import os
+import numpy as np
+import pandas as pd
 from pathlib import Path
-from collections import defaultdict
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+import case_store
+import raw_parser
 
 # Helper functions
-def read_csv(path):
-    """Read a CSV into a list of dicts with auto-typed numeric fields."""
-    rows = []
-    with open(path, newline='') as f:
-        for row in csv.DictReader(f):
-            typed = {}
-            for k, v in row.items():
-                v = v.strip()
-                try:
-                    typed[k] = int(v)
-                except ValueError:
-                    try:
-                        typed[k] = float(v)
-                    except ValueError:
-                        typed[k] = v
-            rows.append(typed)
-    return rows
-
-
-def write_csv(path, rows, headers):
-    """Write a list of dicts to CSV using the given column order."""
+#   A table is a dict {column name: 1-D NumPy array}, all of equal length.
+
+def _typed_cell(v):
+    """Per-cell int -> float -> str guess (used for non-numeric columns)."""
+    try:
+        return int(v)
+    except ValueError:
+        try:
+            return float(v)
+        except ValueError:
+            return v
+
+
+def read_table(path):
+    """
+    Read a CSV once into typed NumPy columns.
+
+    A column becomes int64 if every cell parses as an integer, float64 if
+    every cell parses as a float, and otherwise an object array holding the
+    per-cell int/float/str guess. Float columns that also contain integer
+    cells are kept as objects too, so values are written back unchanged.
+    """
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    table = {}
+    for col in df.columns:
+        txt = df[col].str.strip().to_numpy().astype(str)
+        try:
+            table[col] = txt.astype(np.int64)
+            continue
+        except ValueError:
+            pass
+        try:
+            vals = txt.astype(np.float64)
+        except ValueError:
+            table[col] = np.array([_typed_cell(v) for v in txt], dtype=object)
+            continue
+        intlike = np.char.isdigit(np.char.lstrip(txt, '+-'))
+        if intlike.any():
+            table[col] = np.array([_typed_cell(v) for v in txt], dtype=object)
+        else:
+            table[col] = vals
+    return table
+
+
+def nrows(table):
+    return len(next(iter(table.values()))) if table else 0
+
+
+def take(table, idx):
+    """Row subset of a table (idx: integer index array or boolean mask)."""
+    return {k: v[idx] for k, v in table.items()}
+
+
+def num(table, col):
+    """Column as float64 for comparisons (non-numeric cells become NaN)."""
+    v = table[col]
+    if v.dtype != object:
+        return v.astype(np.float64, copy=False)
+    return pd.to_numeric(pd.Series(v), errors='coerce').to_numpy(np.float64)
+
+
+def write_table(path, table, headers):
+    """Write a table to CSV using the given column order (missing columns blank)."""
+    n    = nrows(table)
+    cols = [table[h].tolist() if h in table else [''] * n for h in headers]
     with open(path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"  {path.name}: {len(rows)} rows")
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(zip(*cols))
+    print(f"  {path.name}: {n} rows")
 
 
 # ---------------------------------------------------------------------------
 # Parallel circuit detection
 # ---------------------------------------------------------------------------
 
-def build_parallel_lookup(branches):
+def circuit_counts(branches):
     """
-    Return a set of bus pairs that have more than one circuit.
+    Number of circuits (any status) between the bus pair of every branch.
 
     Returns
     -------
-    set of frozenset({from_bus, to_bus}) where circuit count > 1
+    int array, one entry per branch row; > 1 means parallel circuits exist
     """
-    circuit_count = defaultdict(int)
-    for row in branches:
-        pair = frozenset({row['FROM_BUS'], row['TO_BUS']})
-        circuit_count[pair] += 1
-
-    return {pair for pair, count in circuit_count.items() if count > 1}
+    fb, tb = branches['FROM_BUS'], branches['TO_BUS']
+    pairs  = np.column_stack([np.minimum(fb, tb), np.maximum(fb, tb)])
+    _, inv, counts = np.unique(pairs, axis=0, return_inverse=True, return_counts=True)
+    return counts[inv.ravel()]
 
 #  identify the source bus area
 def get_source_area(buses, source_bus):
     """Return the area number of the source bus."""
-    for b in buses:
-        if b['BUS_NUM'] == source_bus:
-            return b['AREA']
-    raise ValueError(f"Source bus {source_bus} not found in buses CSV.")
-
-# build lookup: bus_num -> area  (needed for tie-line detection)
-def build_bus_area_lookup(buses):
-    return {b['BUS_NUM']: b['AREA'] for b in buses}
+    hit = np.flatnonzero(buses['BUS_NUM'] == source_bus)
+    if len(hit) == 0:
+        raise ValueError(f"Source bus {source_bus} not found in buses CSV.")
+    return buses['AREA'][hit[0]].item()
+
+# area of each bus in bus_list (-1 if unknown)  (needed for tie-line detection)
+def lookup_area(buses, bus_list):
+    # last occurrence wins, as with a dict built row by row
+    nums, last = np.unique(buses['BUS_NUM'][::-1], return_index=True)
+    area       = buses['AREA'][::-1][last]
+    pos        = np.clip(np.searchsorted(nums, bus_list), 0, len(nums) - 1)
+    return np.where(nums[pos] == bus_list, area[pos], -1)
 
 # ---------------------------------------------------------------------------
 # Filter 1 — monitored loads
@@ -85,12 +145,8 @@ def build_bus_area_lookup(buses):
 # ---------------------------------------------------------------------------
 
 def filter_loads(loads, source_area):
-    result = []
-    for row in loads:
-        if (row['STAT'] == 1
-                and row['PTOTAL_MW'] > 50.0):
-            result.append(row)
-    return result
+    mask = (num(loads, 'STAT') == 1) & (num(loads, 'PTOTAL_MW') > 50.0)
+    return take(loads, mask)
 
 
 LOAD_HEADERS = [
@@ -112,13 +168,10 @@ LOAD_HEADERS = [
 # ---------------------------------------------------------------------------
 
 def filter_buses(buses, source_area):
-    result = []
-    for row in buses:
-        if (row['TYPE'] != 4
-                and row['AREA'] == source_area
-                and row['BASKV'] > 100.0):
-            result.append(row)
-    return result
+    mask = ((num(buses, 'TYPE') != 4)
+            & (buses['AREA'] == source_area)
+            & (num(buses, 'BASKV') > 100.0))
+    return take(buses, mask)
 
 
 BUS_HEADERS = [
@@ -141,46 +194,31 @@ BUS_HEADERS = [
 #   Capability limits (Pmax, Qmax etc.) are summed across machines at the bus.
 # ---------------------------------------------------------------------------
 
+GEN_SUM_COLS = ['PGEN_MW', 'QGEN_MVAR', 'PMAX_MW', 'PMIN_MW',
+                'QMAX_MVAR', 'QMIN_MVAR', 'MBASE_MVA']
+GEN_BUS_COLS = ['AREA', 'ZONE', 'BUS_KV', 'VM_PU', 'VA_DEG']
+
+
 def filter_generators(generators, source_area):
-    # Accumulate per-bus aggregates for in-service machines in the source area
-    agg = defaultdict(lambda: {
-        'PGEN_MW': 0.0, 'QGEN_MVAR': 0.0,
-        'PMAX_MW': 0.0, 'PMIN_MW': 0.0,
-        'QMAX_MVAR': 0.0, 'QMIN_MVAR': 0.0,
-        'MBASE_MVA': 0.0,
-        'MACHINE_COUNT': 0,
-        # Keep bus-level info from the first machine seen (same for all at a bus)
-        'AREA': 0, 'ZONE': 0, 'BUS_KV': 0.0, 'VM_PU': 0.0, 'VA_DEG': 0.0
-    })
-
-    for row in generators:
-        if row['STAT'] != 1:
-            continue
-        bus = row['BUS_NUM']
-        a = agg[bus]
-        a['PGEN_MW']    += row['PGEN_MW']
-        a['QGEN_MVAR']  += row['QGEN_MVAR']
-        a['PMAX_MW']    += row['PMAX_MW']
-        a['PMIN_MW']    += row['PMIN_MW']
-        a['QMAX_MVAR']  += row['QMAX_MVAR']
-        a['QMIN_MVAR']  += row['QMIN_MVAR']
-        a['MBASE_MVA']  += row['MBASE_MVA']
-        a['MACHINE_COUNT'] += 1
-        # Overwrite bus-level fields each time (identical for same bus)
-        a['AREA']    = row['AREA']
-        a['ZONE']    = row['ZONE']
-        a['BUS_KV']  = row['BUS_KV']
-        a['VM_PU']   = row['VM_PU']
-        a['VA_DEG']  = row['VA_DEG']
+    # In-service machines only, grouped by bus (sorted bus order)
+    live = take(generators, num(generators, 'STAT') == 1)
+    bus_nums, inv, counts = np.unique(live['BUS_NUM'], return_inverse=True,
+                                      return_counts=True)
+
+    # bincount adds the weights in row order, i.e. the same running sums
+    # (starting from 0.0) as accumulating machine by machine
+    agg = {'BUS_NUM': bus_nums, 'MACHINE_COUNT': counts}
+    for col in GEN_SUM_COLS:
+        agg[col] = np.bincount(inv, weights=num(live, col), minlength=len(bus_nums))
+
+    # Bus-level fields come from the last machine seen at each bus
+    last = np.zeros(len(bus_nums), dtype=int)
+    np.maximum.at(last, inv, np.arange(len(inv)))
+    for col in GEN_BUS_COLS:
+        agg[col] = live[col][last]
 
     # Keep only buses where total dispatch exceeds threshold
-    result = []
-    for bus_num, a in agg.items():
-        if a['PGEN_MW'] > 50.0:
-            result.append({'BUS_NUM': bus_num, **a})
-
-    result.sort(key=lambda r: r['BUS_NUM'])
-    return result
+    return take(agg, agg['PGEN_MW'] > 50.0)
 
 
 GEN_HEADERS = [
@@ -210,47 +248,40 @@ GEN_HEADERS = [
 #   A 'TIE_LINE' flag column is added so the two categories are distinguishable.
 # ---------------------------------------------------------------------------
 
-def filter_lines(branches, bus_area_lu, source_area, parallel_pairs):
+def annotate_lines(branches, buses):
     """
-    parallel_pairs : set of frozenset({from_bus, to_bus}) with >1 circuit.
-
-    Adds two columns to every output row:
-      PARALLEL       - 1 if another circuit exists between the same bus pair
-                       (in any status / area), 0 otherwise
-      PARALLEL_COUNT - total number of circuits between that bus pair
-                       (includes out-of-service siblings)
+    Add the line columns used by the monitored-lines output, for every branch:
+      FROM_AREA, TO_AREA - area of each end (-1 if the bus is unknown)
+      TIE_LINE           - 1 if the ends are in different areas
+      PARALLEL           - 1 if another circuit exists between the same bus pair
+                           (in any status / area), 0 otherwise
+      PARALLEL_COUNT     - total number of circuits between that bus pair
+                           (includes out-of-service siblings)
     """
-    # Pre-build a count dict for the PARALLEL_COUNT column
-    circuit_count = defaultdict(int)
-    for row in branches:
-        circuit_count[frozenset({row['FROM_BUS'], row['TO_BUS']})] += 1
-
-    result = []
-    for row in branches:
-        if row['STAT'] != 1:
-            continue
+    branches['FROM_AREA']      = lookup_area(buses, branches['FROM_BUS'])
+    branches['TO_AREA']        = lookup_area(buses, branches['TO_BUS'])
+    branches['TIE_LINE']       = (branches['FROM_AREA'] != branches['TO_AREA']).astype(np.int64)
+    branches['PARALLEL_COUNT'] = circuit_counts(branches)
+    branches['PARALLEL']       = (branches['PARALLEL_COUNT'] > 1).astype(np.int64)
+    return branches
 
-        from_area = bus_area_lu.get(row['FROM_BUS'], -1)
-        to_area   = bus_area_lu.get(row['TO_BUS'],   -1)
 
-        is_tie       = (from_area != to_area)
-        is_inarea_hv = (
-            from_area == source_area
-            and to_area == source_area
-            and row['FROM_KV'] > 100.0
-            and row['TO_KV']   > 100.0
-        )
+def line_masks(branches, source_area):
+    """Boolean masks (in-area HV line, tie line) over annotated branches."""
+    live = num(branches, 'STAT') == 1
+    is_tie       = live & (branches['TIE_LINE'] == 1)
+    is_inarea_hv = (live
+                    & (branches['FROM_AREA'] == source_area)
+                    & (branches['TO_AREA']   == source_area)
+                    & (num(branches, 'FROM_KV') > 100.0)
+                    & (num(branches, 'TO_KV')   > 100.0))
+    return is_inarea_hv, is_tie
 
-        if is_inarea_hv or is_tie:
-            pair                 = frozenset({row['FROM_BUS'], row['TO_BUS']})
-            row['TIE_LINE']      = 1 if is_tie          else 0
-            row['FROM_AREA']     = from_area
-            row['TO_AREA']       = to_area
-            row['PARALLEL']      = 1 if pair in parallel_pairs else 0
-            row['PARALLEL_COUNT']= circuit_count[pair]
-            result.append(row)
 
-    return result
+def filter_lines(branches, source_area):
+    """branches must carry the annotate_lines columns."""
+    is_inarea_hv, is_tie = line_masks(branches, source_area)
+    return take(branches, is_inarea_hv | is_tie)
 
 
 LINE_HEADERS = [
@@ -265,56 +296,430 @@ LINE_HEADERS = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Neighbourhood selection
+#   Graph of in-service branches, built once as a CSR adjacency matrix.
+#   Edge weight = |X| (pu) with parallel circuits combined, so the weighted
+#   shortest path is an electrical distance from the source bus; the
+#   unweighted shortest path is the hop count.
+# ---------------------------------------------------------------------------
+
+X_MIN_PU = 1e-4     # floor for zero-impedance / jumper branches
+
+# PSS/E channels created per monitored element by Step4_runsim.py
+CHANNELS_PER = dict(
+    bus  = 2,       # VOLT + ANGL
+    gen  = 4,       # PGEN, QGEN, ETRM, ANGL (per machine)
+    load = 2,       # PLOD + VOLT
+    line = 2,       # P + Q
+)
+
+
+def build_adjacency(buses, branches, transformers=None):
+    """
+    CSR adjacency of in-service branches, plus in-service two-winding
+    transformers when given (Step1's branch table has none, so without them
+    generator terminal buses are unreachable).
+
+    Returns
+    -------
+    adj      : csr_matrix (n_bus x n_bus), weight = equivalent |X| pu
+    bus_nums : sorted array of bus numbers (row/column order of adj)
+    """
+    bus_nums = np.unique(buses['BUS_NUM'])
+    edges    = [branches] if transformers is None else [branches, transformers]
+    fb = np.concatenate([np.asarray(e['FROM_BUS']) for e in edges])
+    tb = np.concatenate([np.asarray(e['TO_BUS']) for e in edges])
+    x  = np.concatenate([num(e, 'X_PU') for e in edges])
+    st = np.concatenate([num(e, 'STAT') for e in edges])
+    live     = (st == 1) & (fb != tb)
+    known    = live & np.isin(fb, bus_nums) & np.isin(tb, bus_nums)
+
+    i = np.searchsorted(bus_nums, fb[known])
+    j = np.searchsorted(bus_nums, tb[known])
+    y = 1.0 / np.maximum(np.abs(x[known]), X_MIN_PU)
+
+    # csr sums duplicate entries: parallel circuits add their 1/X,
+    # inverting afterwards gives the parallel-equivalent reactance
+    n   = len(bus_nums)
+    adj = csr_matrix((np.concatenate([y, y]),
+                      (np.concatenate([i, j]), np.concatenate([j, i]))),
+                     shape=(n, n))
+    adj.data = 1.0 / adj.data
+    return adj, bus_nums
+
+
+def electrical_neighbourhood(adj, bus_nums, source_bus, max_hops=None, max_z=None):
+    """
+    Hop count and electrical distance (pu) from the source bus to every bus
+    in bus_nums; buses beyond max_hops or max_z (either may be None) get inf.
+
+    Returns
+    -------
+    (hops, z_dist) : float arrays aligned with bus_nums
+    """
+    pos = np.searchsorted(bus_nums, source_bus)
+    if pos >= len(bus_nums) or bus_nums[pos] != source_bus:
+        raise ValueError(f"Source bus {source_bus} not found in buses CSV.")
+
+    hops = dijkstra(adj, indices=pos, unweighted=True,
+                    limit=np.inf if max_hops is None else max_hops)
+    z    = dijkstra(adj, indices=pos,
+                    limit=np.inf if max_z is None else max_z)
+    outside = ~(np.isfinite(hops) & np.isfinite(z))
+    hops[outside] = np.inf
+    z[outside]    = np.inf
+    return hops, z
+
+
+def _distance_of(bus_nums, hops, z, bus_list):
+    """(hops, z_dist) of each bus in bus_list, inf if outside / unknown."""
+    pos = np.clip(np.searchsorted(bus_nums, bus_list), 0, len(bus_nums) - 1)
+    hit = bus_nums[pos] == bus_list
+    return np.where(hit, hops[pos], np.inf), np.where(hit, z[pos], np.inf)
+
+
+def _tag_distance(table, h, d):
+    """Attach HOPS / Z_DIST_PU output columns (blank outside the neighbourhood)."""
+    inside = np.isfinite(d)
+    table['HOPS']      = np.array([int(v) if ok else '' for v, ok in zip(h, inside)], dtype=object)
+    table['Z_DIST_PU'] = np.array([float(v) if ok else '' for v, ok in zip(d, inside)], dtype=object)
+    return table
+
+
+def select_neighbourhood(buses, loads, generators, branches, nbhd, channel_budget=None):
+    """
+    Apply the kV / MW / in-service criteria of the area filters, but keep
+    elements inside the neighbourhood instead of the source area. All
+    in-service tie lines are kept. With a channel_budget, the non-tie
+    elements are ranked by electrical distance from the source and added
+    until the budget (PSS/E channel count, see CHANNELS_PER) is spent.
+
+    nbhd : (bus_nums, hops, z_dist) from build_adjacency / electrical_neighbourhood
+
+    Returns (monitored_loads, monitored_buses, monitored_gens, monitored_lines)
+    with HOPS and Z_DIST_PU columns added.
+    """
+    bus_nums, hops, z = nbhd
+
+    m_loads = filter_loads(loads, None)
+    m_gens  = filter_generators(generators, None)
+    m_buses = take(buses, (num(buses, 'TYPE') != 4) & (num(buses, 'BASKV') > 100.0))
+
+    # a line is as close as its closer end
+    hf, zf = _distance_of(bus_nums, hops, z, branches['FROM_BUS'])
+    ht, zt = _distance_of(bus_nums, hops, z, branches['TO_BUS'])
+    from_closer = zf <= zt
+    line_h = np.where(from_closer, hf, ht)
+    line_z = np.where(from_closer, zf, zt)
+
+    _, is_tie = line_masks(branches, None)
+    is_hv = ((num(branches, 'STAT') == 1) & ~is_tie
+             & (num(branches, 'FROM_KV') > 100.0) & (num(branches, 'TO_KV') > 100.0)
+             & np.isfinite(line_z))
+
+    # (kind, row index, hops, z) of every budgeted candidate
+    cand = []
+    for kind, tbl, key in (('load', m_loads, 'BUS_NUM'), ('gen', m_gens, 'BUS_NUM'),
+                           ('bus', m_buses, 'BUS_NUM')):
+        h, d   = _distance_of(bus_nums, hops, z, tbl[key])
+        inside = np.flatnonzero(np.isfinite(d))
+        cost   = CHANNELS_PER[kind] * (tbl['MACHINE_COUNT'][inside] if kind == 'gen'
+                                       else np.ones(len(inside), dtype=int))
+        cand.append((kind, inside, h[inside], d[inside], cost))
+    hv_idx = np.flatnonzero(is_hv)
+    cand.append(('line', hv_idx, line_h[hv_idx], line_z[hv_idx],
+                 np.full(len(hv_idx), CHANNELS_PER['line'])))
+
+    keep = {kind: idx for kind, idx, _, _, _ in cand}
+    if channel_budget is not None:
+        n_ties    = int(is_tie.sum())
+        remaining = channel_budget - CHANNELS_PER['line'] * n_ties
+        if remaining < 0:
+            print(f"  [!] {n_ties} tie lines alone exceed the channel budget "
+                  f"({channel_budget}); keeping ties only")
+        kinds = np.concatenate([[k] * len(idx) for k, idx, _, _, _ in cand])
+        idxs  = np.concatenate([idx for _, idx, _, _, _ in cand])
+        h_all = np.concatenate([h for _, _, h, _, _ in cand])
+        z_all = np.concatenate([d for _, _, _, d, _ in cand])
+        c_all = np.concatenate([c for _, _, _, _, c in cand])
+        order = np.lexsort((h_all, z_all))               # closest first, stable
+        fits  = np.cumsum(c_all[order]) <= remaining     # stop at first overflow
+        fits  = order[:np.argmin(fits)] if not fits.all() else order
+        keep  = {k: np.sort(idxs[fits][kinds[fits] == k]) for k in keep}
+
+    out = []
+    for kind, tbl in (('load', m_loads), ('bus', m_buses), ('gen', m_gens)):
+        sub  = take(tbl, keep[kind])
+        h, d = _distance_of(bus_nums, hops, z, sub['BUS_NUM'])
+        out.append(_tag_distance(sub, h, d))
+
+    line_keep = np.zeros(nrows(branches), dtype=bool)
+    line_keep[keep['line']] = True
+    line_keep |= is_tie
+    m_lines = _tag_distance(take(branches, line_keep), line_h[line_keep], line_z[line_keep])
+
+    m_loads, m_buses, m_gens = out
+    return m_loads, m_buses, m_gens, m_lines
+
+
+def estimate_channels(monitored_loads, monitored_buses, monitored_gens, monitored_lines):
+    """Approximate number of PSS/E channels Step4 will create for these sets."""
+    return int(CHANNELS_PER['load'] * nrows(monitored_loads)
+               + CHANNELS_PER['bus'] * nrows(monitored_buses)
+               + CHANNELS_PER['gen'] * monitored_gens['MACHINE_COUNT'].sum()
+               + CHANNELS_PER['line'] * nrows(monitored_lines))
+
+
+# ---------------------------------------------------------------------------
+# Impact ranking and top-K channel budgeting
+#   Candidates are scored by predicted impact of an oscillation injected at
+#   the source bus, using the Step2a sensitivities and Step2c modes:
+#     buses      : (|dV/dP| + |dV/dQ|)           x proximity
+#     loads      : PTOTAL_MW x |dV/dP| at bus    x proximity
+#     generators : |dTheta/dP| x PGEN_MW         x proximity
+#     lines      : |P_FROM_MW|                   x proximity
+#   proximity = exp(-Z / Z_reach), Z = electrical distance from the source.
+#   Z_reach follows the modes excitable from the source bus: lightly damped,
+#   large inter-area modes spread the impact far, local modes keep it close.
+#   Elements missing from the sensitivity files get the category median.
+# ---------------------------------------------------------------------------
+
+Z_REACH_LOCAL     = 0.05   # pu — electrical reach of local / control modes (>= 1 Hz)
+Z_REACH_INTERAREA = 0.50   # pu — electrical reach of inter-area modes (< 1 Hz)
+Z_REACH_DEFAULT   = 0.10   # pu — used when no mode estimates are available
+ZETA_FLOOR        = 0.01   # damping floor when weighting modes by amplitude / zeta
+
+
+def mode_reach(data_dir, source_bus):
+    """Electrical reach (pu) from the Step2c modes of the source bus:
+    reach of each mode weighted by amplitude / damping."""
+    path = Path(data_dir) / f"mode_estimates_{source_bus}.csv"
+    if not path.exists():
+        print(f"  [!] {path.name} not found — using default reach {Z_REACH_DEFAULT} pu")
+        return Z_REACH_DEFAULT
+    modes = read_table(path)
+    if nrows(modes) == 0:
+        return Z_REACH_DEFAULT
+    w     = num(modes, 'amplitude') / np.maximum(num(modes, 'zeta'), ZETA_FLOOR)
+    reach = np.where(num(modes, 'freq_hz') < 1.0, Z_REACH_INTERAREA, Z_REACH_LOCAL)
+    return float(np.sum(w * reach) / np.sum(w))
+
+
+def _sens_lookup(sens, key_col, val_col, bus_list):
+    """|sensitivity| at each bus of bus_list; category median where missing."""
+    vals = np.abs(num(sens, val_col)) if sens is not None else np.array([])
+    if len(vals) == 0:
+        return np.ones(len(bus_list))
+    keys, first = np.unique(sens[key_col], return_index=True)
+    vals = vals[first]
+    pos  = np.clip(np.searchsorted(keys, bus_list), 0, len(keys) - 1)
+    hit  = keys[pos] == bus_list
+    return np.where(hit, vals[pos], np.nanmedian(vals))
+
+
+def impact_scores(data_dir, source_bus, buses, branches, sets, transformers=None):
+    """
+    Score every element of sets = (loads, buses, gens, lines).
+    Returns a list of four score arrays aligned with the tables.
+    """
+    data_dir = Path(data_dir)
+    v_path   = data_dir / "voltage_sensitivities.csv"
+    a_path   = data_dir / "angle_sensitivities.csv"
+    v_sens   = read_table(v_path) if v_path.exists() else None
+    a_sens   = read_table(a_path) if a_path.exists() else None
+    for path, tbl in ((v_path, v_sens), (a_path, a_sens)):
+        if tbl is None:
+            print(f"  [!] {path.name} not found — run Step2a for sensitivity-aware ranking")
+
+    z_reach = mode_reach(data_dir, source_bus)
+    print(f"  Impact ranking: electrical reach {z_reach:.3f} pu")
+
+    adj, bus_nums = build_adjacency(buses, branches, transformers)
+    hops, z_dist  = electrical_neighbourhood(adj, bus_nums, source_bus)
+
+    # buses that are still unreachable (islands, or no transformer data when
+    # the case RAW is missing) are put at the farthest reachable distance and
+    # ranked by sensitivity and size
+    z_far = np.max(z_dist[np.isfinite(z_dist)])
+
+    def proximity(bus_list):
+        _, d = _distance_of(bus_nums, hops, z_dist, bus_list)
+        return np.exp(-np.minimum(d, z_far) / z_reach)
+
+    m_loads, m_buses, m_gens, m_lines = sets
+    b = m_buses['BUS_NUM']
+    s_bus  = ((_sens_lookup(v_sens, 'Bus', 'dV/dP', b) + _sens_lookup(v_sens, 'Bus', 'dV/dQ', b))
+              * proximity(b))
+    b = m_loads['BUS_NUM']
+    s_load = num(m_loads, 'PTOTAL_MW') * _sens_lookup(v_sens, 'Bus', 'dV/dP', b) * proximity(b)
+    b = m_gens['BUS_NUM']
+    s_gen  = (_sens_lookup(a_sens, 'Bus', 'dTheta/dP', b) * np.abs(num(m_gens, 'PGEN_MW'))
+              * proximity(b))
+    s_line = (np.abs(num(m_lines, 'P_FROM_MW'))
+              * np.maximum(proximity(m_lines['FROM_BUS']), proximity(m_lines['TO_BUS'])))
+    return [np.nan_to_num(s) for s in (s_load, s_bus, s_gen, s_line)]
+
+
+def rank_and_budget(sets, scores, top_k=None, channel_budget=None):
+    """
+    Keep the top_k highest-impact elements per category, then — if the
+    estimated channel count still exceeds channel_budget — drop the
+    elements with the lowest category-normalised score until it fits.
+    Tie lines are always kept. Row order of every table is preserved and
+    an IMPACT_SCORE column is added.
+    """
+    kinds = ('load', 'bus', 'gen', 'line')
+    ties  = [np.zeros(nrows(tbl), dtype=bool) for tbl in sets]
+    ties[3] = sets[3]['TIE_LINE'] == 1
+
+    keep = []
+    for tbl, sc, tie in zip(sets, scores, ties):
+        k    = nrows(tbl) if top_k is None else min(top_k, nrows(tbl))
+        mask = tie.copy()
+        mask[np.argsort(-sc, kind='stable')[:k]] = True
+        keep.append(mask)
+
+    if channel_budget is not None:
+        cost = [CHANNELS_PER[kind] * (tbl['MACHINE_COUNT'] if kind == 'gen'
+                                      else np.ones(nrows(tbl), dtype=int))
+                for kind, tbl in zip(kinds, sets)]
+        norm = [sc / sc.max() if len(sc) and sc.max() > 0 else np.zeros(len(sc))
+                for sc in scores]
+        remaining = channel_budget - int(cost[3][ties[3]].sum())
+
+        # candidates competing for the budget: kept, non-tie elements
+        free = np.concatenate([m & ~t for m, t in zip(keep, ties)])
+        cat  = np.concatenate([np.full(len(m), c) for c, m in enumerate(keep)])[free]
+        row  = np.concatenate([np.arange(len(m)) for m in keep])[free]
+        nsc  = np.concatenate(norm)[free]
+        cst  = np.concatenate(cost)[free]
+
+        order  = np.argsort(-nsc, kind='stable')
+        fits   = np.cumsum(cst[order]) <= remaining      # stop at first overflow
+        chosen = order if fits.all() else order[:np.argmin(fits)]
+        keep   = [t.copy() for t in ties]
+        for c in range(4):
+            keep[c][row[chosen][cat[chosen] == c]] = True
+
+    out = []
+    for tbl, sc, mask in zip(sets, scores, keep):
+        tbl = dict(tbl, IMPACT_SCORE=sc)
+        out.append(take(tbl, mask))
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def channels(source_bus, data_dir, case_stem):
+def load_transformers(case_dir, case_stem):
+    """Two-winding transformers from the case RAW (raw_parser), or None if it is missing."""
+    raw_file = Path(case_dir) / f"{case_stem}.raw"
+    if not raw_file.exists():
+        print(f"  [!] {raw_file.name} not found — transformers left out of the network graph, "
+              "buses behind them (generator terminals) count as unreachable")
+        return None
+    xfmr = raw_parser.parse_transformers(raw_file)
+    print(f"  Loaded {nrows(xfmr)} two-winding transformers from {raw_file.name}")
+    return xfmr
+
+
+def channels(source_bus, data_dir, case_stem, selection='area',
+             max_hops=None, max_z=None, channel_budget=None, top_k=None,
+             case_dir=None):
+    """
+    Build and write the monitored sets.
+
+    selection      : 'area' (source-area filters) or 'neighbourhood'
+    max_hops       : neighbourhood radius in branches
+    max_z          : neighbourhood radius in accumulated series reactance (pu)
+    channel_budget : maximum PSS/E channel count
+    top_k          : keep only the top_k highest-impact elements per category
+                     (sensitivity- and mode-aware ranking); with top_k set the
+                     channel budget is also spent by impact instead of distance
+    case_dir       : folder with <case_stem>.raw, read for the transformers of
+                     the network graph (default: PSSE_Cases next to data_dir)
+    """
+    ranked = top_k is not None
     data_dir = Path(data_dir)
 
-    # --- load input CSVs ---
-    print(f"\nReading CSVs from: {data_dir}")
-    buses      = read_csv(data_dir / f"{case_stem}_buses.csv")
-    branches   = read_csv(data_dir / f"{case_stem}_branches.csv")
-    generators = read_csv(data_dir / f"{case_stem}_generators.csv")
-    loads      = read_csv(data_dir / f"{case_stem}_loads.csv")
-    print(f"  Loaded {len(buses)} buses, {len(branches)} branches, "
-          f"{len(generators)} generators, {len(loads)} loads")
+    # --- load case tables (columnar store from Step1 if present, else CSVs) ---
+    names  = ["buses", "branches", "generators", "loads"]
+    stored = case_store.load_case(data_dir, case_stem, names)
+    if stored is not None and all(n in stored for n in names):
+        print(f"\nReading case store: {case_store.find_store(data_dir, case_stem)}")
+        buses, branches, generators, loads = (stored[n] for n in names)
+    else:
+        print(f"\nReading CSVs from: {data_dir}")
+        buses, branches, generators, loads = (
+            read_table(data_dir / f"{case_stem}_{n}.csv") for n in names)
+    print(f"  Loaded {nrows(buses)} buses, {nrows(branches)} branches, "
+          f"{nrows(generators)} generators, {nrows(loads)} loads")
 
     # --- identify source area ---
-    source_area   = get_source_area(buses, source_bus)
-    bus_area_lu   = build_bus_area_lookup(buses)
-    parallel_pairs = build_parallel_lookup(branches)
+    source_area = get_source_area(buses, source_bus)
+    branches    = annotate_lines(branches, buses)
+    fb, tb      = branches['FROM_BUS'], branches['TO_BUS']
+    n_parallel  = len(np.unique(np.column_stack([np.minimum(fb, tb), np.maximum(fb, tb)])
+                                [branches['PARALLEL'] == 1], axis=0))
     print(f"\nSource bus : {source_bus}")
     print(f"Source area: {source_area}")
-    print(f"Bus pairs with parallel circuits: {len(parallel_pairs)}")
+    print(f"Bus pairs with parallel circuits: {n_parallel}")
 
     # --- apply filters ---
     print("\nBuilding monitored sets:")
-    monitored_loads = filter_loads(loads, source_area)
-    monitored_buses = filter_buses(buses, source_area)
-    monitored_gens  = filter_generators(generators, source_area)
-    monitored_lines = filter_lines(branches, bus_area_lu, source_area, parallel_pairs)
+    extra = []
+    transformers = None
+    if selection == 'neighbourhood' or ranked:
+        transformers = load_transformers(case_dir or data_dir.parent / "PSSE_Cases", case_stem)
+    if selection == 'neighbourhood':
+        adj, bus_nums = build_adjacency(buses, branches, transformers)
+        hops, z_dist  = electrical_neighbourhood(adj, bus_nums, source_bus, max_hops, max_z)
+        print(f"  Neighbourhood: {int(np.isfinite(z_dist).sum())} buses "
+              f"(max hops {max_hops}, max Z {max_z} pu, budget {channel_budget})")
+        monitored_loads, monitored_buses, monitored_gens, monitored_lines = \
+            select_neighbourhood(buses, loads, generators, branches,
+                                 (bus_nums, hops, z_dist),
+                                 None if ranked else channel_budget)
+        extra = ['HOPS', 'Z_DIST_PU']
+    else:
+        monitored_loads = filter_loads(loads, source_area)
+        monitored_buses = filter_buses(buses, source_area)
+        monitored_gens  = filter_generators(generators, source_area)
+        monitored_lines = filter_lines(branches, source_area)
+
+    if ranked:
+        sets   = (monitored_loads, monitored_buses, monitored_gens, monitored_lines)
+        scores = impact_scores(data_dir, source_bus, buses, branches, sets, transformers)
+        monitored_loads, monitored_buses, monitored_gens, monitored_lines = \
+            rank_and_budget(sets, scores, top_k, channel_budget)
+        print(f"  Kept top {top_k} per category by impact"
+              + (f", channel budget {channel_budget}" if channel_budget else ""))
+        extra = extra + ['IMPACT_SCORE']
 
     # --- write outputs ---
     print("\nWriting monitored CSVs:")
-    write_csv(data_dir / "monitored_loads.csv",      monitored_loads, LOAD_HEADERS)
-    write_csv(data_dir / "monitored_buses.csv",      monitored_buses, BUS_HEADERS)
-    write_csv(data_dir / "monitored_generators.csv", monitored_gens,  GEN_HEADERS)
-    write_csv(data_dir / "monitored_lines.csv",      monitored_lines, LINE_HEADERS)
+    write_table(data_dir / "monitored_loads.csv",      monitored_loads, LOAD_HEADERS + extra)
+    write_table(data_dir / "monitored_buses.csv",      monitored_buses, BUS_HEADERS + extra)
+    write_table(data_dir / "monitored_generators.csv", monitored_gens,  GEN_HEADERS + extra)
+    write_table(data_dir / "monitored_lines.csv",      monitored_lines, LINE_HEADERS + extra)
+    print(f"  Estimated PSS/E channels: "
+          f"{estimate_channels(monitored_loads, monitored_buses, monitored_gens, monitored_lines)}")
 
     # --- console summary ---
-    in_area_lines = sum(1 for r in monitored_lines if r['TIE_LINE'] == 0)
-    tie_lines     = sum(1 for r in monitored_lines if r['TIE_LINE'] == 1)
-    parallel_lines= sum(1 for r in monitored_lines if r['PARALLEL'] == 1)
+    in_area_lines = int(np.sum(monitored_lines['TIE_LINE'] == 0))
+    tie_lines     = int(np.sum(monitored_lines['TIE_LINE'] == 1))
+    parallel_lines= int(np.sum(monitored_lines['PARALLEL'] == 1))
+    scope         = 'in neighbourhood' if selection == 'neighbourhood' else 'in area'
 
     print(f"""
 Summary for source bus {source_bus} (area {source_area}):
-  Monitored loads       : {len(monitored_loads):>5}  (in-service, >50 MW, in area)
-  Monitored buses       : {len(monitored_buses):>5}  (in-service, >100 kV, in area)
-  Monitored gen buses   : {len(monitored_gens):>5}  (in-service, aggregated >50 MW, in area)
-  Monitored lines       : {len(monitored_lines):>5}  total
-    - In-area HV lines  : {in_area_lines:>5}  (>100 kV, both ends in area)
+  Monitored loads       : {nrows(monitored_loads):>5}  (in-service, >50 MW, {scope})
+  Monitored buses       : {nrows(monitored_buses):>5}  (in-service, >100 kV, {scope})
+  Monitored gen buses   : {nrows(monitored_gens):>5}  (in-service, aggregated >50 MW, {scope})
+  Monitored lines       : {nrows(monitored_lines):>5}  total
+    - In-area HV lines  : {in_area_lines:>5}  (>100 kV, {'both ends in area' if selection != 'neighbourhood' else scope})
     - Inter-area ties   : {tie_lines:>5}  (crosses area boundary)
     - With parallel ckt : {parallel_lines:>5}  (PARALLEL=1, any status sibling)
 """)
@@ -325,10 +730,23 @@ Summary for source bus {source_bus} (area {source_area}):
 # ---------------------------------------------------------------------------
 
 if __name__ == '__main__':
-    import pandas as pd 
     root = Path.cwd()
     data_dir = root/"Processing"
     config_params = pd.read_csv(root/"simulation_config.csv")
     source_bus = int(config_params[config_params.Variable=='bus_number']['Value'].iloc[0])
     case_stem = config_params[config_params.Variable=='case_name']['Value'][0]
-    channels(source_bus, data_dir, case_stem)
\ No newline at end of file
+
+    def _cfg(var, cast=str, default=None):
+        row = config_params[config_params.Variable == var]
+        if row.empty:
+            return default
+        v = row['Value'].iloc[0]
+        return default if (str(v).strip().lower() == 'nan' or str(v).strip() == '') else cast(v)
+
+    channels(source_bus, data_dir, case_stem,
+             selection      = _cfg('monitor_selection', str, default='area').strip().lower(),
+             max_hops       = _cfg('monitor_max_hops',  int),
+             max_z          = _cfg('monitor_max_z_pu',  float),
+             channel_budget = _cfg('channel_budget',    int),
+             top_k          = _cfg('monitor_top_k',     int),
+             case_dir       = root/"PSSE_Cases")
\ No newline at end of file
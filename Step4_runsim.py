@@ -19,6 +19,7 @@ import os, sys, time
 import pandas as pd 
 from pathlib import Path
 
+import mode_atlas
 
 from psse_config import configure_psse
 psse_version = 35
@@ -328,10 +329,11 @@ def main():
 
     bus_number          = _cfg('bus_number',                  int)
     oscillation_shape   = _cfg('oscillation_shape',           str,   default='square')
-    oscillation_freq    = _cfg('oscillation_frequency',       float)
+    oscillation_freq    = mode_atlas.resolve_frequency(config)   # blank -> least-damped atlas mode
     oscillation_amp     = _cfg('oscillation_amplitude',       float)
     oscillation_freq_in = _cfg('oscillation_frequency_fast', float)   # only needed for biperiodic
                                                                     # ignored otherwise
+
     print(f"Bus            : {bus_number}")
     print(f"Shape          : {oscillation_shape}")
     print(f"Frequency      : {oscillation_freq} Hz")
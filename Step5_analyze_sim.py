@@ -28,10 +28,14 @@ import numpy as np
 import pandas as pd
 from pathlib import Path
 
+import case_store
+import mode_atlas
+import sim_cache
+
 # ── RARELY NEED CHANGING ──────────────────────────────────────────────────
 HV_THRESHOLD_KV       = 10.0      # kV  — minimum base kV for "HV bus"
 F_NOM                 = 60.0      # Hz  — nominal system frequency
-TIMESERIES_MAX_POINTS = 3000      # max points per downsampled time series
+TIMESERIES_MAX_POINTS = 3000      # max points per time-series group (min/max decimated)
 
 # Simulator outputs power in per-unit on a 100 MVA system base.
 # Multiplying by POWER_SCALE converts to MW / MVar.
@@ -50,6 +54,7 @@ SIM_FILE   = None   # path to the simulation CSV (results/<bus>_sim.csv)
 META_DIR   = None   # Processing/ folder
 OUTPUT_DIR = None   # results/ folder
 META_FILES = {}     # populated once case_name is known
+CASE_NAME  = None   # case stem, used to find the Step1 case store
 
 # LDDL column names — exact match against sim CSV headers
 LDDL_COLS = {
@@ -79,6 +84,17 @@ RISK_THRESHOLDS = dict(
     lddl_v_swing_pu     = 0.05,   # pu   — LDDL bus voltage swing
 )
 
+# ── Top-K worst offenders exported for dashboard paging ──────────────────
+# Per category: {metric column: "max" (largest is worst) | "min"}.
+# K comes from timeseries_top_k in simulation_config.csv (0 = off).
+TIMESERIES_TOP_K   = 5
+TIMESERIES_METRICS = {
+    "gen":  {"pg_swing": "max", "qg_swing": "max", "freq_swing": "max", "angle_swing": "max"},
+    "line": {"pbr_swing": "max", "qbr_swing": "max"},
+    "bus":  {"v_swing": "max", "v_min": "min", "v_max": "max"},
+    "load": {"pld_swing": "max"},
+}
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PEAK-TO-PEAK SWING
@@ -133,7 +149,9 @@ def load_sim_full():
 
 
 def load_meta(key):
-    """Load a metadata CSV."""
+    """Load a metadata table (Step1 case store if present, else the CSV)."""
+    if CASE_NAME and key in case_store.TABLES:
+        return case_store.load_case_frame(META_DIR, CASE_NAME, key)
     return pd.read_csv(os.path.join(str(META_DIR), META_FILES[key]))
 
 
@@ -173,16 +191,16 @@ def ptp(arr2d, t):
 
 
 def derive_freq(abus_arr, t):
-    """Compute instantaneous frequency (Hz) from bus angle (degrees) array."""
+    """Compute instantaneous frequency (Hz) from bus angle (degrees), per column for 2-D input."""
     dt_scalar = float(np.median(np.diff(t)))
     if dt_scalar <= 0:
         raise ValueError(f"derive_freq: non-positive median dt={dt_scalar}. Check time column.")
-    d_angle = np.diff(abus_arr, prepend=abus_arr[0])
+    d_angle = np.diff(abus_arr, axis=0, prepend=abus_arr[:1])   # (samples,) or (samples, n)
     return F_NOM + d_angle / (360.0 * dt_scalar)
 
 
-def round6(lst):
-    return [round(float(v), 6) for v in lst]
+def round6(arr):
+    return np.round(np.asarray(arr, dtype=float), 6).tolist()
 
 
 def gen_bus_set(df):
@@ -1033,16 +1051,25 @@ def write_violation_counts_csv(metrics_gen, metrics_line, metrics_bus,
 # ═══════════════════════════════════════════════════════════════════════════
 
 def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, metrics_load, metrics_lddl):
-    """Build worst-offender time series from the FULL (untruncated) simulation data."""
-    ts     = {}
-    stride = max(1, len(t_full) // TIMESERIES_MAX_POINTS)
-    sl     = slice(None, None, stride)
+    """Build worst-offender time series from the FULL (untruncated) simulation data.
 
+    Each group (gen, line, bus, load, lddl) is decimated on one shared time
+    axis that keeps the per-bucket minimum and maximum of every series in
+    the group (sim_cache.minmax_indices), so swing peaks survive."""
+    ts     = {}
     t      = t_full   # already shifted to start at 0 by load_sim_full()
     df     = df_full
 
     def safe_arr(col):
-        return df[col].to_numpy()[sl] if col else np.zeros(len(t))[sl]
+        return df[col].to_numpy(dtype=float) if col else np.zeros(len(t))
+
+    def group(label, series):
+        """{label, t, <name>: values} on the min/max-decimated time axis."""
+        Y   = np.column_stack(list(series.values()))
+        idx = sim_cache.minmax_indices(Y, TIMESERIES_MAX_POINTS)
+        out = {"label": label, "t": round6(t[idx])}
+        out.update({name: round6(Y[idx, j]) for j, name in enumerate(series)})
+        return out
 
     # ── Worst generator (highest pg_swing) ──────────────────────────────
     worst_gen_bus = int(metrics_gen.loc[metrics_gen["pg_swing"].idxmax(), "bus_num"])
@@ -1056,15 +1083,13 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
     abus_arr = df[angl_col].to_numpy() if angl_col else np.zeros(len(t))
     freq_arr = derive_freq(abus_arr, t)
 
-    ts["gen"] = {
-        "label": f"Generator at Bus {worst_gen_bus}",
-        "t":    round6(t[sl]),
-        "pg":   round6(safe_arr(gcol("powr")) * POWER_SCALE),
-        "qg":   round6(safe_arr(gcol("vars")) * POWER_SCALE),
-        "vt":   round6(safe_arr(gcol("etrm"))),
-        "abus": round6(abus_arr[sl]),
-        "freq": round6(freq_arr[sl]),
-    }
+    ts["gen"] = group(f"Generator at Bus {worst_gen_bus}", {
+        "pg":   safe_arr(gcol("powr")) * POWER_SCALE,
+        "qg":   safe_arr(gcol("vars")) * POWER_SCALE,
+        "vt":   safe_arr(gcol("etrm")),
+        "abus": abus_arr,
+        "freq": freq_arr,
+    })
     print(f"-> Worst generator: Bus {worst_gen_bus}")
 
     # ── Worst line (highest pbr_swing) ───────────────────────────────────
@@ -1077,12 +1102,10 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
     p_col  = next((c for c, f, t_, k, pq in parsed if f == fb and t_ == tb and k == ckt and pq == "P"), None)
     q_col  = next((c for c, f, t_, k, pq in parsed if f == fb and t_ == tb and k == ckt and pq == "Q"), None)
 
-    ts["line"] = {
-        "label": f"Line {fb} \u2192 {tb} (ckt {ckt})",
-        "t":   round6(t[sl]),
-        "pbr": round6(safe_arr(p_col)),
-        "qbr": round6(safe_arr(q_col)),
-    }
+    ts["line"] = group(f"Line {fb} \u2192 {tb} (ckt {ckt})", {
+        "pbr": safe_arr(p_col),
+        "qbr": safe_arr(q_col),
+    })
     print(f"-> Worst line: {fb} → {tb} (ckt {ckt})")
 
     # ── Worst HV bus (highest v_swing) ───────────────────────────────────
@@ -1094,12 +1117,10 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
         return next((c for c in cols_by_prefix(df, pfx)
                      if extract_bus_nums(c) and extract_bus_nums(c)[0] == worst_bus_num), None)
 
-    ts["bus"] = {
-        "label": f"HV Bus {worst_bus_num} ({worst_bus_kv:.0f} kV)",
-        "t":    round6(t[sl]),
-        "vbus": round6(safe_arr(bcol("volt"))),
-        "abus": round6(safe_arr(bcol("angl"))),
-    }
+    ts["bus"] = group(f"HV Bus {worst_bus_num} ({worst_bus_kv:.0f} kV)", {
+        "vbus": safe_arr(bcol("volt")),
+        "abus": safe_arr(bcol("angl")),
+    })
     print(f"-> Worst HV bus: {worst_bus_num} ({worst_bus_kv:.0f} kV)")
 
     # ── Worst load bus (highest pld_swing) ───────────────────────────────
@@ -1109,12 +1130,10 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
         return next((c for c in cols_by_prefix(df, pfx)
                      if extract_bus_nums(c) and extract_bus_nums(c)[0] == worst_load_bus), None)
 
-    ts["load"] = {
-        "label": f"Load Bus {worst_load_bus}",
-        "t":    round6(t[sl]),
-        "pld":  round6(safe_arr(lcol("plod")) * POWER_SCALE),
-        "vbul": round6(safe_arr(lcol("volt"))),
-    }
+    ts["load"] = group(f"Load Bus {worst_load_bus}", {
+        "pld":  safe_arr(lcol("plod")) * POWER_SCALE,
+        "vbul": safe_arr(lcol("volt")),
+    })
     print(f"-> Worst load bus: {worst_load_bus}")
 
     # ── LDDL time series ─────────────────────────────────────────────────
@@ -1123,17 +1142,13 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
     for key, col in LDDL_COLS.items():
         if col not in df.columns:
             continue
-        arr = df[col].to_numpy()
+        arr = df[col].to_numpy(dtype=float)
         if key in LDDL_POWER_KEYS:
             arr = arr * POWER_SCALE
-        lddl_signals[key] = round6(arr[sl])
+        lddl_signals[key] = arr
 
     if lddl_signals:
-        ts["lddl"] = {
-            "label": "LDDL Signals",
-            "t": round6(t[sl]),
-            **lddl_signals,
-        }
+        ts["lddl"] = group("LDDL Signals", lddl_signals)
         print(f"-> LDDL time series included: {list(lddl_signals.keys())}")
     else:
         print("-> No LDDL columns found for time series")
@@ -1141,13 +1156,138 @@ def build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, me
     return ts
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# TOP-K WORST OFFENDERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Per category: element key columns and the series exported for each
+# element as (name, channel prefix, scale). Line prefixes are P / Q.
+TOP_KEYS = {
+    "gen":  ["bus_num"],
+    "line": ["from_bus", "to_bus", "ckt"],
+    "bus":  ["bus_num"],
+    "load": ["bus_num"],
+}
+TOP_SERIES = {
+    "gen":  [("pg", "powr", POWER_SCALE), ("qg", "vars", POWER_SCALE),
+             ("vt", "etrm", 1.0), ("abus", "angl", 1.0)],
+    "line": [("pbr", "P", 1.0), ("qbr", "Q", 1.0)],
+    "bus":  [("vbus", "volt", 1.0), ("abus", "angl", 1.0)],
+    "load": [("pld", "plod", POWER_SCALE), ("vbul", "volt", 1.0)],
+}
+
+
+def top_k_keys(metrics, key_cols, metric, worst, k):
+    """Keys of the k worst elements for one metric, worst first.
+    Machines / loads sharing a bus are merged (their worst value counts)."""
+    if metric not in metrics.columns or metrics.empty:
+        return []
+    per_key = metrics.groupby(key_cols, sort=False)[metric].agg(worst)
+    vals    = per_key.to_numpy(dtype=float)
+    vals    = -vals if worst == "max" else vals           # ascending = worse first
+    vals    = np.where(np.isnan(vals), np.inf, vals)
+    k       = min(k, len(vals))
+    if k == 0:
+        return []
+    part = np.argpartition(vals, k - 1)[:k]
+    part = part[np.argsort(vals[part], kind="stable")]
+    keys = per_key.index[part]
+    return [tuple(int(x) for x in key) if isinstance(key, tuple) else (int(key),) for key in keys]
+
+
+def channel_positions(df):
+    """{(prefix, bus): column position} for bus-keyed channels and
+    {(P|Q, from, to, ckt): position} for lines; first match wins, as in
+    build_timeseries."""
+    pos = {}
+    for i, col in enumerate(df.columns):
+        nums = extract_bus_nums(col)
+        if nums and not col.upper().startswith("LINE_"):
+            pos.setdefault((prefix_of(col), nums[0]), i)
+    for col, fb, tb, ckt, pq in line_cols(df):
+        pos.setdefault((pq, fb, tb, ckt), df.columns.get_loc(col))
+    return pos
+
+
+def top_label(cat, key, metrics_bus):
+    if cat == "gen":
+        return f"Generator at Bus {key[0]}"
+    if cat == "line":
+        return f"Line {key[0]} \u2192 {key[1]} (ckt {key[2]})"
+    if cat == "load":
+        return f"Load Bus {key[0]}"
+    kv = metrics_bus.loc[metrics_bus["bus_num"] == key[0], "BASKV"]
+    return f"HV Bus {key[0]} ({kv.iloc[0]:.0f} kV)" if len(kv) else f"HV Bus {key[0]}"
+
+
+def build_top_series(t_full, df_full, metrics, top_k=TIMESERIES_TOP_K):
+    """
+    Time series of the top-K worst elements per category and metric.
+
+    Elements are ranked with np.argpartition per metric; the union of the
+    selected elements of a category is gathered from the channel matrix
+    with one fancy-index (samples x elements x series) and min/max
+    decimated on one shared time axis. Only the gathered block is copied;
+    missing channels are zero.
+
+    Returns
+    -------
+    {category: {"t": [...], "rank": {metric: [element index, ...]},
+                "elements": [{"label", <series>: [...]}, ...]}}
+    """
+    M    = df_full.to_numpy()                               # no copy for a single-dtype frame
+    pos  = channel_positions(df_full)
+    out  = {}
+
+    for cat, metric_dirs in TIMESERIES_METRICS.items():
+        table = metrics.get(cat)
+        if table is None or table.empty:
+            continue
+        keys, rank = [], {}
+        for metric, worst in metric_dirs.items():
+            sel = top_k_keys(table, TOP_KEYS[cat], metric, worst, top_k)
+            if not sel:
+                continue
+            for key in sel:
+                if key not in keys:
+                    keys.append(key)
+            rank[metric] = [keys.index(key) for key in sel]
+        if not keys:
+            continue
+
+        spec  = TOP_SERIES[cat]
+        idx   = np.array([[pos.get((pfx,) + key if cat == "line" else (pfx, key[0]), -1)
+                           for _, pfx, _ in spec] for key in keys])          # (K, S), -1 = missing
+        found = idx >= 0
+        scale = np.array([sc for _, _, sc in spec])
+        G     = np.asarray(M[:, np.maximum(idx, 0)], dtype=float) * scale     # (n, K, S)
+        G[:, ~found] = 0.0
+        names = [name for name, _, _ in spec]
+        if cat == "gen":                                                     # frequency from angle
+            G     = np.concatenate([G, derive_freq(G[:, :, 3], t_full)[:, :, None]], axis=2)
+            names = names + ["freq"]
+
+        n, K, S = G.shape
+        ix = sim_cache.minmax_indices(G.reshape(n, K * S), TIMESERIES_MAX_POINTS)
+        Gd = G[ix]
+        out[cat] = {
+            "t":        round6(t_full[ix]),
+            "rank":     rank,
+            "elements": [dict({"label": top_label(cat, key, metrics.get("bus"))},
+                              **{name: round6(Gd[:, e, j]) for j, name in enumerate(names)})
+                         for e, key in enumerate(keys)],
+        }
+        print(f"-> Top {top_k} {cat}: {len(keys)} elements over {len(rank)} metrics")
+    return out
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════
 
 def main():
     global OSCILLATION_FREQ_HZ, START_TIME_SEC
-    global SIM_FILE, META_DIR, OUTPUT_DIR, META_FILES
+    global SIM_FILE, META_DIR, OUTPUT_DIR, META_FILES, CASE_NAME
 
     # ── Read simulation_config.csv ────────────────────────────────────────
     root   = Path.cwd()
@@ -1162,9 +1302,10 @@ def main():
 
     case_name           = _cfg('case_name',            str)
     bus_number          = _cfg('bus_number',            int)
-    OSCILLATION_FREQ_HZ = _cfg('oscillation_frequency', float)
+    OSCILLATION_FREQ_HZ = mode_atlas.resolve_frequency(config)   # blank -> atlas mode, as Step4
     osc_amp_mw          = _cfg('oscillation_amplitude', float)
     START_TIME_SEC      = _cfg('start_time_sec',        float, default=1.0)
+    top_k               = _cfg('timeseries_top_k',      int,   default=TIMESERIES_TOP_K)
 
     META_DIR   = str(root / "Processing")
     OUTPUT_DIR = str(root / "results")
@@ -1175,6 +1316,7 @@ def main():
     amp_str  = str(int(osc_amp_mw)) if osc_amp_mw == int(osc_amp_mw) else str(osc_amp_mw)
     run_tag  = f"bus{bus_number}_{freq_str}Hz_{amp_str}MW"
 
+    CASE_NAME = case_name
     META_FILES.update({
         "buses":      f"{case_name}_buses.csv",
         "branches":   f"{case_name}_branches.csv",
@@ -1242,10 +1384,14 @@ def main():
     # ── Worst-offender time series ────────────────────────────────────────
     print("\nExtracting worst-offender time series...")
     ts = build_timeseries(t_full, df_full, metrics_gen, metrics_line, metrics_bus, metrics_load, metrics_lddl)
+    if top_k > 0:
+        ts["top"] = build_top_series(t_full, df_full,
+                                     {"gen": metrics_gen, "line": metrics_line,
+                                      "bus": metrics_bus, "load": metrics_load}, top_k)
 
     ts_path = os.path.join(OUTPUT_DIR, f"timeseries_worst_{run_tag}.json")
     with open(ts_path, "w") as fh:
-        json.dump(ts, fh)
+        json.dump(ts, fh, separators=(",", ":"))
     print(f"-> Time series written to {ts_path}")
 
     print(f"\nAll outputs written to: {OUTPUT_DIR}")
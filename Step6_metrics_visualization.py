@@ -9,16 +9,34 @@ Changes from previous version:
   - New LDDL section: P/OS-P, Q/OS-Q, and Bus Voltage time series
   - LDDL metrics added to KPI grid
   - Loads metrics_lddl.csv when present
+  - Tables and time series embedded as columnar base64 typed arrays
+    (see PAYLOAD ENCODING), decoded lazily in the page
+  - Top-K worst elements per metric (timeseries_worst "top") paged in the
+    Most Impacted Elements section
+  - Generator table virtualized (only visible rows rendered); long time
+    series drawn with WebGL (scattergl); slider moves are debounced and
+    redraw only the sections that use the changed threshold
+
+With dashboard_bundle = 1 in simulation_config.csv the shared stylesheet,
+dashboard code, logo and a local Plotly copy (plotly_js, or the plotly
+Python package) go to results/assets/ once, and each dashboard holds only
+its markup and data (see OFFLINE ASSET BUNDLE).
 
 Usage:
     python Step6_metrics_visualization.py
+    python Step6_metrics_visualization.py --serve    # + local server (LOCAL SERVER)
 """
 
-import os, json
+import os, re, sys, json, base64, hashlib
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+import mode_atlas
+
 # ── CHANGE THESE BEFORE RUNNING ──────────────────────────────────────────
 
 THRESHOLDS = dict(
@@ -37,6 +55,11 @@ THRESHOLDS = dict(
     vsw        = 0.05,
 )
 
+PLOTLY_CDN = "https://cdn.plot.ly/plotly-2.27.0.min.js"
+ASSETS_DIR = "assets"        # shared bundle folder, relative to the dashboards
+SERVER_PORT   = 8765         # --serve: local dashboard server port
+SERIES_MAXPTS = 2000         # default points per /series response
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # DATA LOADING
@@ -56,30 +79,99 @@ def load_data(INPUT_DIR, run_tag):
         path = os.path.join(INPUT_DIR, fname)
         if not os.path.exists(path):
             print(f"  [!] Missing: {fname} — {key} section will be empty")
-            data[key] = [] if key != "ts" else {}
+            data[key] = pd.DataFrame() if key != "ts" else {}
             continue
         if key == "ts":
             with open(path) as f:
                 data[key] = json.load(f)
         else:
             df = pd.read_csv(path)
-            df = df.replace([np.inf, -np.inf], np.nan)
-            data[key] = json.loads(df.to_json(orient="records"))
+            data[key] = df.replace([np.inf, -np.inf], np.nan)
         print(f"  Loaded {fname}: {len(data[key])} records")
     return data
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# PAYLOAD ENCODING
+# ═══════════════════════════════════════════════════════════════════════════
+# Tables are embedded column by column as base64 typed arrays instead of
+# JSON records:
+#   {n, cols: [{name, t, b}], dict: [str, ...]}
+#   t = 'f32'  Float32, NaN for missing
+#       'f64'  Float64 (integers too large for Int32)
+#       'i32'  Int32
+#       'bool' Int32 0 / 1, -1 for missing
+#       'str'  Int32 index into dict, -1 for missing
+# Time series become {group: {label, n, cols: {name: base64 Float32}}}; the
+# top-K pages (ts["top"]) become {cat: {n, t, rank, elements: [{label, cols}]}}
+# with one shared time axis per category.
+# The page decodes a column only when a row field of it is first read.
+
+def _b64(arr, dtype):
+    return base64.b64encode(np.ascontiguousarray(arr, dtype=dtype).tobytes()).decode("ascii")
+
+
+def encode_column(values, strings):
+    """One column as {t, b}; text values are added to the shared dict `strings`."""
+    values = pd.Series(values)
+    kind   = values.dtype.kind
+    if kind == "b":
+        return {"t": "bool", "b": _b64(values.astype(np.int32), "<i4")}
+    if kind in "iu":
+        if values.empty or (values.min() >= -2**31 and values.max() < 2**31):
+            return {"t": "i32", "b": _b64(values, "<i4")}
+        return {"t": "f64", "b": _b64(values, "<f8")}
+    if kind == "f":
+        return {"t": "f32", "b": _b64(values, "<f4")}
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for i, v in enumerate(values):
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            continue
+        codes[i] = strings.setdefault(str(v), len(strings))
+    return {"t": "str", "b": _b64(codes, "<i4")}
+
+
+def encode_table(df):
+    """Columnar base64 payload of a DataFrame (see PAYLOAD ENCODING)."""
+    strings = {}
+    cols = [dict(name=str(c), **encode_column(df[c], strings)) for c in df.columns]
+    return {"n": len(df), "cols": cols, "dict": list(strings)}
+
+
+def _encode_group(sig):
+    arrays = {k: v for k, v in sig.items() if isinstance(v, list)}
+    return {"label": sig.get("label", ""),
+            "n":     len(arrays.get("t", [])),
+            "cols":  {k: _b64(np.asarray(v, dtype=float), "<f4") for k, v in arrays.items()}}
+
+
+def encode_series(ts):
+    """Float32 payload of the worst-element time series, labels kept as text."""
+    out = {}
+    for group, sig in ts.items():
+        if group == "top":
+            out["top"] = {cat: {"n":        len(top["t"]),
+                                "t":        _b64(np.asarray(top["t"], dtype=float), "<f4"),
+                                "rank":     top["rank"],
+                                "elements": [_encode_group(e) for e in top["elements"]]}
+                          for cat, top in sig.items()}
+        else:
+            out[group] = _encode_group(sig)
+    return out
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # HTML GENERATION
 # ═══════════════════════════════════════════════════════════════════════════
 
 def build_html(data, subtitle, thresholds):
-    gen_json  = json.dumps(data["gen"],  indent=None)
-    line_json = json.dumps(data["line"], indent=None)
-    bus_json  = json.dumps(data["bus"],  indent=None)
-    load_json = json.dumps(data["load"], indent=None)
-    lddl_json = json.dumps(data["lddl"], indent=None)
-    ts_json   = json.dumps(data["ts"],   indent=None)
+    pack = lambda obj: json.dumps(obj, separators=(",", ":"))
+    gen_json  = pack(encode_table(data["gen"]))
+    line_json = pack(encode_table(data["line"]))
+    bus_json  = pack(encode_table(data["bus"]))
+    load_json = pack(encode_table(data["load"]))
+    lddl_json = pack(encode_table(data["lddl"]))
+    ts_json   = pack(encode_series(data["ts"]))
     thr_json  = json.dumps(thresholds,   indent=None)
 
     return f"""<!DOCTYPE html>
@@ -87,7 +179,7 @@ def build_html(data, subtitle, thresholds):
 <head>
 <meta charset="UTF-8">
 <title>Reliability Risk Assessment Dashboard</title>
-<script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
+<script src="{PLOTLY_CDN}"></script>
 <style>
 *{{box-sizing:border-box;margin:0;padding:0}}
 :root{{
@@ -219,6 +311,8 @@ th{{background:var(--th-bg);padding:5px 7px;text-align:left;color:var(--accent);
 th:hover{{color:var(--fg)}}
 td{{padding:4px 7px;border-bottom:1px solid var(--td-border);white-space:nowrap}}
 tr:hover td{{background:var(--tbody-hover)}}
+.vtbl td{{height:22px}}
+.pickable tbody tr{{cursor:pointer}}
 .hi{{color:var(--accent3);font-weight:bold}}.okc{{color:var(--accent4)}}
 
 /* parallel chips */
@@ -230,6 +324,10 @@ tr:hover td{{background:var(--tbody-hover)}}
 .par-note{{font-size:0.7rem;color:#7aacbf;font-weight:normal;
            text-transform:none;letter-spacing:0;margin-left:8px}}
 .sublbl{{font-size:0.7rem;color:#e8623a;font-weight:bold;margin-bottom:3px}}
+.ts-pager{{display:flex;flex-wrap:wrap;gap:16px;margin:4px 0 8px;font-size:0.72rem;color:var(--accent2)}}
+.ts-pager:empty{{display:none}}
+.ts-pager select{{background:var(--tbtn);border:1px solid var(--tbtn-border);color:var(--tbtn-fg);
+  border-radius:3px;font-size:0.7rem;margin:0 4px}}
 
 /* LDDL panel accent */
 .sec-hdr.lddl-hdr{{color:#d4a017;border-top-color:#3a4a1c}}
@@ -265,29 +363,29 @@ tr:hover td{{background:var(--tbody-hover)}}
     <div class="thr-subgroup">
       <div class="thr-subgroup-hdr">Active Power</div>
       <div class="ctrl"><label><span class="lbl">P swing amplitude</span><span class="val" id="v-genmw"></span></label>
-        <input type="range" id="s-genmw" min="0" max="50" step="0.5" oninput="update()"></div>
+        <input type="range" id="s-genmw" min="0" max="50" step="0.5" oninput="onSlider(this)"></div>
       <div class="ctrl"><label><span class="lbl">P swing % Mbase</span><span class="val" id="v-genpct"></span></label>
-        <input type="range" id="s-genpct" min="0" max="20" step="0.25" oninput="update()"></div>
+        <input type="range" id="s-genpct" min="0" max="20" step="0.25" oninput="onSlider(this)"></div>
     </div>
 
     <div class="thr-subgroup">
       <div class="thr-subgroup-hdr">Reactive Power</div>
       <div class="ctrl"><label><span class="lbl">Q swing amplitude</span><span class="val" id="v-genmvar"></span></label>
-        <input type="range" id="s-genmvar" min="0" max="50" step="0.5" oninput="update()"></div>
+        <input type="range" id="s-genmvar" min="0" max="50" step="0.5" oninput="onSlider(this)"></div>
       <div class="ctrl"><label><span class="lbl">Q swing % Mbase</span><span class="val" id="v-genqpct"></span></label>
-        <input type="range" id="s-genqpct" min="0" max="20" step="0.25" oninput="update()"></div>
+        <input type="range" id="s-genqpct" min="0" max="20" step="0.25" oninput="onSlider(this)"></div>
     </div>
 
     <div class="thr-subgroup">
       <div class="thr-subgroup-hdr">Dynamics</div>
       <div class="ctrl"><label><span class="lbl">Vt swing (pu)</span><span class="val" id="v-vtsw"></span></label>
-        <input type="range" id="s-vtsw" min="0" max="0.2" step="0.005" oninput="update()"></div>
+        <input type="range" id="s-vtsw" min="0" max="0.2" step="0.005" oninput="onSlider(this)"></div>
       <div class="ctrl"><label><span class="lbl">Freq band &plusmn;(Hz)</span><span class="val" id="v-freqband"></span></label>
-        <input type="range" id="s-freqband" min="0.005" max="0.1" step="0.001" oninput="update()"></div>
+        <input type="range" id="s-freqband" min="0.005" max="0.1" step="0.001" oninput="onSlider(this)"></div>
       <div class="ctrl"><label><span class="lbl">Freq swing (Hz)</span><span class="val" id="v-freqsw"></span></label>
-        <input type="range" id="s-freqsw" min="0.005" max="0.1" step="0.001" oninput="update()"></div>
+        <input type="range" id="s-freqsw" min="0.005" max="0.1" step="0.001" oninput="onSlider(this)"></div>
       <div class="ctrl"><label><span class="lbl">Angle swing (&deg;)</span><span class="val" id="v-anglesw"></span></label>
-        <input type="range" id="s-anglesw" min="0" max="30" step="0.5" oninput="update()"></div>
+        <input type="range" id="s-anglesw" min="0" max="30" step="0.5" oninput="onSlider(this)"></div>
     </div>
   </div>
 
@@ -295,20 +393,20 @@ tr:hover td{{background:var(--tbody-hover)}}
   <div class="thr-group">
     <div class="thr-group-hdr">Lines</div>
     <div class="ctrl"><label><span class="lbl">P swing amplitude (MW)</span><span class="val" id="v-linemw"></span></label>
-      <input type="range" id="s-linemw" min="0" max="200" step="1" oninput="update()"></div>
+      <input type="range" id="s-linemw" min="0" max="200" step="1" oninput="onSlider(this)"></div>
     <div class="ctrl"><label><span class="lbl">P swing % rating</span><span class="val" id="v-linepct"></span></label>
-      <input type="range" id="s-linepct" min="0" max="50" step="1" oninput="update()"></div>
+      <input type="range" id="s-linepct" min="0" max="50" step="1" oninput="onSlider(this)"></div>
   </div>
 
   <!-- HV Buses group -->
   <div class="thr-group">
     <div class="thr-group-hdr">HV Buses</div>
     <div class="ctrl"><label><span class="lbl">V upper limit (pu)</span><span class="val" id="v-vhi"></span></label>
-      <input type="range" id="s-vhi" min="1.0" max="1.15" step="0.005" oninput="update()"></div>
+      <input type="range" id="s-vhi" min="1.0" max="1.15" step="0.005" oninput="onSlider(this)"></div>
     <div class="ctrl"><label><span class="lbl">V lower limit (pu)</span><span class="val" id="v-vlo"></span></label>
-      <input type="range" id="s-vlo" min="0.85" max="1.0" step="0.005" oninput="update()"></div>
+      <input type="range" id="s-vlo" min="0.85" max="1.0" step="0.005" oninput="onSlider(this)"></div>
     <div class="ctrl"><label><span class="lbl">V swing amplitude (pu)</span><span class="val" id="v-vsw"></span></label>
-      <input type="range" id="s-vsw" min="0" max="0.2" step="0.005" oninput="update()"></div>
+      <input type="range" id="s-vsw" min="0" max="0.2" step="0.005" oninput="onSlider(this)"></div>
   </div>
 </aside>
 
@@ -405,6 +503,7 @@ tr:hover td{{background:var(--tbody-hover)}}
   <!-- Most Impacted Elements Time Series -->
   <div class="sec-hdr" id="sec-ts" onclick="toggleSec('sec-ts','body-ts')">&#9660; Most Impacted Elements <button class="collapse-btn">&#8211;</button></div>
   <div id="body-ts" class="sec-body">
+  <div class="ts-pager" id="ts-pager"></div>
   <div class="two-col">
     <div class="card">
       <div class="sublbl" id="ts-lbl-gen"></div>
@@ -430,6 +529,16 @@ tr:hover td{{background:var(--tbody-hover)}}
       <div class="sublbl" id="ts-lbl-bus"></div>
       <h3>HV Bus Voltage &amp; Angle</h3><div class="plt" id="ts-bus"></div>
     </div>
+    <div class="card">
+      <div class="sublbl" id="ts-lbl-load"></div>
+      <h3>Load P &amp; Bus Voltage</h3><div class="plt" id="ts-load"></div>
+    </div>
+  </div>
+  <div class="two-col">
+    <div class="card" id="pick-card" style="display:none">
+      <div class="sublbl" id="ts-lbl-pick">Click a generator row or a bar in a Top chart</div>
+      <h3>Selected Element</h3><div class="plt" id="ts-pick"></div>
+    </div>
   </div>
   </div><!-- /body-ts -->
 
@@ -467,14 +576,69 @@ tr:hover td{{background:var(--tbody-hover)}}
 </div>
 
 <script>
-// ── Embedded data ────────────────────────────────────────────────────────
-const GEN  = {gen_json};
-const LINE = {line_json};
-const BUS  = {bus_json};
-const LOAD = {load_json};
-const LDDL = {lddl_json};
-const TS   = {ts_json};
-const DEFS = {thr_json};
+// ── Embedded data (columnar base64 payloads, see PAYLOAD ENCODING) ───────
+const DATA = {{gen:{gen_json},line:{line_json},bus:{bus_json},load:{load_json},lddl:{lddl_json},ts:{ts_json},defs:{thr_json}}};
+</script>
+<script>
+// ── Dashboard code ───────────────────────────────────────────────────────
+// Payload decoding: columns are decoded the first time they are read
+function b64buf(s) {{
+  const bin = atob(s), u8 = new Uint8Array(bin.length);
+  for (let i = 0; i < bin.length; i++) u8[i] = bin.charCodeAt(i);
+  return u8.buffer;
+}}
+
+function decodeColumn(c, dict) {{
+  const buf = b64buf(c.b);
+  if (c.t === 'f32') return Array.from(new Float32Array(buf), x => isNaN(x) ? null : +x.toPrecision(7));
+  if (c.t === 'f64') return Array.from(new Float64Array(buf), x => isNaN(x) ? null : x);
+  const a = new Int32Array(buf);
+  if (c.t === 'str')  return Array.from(a, i => i < 0 ? null : dict[i]);
+  if (c.t === 'bool') return Array.from(a, i => i < 0 ? null : i === 1);
+  return Array.from(a);
+}}
+
+// Rows share one prototype whose getters decode a column the first time any
+// row reads it; a row itself only stores its index.
+const ROW = Symbol('row');
+function decodeTable(p) {{
+  if (!p || !p.n) return [];
+  const proto = {{}}, cache = {{}};
+  p.cols.forEach(c => Object.defineProperty(proto, c.name, {{
+    enumerable: true,
+    get() {{ return (cache[c.name] || (cache[c.name] = decodeColumn(c, p.dict)))[this[ROW]]; }},
+  }}));
+  return Array.from({{length: p.n}}, (_, i) => {{ const r = Object.create(proto); r[ROW] = i; return r; }});
+}}
+
+function decodeGroup(s, t) {{
+  const grp = {{label: s.label}}, cache = {{}};
+  const cols = t ? Object.assign({{t}}, s.cols) : s.cols;     // top-K elements share t
+  for (const [k, b] of Object.entries(cols)) Object.defineProperty(grp, k, {{
+    enumerable: true,
+    get() {{ return cache[k] || (cache[k] = Array.from(new Float32Array(b64buf(b)), x => +x.toPrecision(7))); }},
+  }});
+  return grp;
+}}
+
+function decodeSeries(p) {{
+  const out = {{}};
+  for (const [g, s] of Object.entries(p || {{}})) {{
+    if (g !== 'top') {{ out[g] = decodeGroup(s); continue; }}
+    out.top = {{}};
+    for (const [cat, top] of Object.entries(s))
+      out.top[cat] = {{rank: top.rank, elements: top.elements.map(e => decodeGroup(e, top.t))}};
+  }}
+  return out;
+}}
+
+const GEN  = decodeTable(DATA.gen);
+const LINE = decodeTable(DATA.line);
+const BUS  = decodeTable(DATA.bus);
+const LOAD = decodeTable(DATA.load);
+const LDDL = decodeTable(DATA.lddl);
+const TS   = decodeSeries(DATA.ts);
+const DEFS = DATA.defs;
 
 // ── State ────────────────────────────────────────────────────────────────
 let GEN_VIEW = 'unit';
@@ -484,6 +648,11 @@ let lineSortCol = 'pbr_swing', lineSortAsc = false;
 // ── Plotly config / layout factory ───────────────────────────────────────
 const CFG = {{responsive:true, displayModeBar:false}};
 
+// WebGL traces for line/marker series longer than this; short ones stay SVG
+// (browsers allow only a handful of WebGL contexts per page)
+const GL_POINTS = 1000;
+const sc = n => n > GL_POINTS ? 'scattergl' : 'scatter';
+
 function lay(xt, yt, y2t) {{
   const light = document.body.classList.contains('light');
   const gridC  = light ? '#d0dde8' : '#122540';
@@ -540,7 +709,18 @@ function refreshLabels() {{
 const nv  = (r, k) => {{ const x = parseFloat(r[k]); return isNaN(x) ? 0 : x; }};
 const pct = (r, num, base) => nv(r,base) > 0 ? nv(r,num)/nv(r,base)*100 : 0;
 const cnt = (arr, fn) => arr.filter(fn).length;
-const maxOf = (arr, k) => arr.length ? Math.max(...arr.map(r=>nv(r,k))) : 0;
+const maxOf = (arr, k) => arr.reduce((m, r) => Math.max(m, nv(r,k)), arr.length ? -Infinity : 0);
+
+// Sorted copies per (table, column, direction); thresholds never change the
+// order, so slider moves reuse them instead of re-sorting every element
+const _orders = new Map();
+function sortedBy(arr, k, asc=false) {{
+  let m = _orders.get(arr);
+  if (!m) _orders.set(arr, m = {{}});
+  const key = (asc ? '+' : '-') + k;
+  if (!m[key]) m[key] = [...arr].sort(asc ? (a,b)=>nv(a,k)-nv(b,k) : (a,b)=>nv(b,k)-nv(a,k));
+  return m[key];
+}}
 
 function fmt(x, d=2) {{
   if (x===null||x===undefined) return '–';
@@ -567,11 +747,11 @@ function drawKPIs() {{
   const maxLineQ = maxOf(LINE, 'qbr_swing');
 
   // Top generator names
-  const topGenP  = GEN.length  ? ([...GEN ].sort((a,b)=>nv(b,'pg_swing') -nv(a,'pg_swing') )[0].NAME||'—') : '—';
-  const topGenQ  = GEN.length  ? ([...GEN ].sort((a,b)=>nv(b,'qg_swing') -nv(a,'qg_swing') )[0].NAME||'—') : '—';
-  const topLineP = LINE.length ? ([...LINE].sort((a,b)=>nv(b,'pbr_swing')-nv(a,'pbr_swing'))[0]||{{}}) : {{}};
+  const topGenP  = GEN.length  ? (sortedBy(GEN, 'pg_swing')[0].NAME||'—') : '—';
+  const topGenQ  = GEN.length  ? (sortedBy(GEN, 'qg_swing')[0].NAME||'—') : '—';
+  const topLineP = LINE.length ? (sortedBy(LINE,'pbr_swing')[0]||{{}}) : {{}};
   const topLinePLbl = topLineP.from_bus ? `${{topLineP.from_bus}}→${{topLineP.to_bus}}` : '—';
-  const topLineQ = LINE.length ? ([...LINE].sort((a,b)=>nv(b,'qbr_swing')-nv(a,'qbr_swing'))[0]||{{}}) : {{}};
+  const topLineQ = LINE.length ? (sortedBy(LINE,'qbr_swing')[0]||{{}}) : {{}};
   const topLineQLbl = topLineQ.from_bus ? `${{topLineQ.from_bus}}→${{topLineQ.to_bus}}` : '—';
 
   // Nested group renderer
@@ -677,8 +857,8 @@ function drawGenHists() {{
 
   // ── Top 30 by swing amplitude ─────────────────────────────────────────
   const tGM2 = T('genmw'), tGV2 = T('genmvar');
-  const topP = [...GEN].sort((a,b)=>nv(b,'pg_swing')-nv(a,'pg_swing')).slice(0,30);
-  const topQ = [...GEN].sort((a,b)=>nv(b,'qg_swing')-nv(a,'qg_swing')).slice(0,30);
+  const topP = sortedBy(GEN,'pg_swing').slice(0,30);
+  const topQ = sortedBy(GEN,'qg_swing').slice(0,30);
 
   const barTop = (id, rows, field, thresh, color, colorOver) => {{
     const labels = rows.map(r => r.NAME || String(r.bus_num));
@@ -688,18 +868,47 @@ function drawGenHists() {{
     l.xaxis.tickangle = -45; l.xaxis.tickfont = {{size:9}};
     l.shapes = [{{type:'line',xref:'paper',x0:0,x1:1,yref:'y',y0:thresh,y1:thresh,
       line:{{color:colorOver,width:1.5,dash:'dash'}}}}];
-    Plotly.react(id, [{{x:labels, y:vals, type:'bar', marker:{{color:cols}}}}], l, CFG);
+    Plotly.react(id, [{{x:labels, y:vals, type:'bar', marker:{{color:cols}},
+      customdata:rows.map(r => r.bus_num)}}], l, CFG);
   }};
   barTop('gen-top-p', topP, 'pg_swing', tGM2, '#2080c0', '#e8623a');
   barTop('gen-top-q', topQ, 'qg_swing', tGV2, '#9060d0', '#e8623a');
 }}
 
+// ── Virtualized table ─────────────────────────────────────────────────────
+// Only the rows inside the scroll viewport (plus a margin) are in the DOM;
+// spacer rows keep the scrollbar sized for the full table.
+const VROW_H   = 22;    // px, fixed row height (.vtbl td)
+const VROW_PAD = 15;    // rows rendered beyond each edge of the viewport
+
+function vtable(wrap, hdr, rows, rowHtml, ncol) {{
+  if (!wrap._vt) {{
+    wrap.innerHTML = '<table class="vtbl"><thead></thead><tbody></tbody></table>';
+    wrap.addEventListener('scroll', () => {{
+      if (wrap._vtFrame) return;
+      wrap._vtFrame = requestAnimationFrame(() => {{ wrap._vtFrame = 0; vtableRows(wrap); }});
+    }});
+  }}
+  wrap._vt = {{rows, rowHtml, ncol}};
+  wrap.querySelector('thead').innerHTML = hdr;
+  vtableRows(wrap);
+}}
+
+function vtableRows(wrap) {{
+  const {{rows, rowHtml, ncol}} = wrap._vt;
+  const top   = wrap.scrollTop, view = wrap.clientHeight || 270;
+  const first = Math.max(0, Math.floor(top / VROW_H) - VROW_PAD);
+  const last  = Math.min(rows.length, Math.ceil((top + view) / VROW_H) + VROW_PAD);
+  const pad   = h => h > 0 ? `<tr style="height:${{h}}px"><td colspan="${{ncol}}" style="padding:0;border:0;height:${{h}}px"></td></tr>` : '';
+  wrap.querySelector('tbody').innerHTML =
+    pad(first * VROW_H) + rows.slice(first, last).map(rowHtml).join('') + pad((rows.length - last) * VROW_H);
+}}
+
 // ── Generator table ───────────────────────────────────────────────────────
 function drawGenTable() {{
   const wrap = document.getElementById('gen-tbl'); if (!GEN.length) return;
 
-  const sorted = [...GEN].sort((a,b) =>
-    genSortAsc ? nv(a,genSortCol)-nv(b,genSortCol) : nv(b,genSortCol)-nv(a,genSortCol));
+  const sorted = sortedBy(GEN, genSortCol, genSortAsc);
 
   const th = (k, label) => {{
     const arrow = genSortCol===k ? (genSortAsc?' \u25b2':' \u25bc') : '';
@@ -724,14 +933,15 @@ function drawGenTable() {{
 
   const icBadge = '<span style="font-size:0.6rem;background:#5a1a0a;color:#e8823a;border-radius:2px;padding:1px 4px;margin-left:4px" title="Initial condition violation">IC</span>';
 
-  const bodyRows = sorted.map(r => {{
+  const rowHtml = r => {{
     const pViol    = nv(r,'pg_max')>nv(r,'PMAX_MW') || nv(r,'pg_min')<nv(r,'PMIN_MW');
     const qmaxV    = nv(r,'qg_max')>nv(r,'QMAX_MVAR');
     const qminV    = nv(r,'qg_min')<nv(r,'QMIN_MVAR');
     const pInitViol = nv(r,'pg_init')>nv(r,'PMAX_MW') || nv(r,'pg_init')<nv(r,'PMIN_MW');
     const qInitMaxV = nv(r,'qg_init')>nv(r,'QMAX_MVAR');
     const qInitMinV = nv(r,'qg_init')<nv(r,'QMIN_MVAR');
-    return `<tr>
+    const pick = r.bus_num == null ? '' : ` onclick="pickElement('gen',${{r.bus_num}})"`;
+    return `<tr${{pick}}>
       <td>${{r.NAME||'\u2013'}}</td>
       <td>${{r.bus_num}}</td>
       <td>${{r.AREA||'\u2013'}}</td><td>${{r.ZONE||'\u2013'}}</td>
@@ -744,9 +954,9 @@ function drawGenTable() {{
       <td class="${{nv(r,'freq_swing')>tFS?'hi':''}}">${{fmt(r.freq_swing,4)}}</td>
       <td class="${{nv(r,'angle_swing')>tAS?'hi':''}}">${{fmt(r.angle_swing,2)}}</td>
     </tr>`;
-  }}).join('');
+  }};
 
-  wrap.innerHTML = `<table><thead>${{hdr}}</thead><tbody>${{bodyRows}}</tbody></table>`;
+  vtable(wrap, hdr, sorted, rowHtml, 12);
 }}
 
 function setGenView(v) {{ drawGenTable(); }}
@@ -766,13 +976,14 @@ function drawLineCharts() {{
     {{x:[tLM,tLM], y:[0,LINE.length/4||10], type:'scatter', mode:'lines', line:{{color:'#e8623a',dash:'dash',width:1.5}}}},
   ], lay('P swing (MW)','Count'), CFG);
 
-  const top = [...LINE].sort((a,b)=>nv(b,'pbr_swing')-nv(a,'pbr_swing')).slice(0,30);
+  const top = sortedBy(LINE,'pbr_swing').slice(0,30);
   const labels = top.map(r => `${{r.from_bus||'?'}}→${{r.to_bus||'?'}}`);
   const vals   = top.map(r => nv(r,'pbr_swing'));
   const colors = vals.map(v => v>tLM ? '#e8623a' : '#20a090');
   const tl = lay('','P swing (MW)');
   tl.xaxis.tickangle = -45; tl.xaxis.tickfont = {{size:9}};
-  Plotly.react('line-top', [{{x:labels,y:vals,type:'bar',marker:{{color:colors}}}}], tl, CFG);
+  Plotly.react('line-top', [{{x:labels,y:vals,type:'bar',marker:{{color:colors}},
+    customdata:top.map(r => `${{r.from_bus}}_${{r.to_bus}}_${{r.ckt}}`)}}], tl, CFG);
 }}
 
 // ── Parallel circuits — split into flows panel and swings panel ───────────
@@ -946,13 +1157,13 @@ function drawBusCharts() {{
   if (!BUS.length) return;
   const tVS=T('vsw'), tVH=T('vhi'), tVL=T('vlo');
 
-  const sorted = [...BUS].sort((a,b)=>nv(b,'v_swing')-nv(a,'v_swing')).slice(0,50);
+  const sorted = sortedBy(BUS,'v_swing').slice(0,50);
   const labels = sorted.map(r => String(r.NAME||r.bus_num));
   const swings = sorted.map(r => nv(r,'v_swing'));
   const cols   = swings.map(v => v>tVS ? '#e8623a' : '#40b878');
   const tl = lay('','V swing (pu)'); tl.xaxis.tickangle=-45; tl.xaxis.tickfont={{size:9}};
   Plotly.react('bus-swing', [
-    {{x:labels,y:swings,type:'bar',marker:{{color:cols}}}},
+    {{x:labels,y:swings,type:'bar',marker:{{color:cols}},customdata:sorted.map(r => r.bus_num)}},
     {{x:labels,y:labels.map(()=>tVS),type:'scatter',mode:'lines',line:{{color:'#e8623a',dash:'dash',width:1.5}}}},
   ], tl, CFG);
 
@@ -973,6 +1184,41 @@ function drawBusCharts() {{
   ], te, CFG);
 }}
 
+// ── Top-K paging of the time series ──────────────────────────────────────
+const TS_PAGE  = {{gen:{{metric:null, i:0}}, line:{{metric:null, i:0}}, bus:{{metric:null, i:0}},
+                  load:{{metric:null, i:0}}}};
+const TS_NAMES = {{gen:'Generator', line:'Line', bus:'HV bus', load:'Load bus'}};
+
+// Element shown for a category: the selected top-K page, else the single worst
+function tsGroup(cat) {{
+  const top = TS.top && TS.top[cat], p = TS_PAGE[cat];
+  if (!top || !p.metric || !top.rank[p.metric]) return TS[cat];
+  return top.elements[top.rank[p.metric][p.i]];
+}}
+
+function drawPagers() {{
+  const top = TS.top || {{}};
+  document.getElementById('ts-pager').innerHTML = Object.keys(TS_PAGE).filter(c => top[c]).map(c => {{
+    const p = TS_PAGE[c], metrics = Object.keys(top[c].rank);
+    if (!p.metric) p.metric = metrics[0];
+    const n = top[c].rank[p.metric].length;
+    const opts = metrics.map(m => `<option${{m===p.metric?' selected':''}}>${{m}}</option>`).join('');
+    return `<span>${{TS_NAMES[c]}} by<select onchange="pageTS('${{c}}',this.value,0)">${{opts}}</select>
+      <button class="tbtn" onclick="pageTS('${{c}}',null,-1)">&#9664;</button>
+      #${{p.i+1}} of ${{n}}
+      <button class="tbtn" onclick="pageTS('${{c}}',null,1)">&#9654;</button></span>`;
+  }}).join('');
+}}
+
+function pageTS(cat, metric, step) {{
+  const p = TS_PAGE[cat];
+  if (metric) {{ p.metric = metric; p.i = 0; }}
+  const n = TS.top[cat].rank[p.metric].length;
+  p.i = (p.i + step + n) % n;
+  drawPagers();
+  drawTimeSeries();
+}}
+
 // ── Time series ───────────────────────────────────────────────────────────
 function drawTimeSeries() {{
   if (!TS || !Object.keys(TS).length) return;
@@ -980,50 +1226,61 @@ function drawTimeSeries() {{
   const linePlot = (id, t, traces, layout) => Plotly.react(id, traces, layout, CFG);
 
   // Generator
-  const g = TS.gen;
+  const g = tsGroup('gen');
   if (g) {{
     ['ts-lbl-gen','ts-lbl-gen2','ts-lbl-gen3'].forEach(id => {{
       const el=document.getElementById(id); if(el) el.textContent=g.label||'';
     }});
     const lpq = lay('Time (s)','P (MW)','Q (MVar)'); lpq.showlegend=true;
     linePlot('ts-gen-pq', null, [
-      {{x:g.t,y:g.pg,name:'P (MW)',mode:'lines',line:{{color:'#2080c0',width:1.5}},yaxis:'y'}},
-      {{x:g.t,y:g.qg,name:'Q (MVar)',mode:'lines',line:{{color:'#9060d0',width:1.5}},yaxis:'y2'}},
+      {{type:sc(g.t.length),x:g.t,y:g.pg,name:'P (MW)',mode:'lines',line:{{color:'#2080c0',width:1.5}},yaxis:'y'}},
+      {{type:sc(g.t.length),x:g.t,y:g.qg,name:'Q (MVar)',mode:'lines',line:{{color:'#9060d0',width:1.5}},yaxis:'y2'}},
     ], lpq);
     const lvf = lay('Time (s)','Vt (pu)','Freq (Hz)'); lvf.showlegend=true;
     linePlot('ts-gen-vf', null, [
-      {{x:g.t,y:g.vt,name:'Vt (pu)',mode:'lines',line:{{color:'#40c898',width:1.5}},yaxis:'y'}},
-      {{x:g.t,y:g.freq,name:'Freq (Hz)',mode:'lines',line:{{color:'#e89030',width:1.5}},yaxis:'y2'}},
+      {{type:sc(g.t.length),x:g.t,y:g.vt,name:'Vt (pu)',mode:'lines',line:{{color:'#40c898',width:1.5}},yaxis:'y'}},
+      {{type:sc(g.t.length),x:g.t,y:g.freq,name:'Freq (Hz)',mode:'lines',line:{{color:'#e89030',width:1.5}},yaxis:'y2'}},
     ], lvf);
     linePlot('ts-gen-ang', null, [
-      {{x:g.t,y:g.abus,name:'Angle (°)',mode:'lines',line:{{color:'#e06858',width:1.5}}}},
+      {{type:sc(g.t.length),x:g.t,y:g.abus,name:'Angle (°)',mode:'lines',line:{{color:'#e06858',width:1.5}}}},
     ], lay('Time (s)','Angle (°)'));
   }}
 
   // Line — P and Q on dual axis
-  const l = TS.line;
+  const l = tsGroup('line');
   if (l) {{
     const el=document.getElementById('ts-lbl-line'); if(el) el.textContent=l.label||'';
     const lln = lay('Time (s)','P flow (MW)', l.qbr ? 'Q flow (MVar)' : undefined);
     const traces = [
-      {{x:l.t,y:l.pbr,name:'P flow (MW)',mode:'lines',line:{{color:'#20a090',width:1.5}},yaxis:'y'}},
+      {{type:sc(l.t.length),x:l.t,y:l.pbr,name:'P flow (MW)',mode:'lines',line:{{color:'#20a090',width:1.5}},yaxis:'y'}},
     ];
     if (l.qbr) traces.push(
-      {{x:l.t,y:l.qbr,name:'Q flow (MVar)',mode:'lines',line:{{color:'#a070e0',width:1.5}},yaxis:'y2'}}
+      {{type:sc(l.t.length),x:l.t,y:l.qbr,name:'Q flow (MVar)',mode:'lines',line:{{color:'#a070e0',width:1.5}},yaxis:'y2'}}
     );
     linePlot('ts-line', null, traces, lln);
   }}
 
   // Bus
-  const b = TS.bus;
+  const b = tsGroup('bus');
   if (b) {{
     const el=document.getElementById('ts-lbl-bus'); if(el) el.textContent=b.label||'';
     const lbv = lay('Time (s)','V (pu)','Angle (°)'); lbv.showlegend=true;
     linePlot('ts-bus', null, [
-      {{x:b.t,y:b.vbus,name:'V (pu)',mode:'lines',line:{{color:'#40b878',width:1.5}},yaxis:'y'}},
-      {{x:b.t,y:b.abus,name:'Angle (°)',mode:'lines',line:{{color:'#a070e0',width:1.5}},yaxis:'y2'}},
+      {{type:sc(b.t.length),x:b.t,y:b.vbus,name:'V (pu)',mode:'lines',line:{{color:'#40b878',width:1.5}},yaxis:'y'}},
+      {{type:sc(b.t.length),x:b.t,y:b.abus,name:'Angle (°)',mode:'lines',line:{{color:'#a070e0',width:1.5}},yaxis:'y2'}},
     ], lbv);
   }}
+
+  // Load
+  const ld = tsGroup('load');
+  if (ld) {{
+    const el=document.getElementById('ts-lbl-load'); if(el) el.textContent=ld.label||'';
+    const llv = lay('Time (s)','P (MW)','V (pu)'); llv.showlegend=true;
+    linePlot('ts-load', null, [
+      {{type:sc(ld.t.length),x:ld.t,y:ld.pld,name:'P (MW)',mode:'lines',line:{{color:'#d4a017',width:1.5}},yaxis:'y'}},
+      {{type:sc(ld.t.length),x:ld.t,y:ld.vbul,name:'V (pu)',mode:'lines',line:{{color:'#40b878',width:1.5}},yaxis:'y2'}},
+    ], llv);
+  }}
 }}
 
 // ── LDDL time series ──────────────────────────────────────────────────────
@@ -1038,8 +1295,8 @@ function drawLDDL() {{
   const hasOSP = Array.isArray(lddl.OS_P);
   if (hasP || hasOSP) {{
     const tracesP = [];
-    if (hasP)   tracesP.push({{x:t,y:lddl.P,   name:'LDDL P (MW)',   mode:'lines',line:{{color:'#d4a017',width:1.8}}}});
-    if (hasOSP) tracesP.push({{x:t,y:lddl.OS_P,name:'LDDL OS P (MW)',mode:'lines',line:{{color:'#e86030',width:1.5,dash:'dash'}}}});
+    if (hasP)   tracesP.push({{type:sc(t.length),x:t,y:lddl.P,   name:'LDDL P (MW)',   mode:'lines',line:{{color:'#d4a017',width:1.8}}}});
+    if (hasOSP) tracesP.push({{type:sc(t.length),x:t,y:lddl.OS_P,name:'LDDL OS P (MW)',mode:'lines',line:{{color:'#e86030',width:1.5,dash:'dash'}}}});
     const lp = lay('Time (s)','MW'); lp.showlegend=true;
     Plotly.react('lddl-p', tracesP, lp, CFG);
   }}
@@ -1049,8 +1306,8 @@ function drawLDDL() {{
   const hasOSQ = Array.isArray(lddl.OS_Q);
   if (hasQ || hasOSQ) {{
     const tracesQ = [];
-    if (hasQ)   tracesQ.push({{x:t,y:lddl.Q,   name:'LDDL Q (MVar)',   mode:'lines',line:{{color:'#6090d0',width:1.8}}}});
-    if (hasOSQ) tracesQ.push({{x:t,y:lddl.OS_Q,name:'LDDL OS Q (MVar)',mode:'lines',line:{{color:'#a050c0',width:1.5,dash:'dash'}}}});
+    if (hasQ)   tracesQ.push({{type:sc(t.length),x:t,y:lddl.Q,   name:'LDDL Q (MVar)',   mode:'lines',line:{{color:'#6090d0',width:1.8}}}});
+    if (hasOSQ) tracesQ.push({{type:sc(t.length),x:t,y:lddl.OS_Q,name:'LDDL OS Q (MVar)',mode:'lines',line:{{color:'#a050c0',width:1.5,dash:'dash'}}}});
     const lq = lay('Time (s)','MVar'); lq.showlegend=true;
     Plotly.react('lddl-q', tracesQ, lq, CFG);
   }}
@@ -1059,13 +1316,85 @@ function drawLDDL() {{
   const hasV = Array.isArray(lddl.BUS_VOLTAGE);
   if (hasV) {{
     Plotly.react('lddl-v', [
-      {{x:t,y:lddl.BUS_VOLTAGE,name:'LDDL Bus V (pu)',mode:'lines',
+      {{type:sc(t.length),x:t,y:lddl.BUS_VOLTAGE,name:'LDDL Bus V (pu)',mode:'lines',
         line:{{color:'#40c898',width:1.8}}}},
     ], lay('Time (s)','Voltage (pu)'), CFG);
   }}
 }}
 
-// ── Main update (called by all sliders) ───────────────────────────────────
+// ── On-demand series (page opened through the --serve local server) ──────
+let SERVED = false;
+let PICK   = null;            // {{label, traces:[{{name, chan, axis}}]}} of the selected element
+const PICK_MAXPTS = 2000;
+const PICK_SOURCES = {{'gen-top-p':'gen', 'gen-top-q':'gen', 'line-top':'line', 'bus-swing':'bus'}};
+const f32 = b => Array.from(new Float32Array(b64buf(b)));
+
+async function getJSON(url) {{
+  const r = await fetch(url);
+  if (!r.ok) throw new Error(`${{url}}: ${{r.status}}`);
+  return r.json();
+}}
+
+function pickError(e) {{
+  document.getElementById('ts-lbl-pick').textContent = `Could not load element: ${{e.message}}`;
+}}
+
+async function pickElement(kind, key) {{
+  if (!SERVED || key == null) return;
+  document.getElementById('pick-card').scrollIntoView({{behavior:'smooth', block:'nearest'}});
+  try {{
+    PICK = await getJSON(`element?kind=${{kind}}&key=${{encodeURIComponent(key)}}`);
+    document.getElementById('ts-lbl-pick').textContent =
+      PICK.label + (PICK.traces.length ? '' : ' \u2014 not monitored');
+    await drawPick();
+  }} catch (e) {{
+    pickError(e);
+  }}
+}}
+
+async function drawPick(t0, t1) {{
+  if (!PICK || !PICK.traces.length) return;
+  const range = t0 === undefined ? '' : `&t0=${{t0}}&t1=${{t1}}`;
+  const data  = await Promise.all(PICK.traces.map(tr =>
+    getJSON(`series?chan=${{encodeURIComponent(tr.chan)}}&maxpts=${{PICK_MAXPTS}}${{range}}`)));
+  const colors = ['#2080c0', '#9060d0'];
+  const traces = PICK.traces.map((tr, i) => {{
+    const t = f32(data[i].t);
+    return {{type:sc(t.length), x:t, y:f32(data[i].y), name:tr.name, mode:'lines',
+            line:{{color:colors[i % 2], width:1.5}}, yaxis:tr.axis}};
+  }});
+  const l = lay('Time (s)', PICK.traces[0].name, PICK.traces[1] && PICK.traces[1].name);
+  l.showlegend = true;
+  if (t0 !== undefined) l.xaxis.range = [t0, t1];
+  const el = document.getElementById('ts-pick');
+  await Plotly.react(el, traces, l, CFG);
+  if (!el._pickBound) {{              // zoom / reset re-queries the visible range
+    el._pickBound = true;
+    el.on('plotly_relayout', ev => {{
+      if (ev['xaxis.range[0]'] !== undefined) drawPick(ev['xaxis.range[0]'], ev['xaxis.range[1]']).catch(pickError);
+      else if (ev['xaxis.autorange']) drawPick().catch(pickError);
+    }});
+  }}
+}}
+
+function initPick() {{
+  if (!location.protocol.startsWith('http')) return;
+  fetch('element?kind=gen&key=0').then(r => {{
+    if (!r.ok) return;
+    SERVED = true;
+    document.getElementById('pick-card').style.display = '';
+    document.getElementById('gen-tbl').classList.add('pickable');
+    for (const [id, kind] of Object.entries(PICK_SOURCES)) {{
+      const el = document.getElementById(id);
+      if (el && el.on) el.on('plotly_click', ev => {{
+        const pt = ev.points && ev.points[0];
+        if (pt && pt.customdata != null) pickElement(kind, pt.customdata);
+      }});
+    }}
+  }}).catch(() => {{}});
+}}
+
+// ── Main update (boot and theme change: everything) ───────────────────────
 function update() {{
   refreshLabels();
   drawKPIs();
@@ -1076,6 +1405,38 @@ function update() {{
   drawBusCharts();
 }}
 
+// ── Slider updates: debounced, only the sections using that threshold ─────
+const AFFECTS = {{
+  genmw:    [drawKPIs, drawGenHists, drawGenTable],
+  genpct:   [drawKPIs],
+  genmvar:  [drawKPIs, drawGenHists, drawGenTable],
+  genqpct:  [drawKPIs],
+  vtsw:     [drawKPIs, drawGenTable],
+  freqband: [drawKPIs],
+  freqsw:   [drawKPIs, drawGenHists, drawGenTable],
+  anglesw:  [drawKPIs, drawGenHists, drawGenTable],
+  linemw:   [drawKPIs, drawLineCharts, drawParallel],
+  linepct:  [drawKPIs],
+  vhi:      [drawKPIs, drawBusCharts],
+  vlo:      [drawKPIs, drawBusCharts],
+  vsw:      [drawKPIs, drawBusCharts],
+}};
+const UPDATE_DELAY_MS = 120;
+const _changed = new Set();
+let _updateTimer = 0;
+
+function onSlider(el) {{
+  refreshLabels();
+  _changed.add(el.id.replace(/^s-/, ''));
+  clearTimeout(_updateTimer);
+  _updateTimer = setTimeout(() => {{
+    const fns = new Set();
+    _changed.forEach(k => (AFFECTS[k] || [update]).forEach(f => fns.add(f)));
+    _changed.clear();
+    fns.forEach(f => f());
+  }}, UPDATE_DELAY_MS);
+}}
+
 // ── Collapsible sections ──────────────────────────────────────────────────
 function toggleSec(hdrId, bodyId) {{
   const body = document.getElementById(bodyId);
@@ -1110,7 +1471,7 @@ document.querySelectorAll('.sec-hdr').forEach(hdr => {{
 function toggleMode() {{
   const isLight = document.body.classList.toggle('light');
   document.getElementById('mode-btn').textContent = isLight ? '🌙 Dark Mode' : '☀ Light Mode';
-  update(); drawTimeSeries(); drawLDDL();
+  update(); drawTimeSeries(); drawLDDL(); drawPick();
 }}
 
 // ── Resizable plots (drag bottom edge to resize height) ───────────────────
@@ -1161,13 +1522,203 @@ document.querySelectorAll('.plt,.plt-sm,.plt-xs').forEach(el => _ro.observe(el))
 // ── Boot ─────────────────────────────────────────────────────────────────
 initSliders();
 update();
+drawPagers();
 drawTimeSeries();
 drawLDDL();
+initPick();
 </script>
 </body>
 </html>"""
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# OFFLINE ASSET BUNDLE
+# ═══════════════════════════════════════════════════════════════════════════
+# build_html() returns one self-contained page. bundle_html() moves the
+# parts that are identical for every run (stylesheet, dashboard code, logo,
+# Plotly) into results/assets/ under content-hashed names, so each dashboard
+# keeps only its markup and data payload, the browser caches the shared
+# files, and nothing is fetched from the internet.
+
+def _minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+
+def _minify_js(js):
+    """Drop comment-only lines, indentation and blank lines (conservative:
+    nothing inside a line is touched, so strings and regexes are safe)."""
+    lines = (l.strip() for l in js.splitlines())
+    return "\n".join(l for l in lines if l and not l.startswith("//"))
+
+
+def _write_asset(assets_dir, stem, suffix, content):
+    """Write content (bytes) as <stem>-<hash><suffix> unless it already exists."""
+    digest = hashlib.sha1(content).hexdigest()[:10]
+    path   = Path(assets_dir) / f"{stem}-{digest}{suffix}"
+    if not path.exists():
+        path.write_bytes(content)
+        print(f"  Asset written: {path.name} ({len(content) / 1024:.0f} KB)")
+    return f"{ASSETS_DIR}/{path.name}"
+
+
+def find_plotly_js(plotly_js=None):
+    """
+    Local Plotly bundle: the given path, else the copy shipped with the
+    plotly Python package (if installed), else None. A partial build with
+    only the scatter, scattergl, bar and histogram traces is the smallest
+    file that covers this dashboard.
+    """
+    if plotly_js:
+        path = Path(plotly_js)
+        if path.exists():
+            return path
+        print(f"  [!] plotly_js not found: {plotly_js}")
+    try:
+        import plotly
+    except ImportError:
+        return None
+    path = Path(plotly.__file__).parent / "package_data" / "plotly.min.js"
+    return path if path.exists() else None
+
+
+def bundle_html(html, output_dir, plotly_js=None):
+    """
+    Move the shared parts of a build_html() page into <output_dir>/assets/
+    and return the page referencing them.
+    """
+    assets_dir = Path(output_dir) / ASSETS_DIR
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    css = re.search(r"<style>\n(.*?)</style>\n", html, re.S)
+    ref = _write_asset(assets_dir, "dashboard", ".css", _minify_css(css.group(1)).encode())
+    html = html.replace(css.group(0), f'<link rel="stylesheet" href="{ref}">\n')
+
+    code = re.search(r"<script>\n(// ── Dashboard code.*?)</script>\n", html, re.S)
+    ref = _write_asset(assets_dir, "dashboard", ".js", _minify_js(code.group(1)).encode())
+    html = html.replace(code.group(0), f'<script src="{ref}"></script>\n')
+
+    logo = re.search(r'src="data:image/jpeg;base64,([^"]+)"', html)
+    if logo:
+        ref = _write_asset(assets_dir, "logo", ".jpg", base64.b64decode(logo.group(1)))
+        html = html.replace(logo.group(0), f'src="{ref}"')
+
+    plotly_path = find_plotly_js(plotly_js)
+    if plotly_path is None:
+        print(f"  [!] No local Plotly bundle found — dashboard still loads {PLOTLY_CDN}")
+    else:
+        ref = _write_asset(assets_dir, "plotly", ".min.js", plotly_path.read_bytes())
+        html = html.replace(f'<script src="{PLOTLY_CDN}"></script>', f'<script src="{ref}"></script>')
+    return html
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LOCAL SERVER  (python Step6_metrics_visualization.py --serve)
+# ═══════════════════════════════════════════════════════════════════════════
+# Serves results/ over http://localhost and answers
+#   /element?kind=gen|bus|load|line&key=<bus> or <from>_<to>_<ckt>
+#       -> {label, traces: [{name, chan, axis}]}
+#   /series?chan=<column>&t0=&t1=&maxpts=
+#       -> {n, t, y}  (base64 Float32, min/max decimated)
+# from the binary simulation cache (sim_cache.py). When the dashboard is
+# opened through the server, clicking a generator table row or a bar in a
+# top-N chart plots that element's waveform; zooming re-queries the range.
+
+def _power_scale(col):
+    """Factor Step5 applies to a channel (pu on 100 MVA -> MW / MVar, else 1)."""
+    from Step5_analyze_sim import prefix_of, LDDL_COLS, POWER_SCALE
+    scaled = (prefix_of(col) in ("powr", "vars", "plod") or
+              col in (LDDL_COLS[k] for k in ("P", "Q", "OS_P", "OS_Q")))
+    return POWER_SCALE if scaled else 1.0
+
+
+def element_channels(columns, kind, key):
+    """Label and (name, channel, axis) traces of one element, as in Step5."""
+    from Step5_analyze_sim import cols_by_prefix, extract_bus_nums, line_cols
+    df = pd.DataFrame(columns=columns)
+
+    def at(pfx, bus):
+        return next((c for c in cols_by_prefix(df, pfx)
+                     if extract_bus_nums(c)[:1] == [bus]), None)
+
+    if kind == "line":
+        fb, tb, ckt = (int(x) for x in str(key).split("_"))
+        chans = {pq: c for c, f, t, k, pq in line_cols(df) if (f, t, k) == (fb, tb, ckt)}
+        label  = f"Line {fb} \u2192 {tb} (ckt {ckt})"
+        traces = [("P flow (MW)", chans.get("P"), "y"), ("Q flow (MVar)", chans.get("Q"), "y2")]
+    else:
+        bus = int(key)
+        label, traces = {
+            "gen":  (f"Generator at Bus {bus}",
+                     [("P (MW)", at("powr", bus), "y"), ("Q (MVar)", at("vars", bus), "y2")]),
+            "bus":  (f"Bus {bus}",
+                     [("V (pu)", at("volt", bus), "y"), ("Angle (\u00b0)", at("angl", bus), "y2")]),
+            "load": (f"Load Bus {bus}",
+                     [("P (MW)", at("plod", bus), "y"), ("V (pu)", at("volt", bus), "y2")]),
+        }[kind]
+    return {"label":  label,
+            "traces": [{"name": n, "chan": c, "axis": a} for n, c, a in traces if c]}
+
+
+class DashboardHandler(SimpleHTTPRequestHandler):
+    """Static files from the results folder plus the /element and /series API."""
+
+    cache     = None     # SimCache, set by serve()
+    dashboard = None     # file name served at /
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _json(self, obj, status=200):
+        body = json.dumps(obj, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q   = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/":
+            self.send_response(302)
+            self.send_header("Location", "/" + self.dashboard)
+            self.end_headers()
+            return
+        if url.path not in ("/element", "/series"):
+            return super().do_GET()
+        if self.cache is None:
+            return self._json({"error": "no simulation file"}, 404)
+        try:
+            if url.path == "/element":
+                return self._json(element_channels(self.cache.columns[1:], q["kind"], q["key"]))
+            num    = lambda k: float(q[k]) if q.get(k) not in (None, "") else None
+            maxpts = int(q.get("maxpts") or SERIES_MAXPTS)
+            t, y   = self.cache.series(q["chan"], num("t0"), num("t1"), maxpts)
+            y      = y * _power_scale(q["chan"])
+            self._json({"n": len(t), "t": _b64(t, "<f4"), "y": _b64(y, "<f4")})
+        except (KeyError, ValueError) as e:
+            self._json({"error": f"bad request: {e}"}, 400)
+
+
+def serve(output_dir, dashboard, sim_file, port=SERVER_PORT):
+    """Serve output_dir with the time-series API until interrupted."""
+    import sim_cache
+    if Path(sim_file).exists():
+        DashboardHandler.cache = sim_cache.SimCache.open(sim_file)
+    else:
+        print(f"  [!] Simulation file not found: {sim_file} — on-demand series disabled")
+    DashboardHandler.dashboard = dashboard
+    handler = partial(DashboardHandler, directory=str(output_dir))
+    with ThreadingHTTPServer(("127.0.0.1", port), handler) as httpd:
+        print(f"\n-> Serving http://localhost:{port}/  (Ctrl+C to stop)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1186,20 +1737,31 @@ def main():
 
     case_name  = _cfg('case_name',            str)
     bus_number = _cfg('bus_number',            int)
-    osc_freq   = _cfg('oscillation_frequency', float)
+    osc_freq   = mode_atlas.resolve_frequency(config)   # blank -> atlas mode, as Step4
     osc_amp    = _cfg('oscillation_amplitude', float)
+    bundle     = _cfg('dashboard_bundle', str, default='0').lower() in ('1', 'true', 'yes')
+    plotly_js  = _cfg('plotly_js', str)
 
     OUTPUT_DIR = str(root / "results")
     INPUT_DIR  = OUTPUT_DIR
 
     DASH_SUBTITLE = (f"{case_name}  —  Bus {bus_number}  —  {osc_freq} Hz")
 
+    # Annotate with the closest mode the atlas knows for this source bus
+    atlas = mode_atlas.query_modes(freq_min=0.8 * osc_freq, freq_max=1.2 * osc_freq,
+                                   bus=bus_number, case_hash=mode_atlas.case_hash(case_name))
+    if not atlas.empty:
+        near = atlas.iloc[(atlas["freq_hz"] - osc_freq).abs().argmin()]
+        DASH_SUBTITLE += (f"  —  nearest atlas mode {near['freq_hz']:.3f} Hz, "
+                          f"&zeta; = {100 * near['zeta']:.1f}%")
+
     # Reconstruct run_tag to match Step5 output filenames exactly
     freq_str = str(osc_freq).rstrip('0').rstrip('.')
     amp_str  = str(int(osc_amp)) if osc_amp == int(osc_amp) else str(osc_amp)
     run_tag  = f"bus{bus_number}_{freq_str}Hz_{amp_str}MW"
 
     HTML_OUT = os.path.join(OUTPUT_DIR, f"risk_visualization_{run_tag}.html")
+    SIM_FILE = os.path.join(OUTPUT_DIR, f"{bus_number}_{osc_freq}_Hz_{osc_amp}MW_sim.csv")
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -1209,13 +1771,22 @@ def main():
 
     print("Building dashboard HTML...")
     html = build_html(data, DASH_SUBTITLE, THRESHOLDS)
+    if bundle:
+        print(f"Writing shared assets to {os.path.join(OUTPUT_DIR, ASSETS_DIR)}...")
+        html = bundle_html(html, OUTPUT_DIR, plotly_js)
 
     with open(HTML_OUT, "w", encoding="utf-8") as f:
         f.write(html)
 
     size_kb = os.path.getsize(HTML_OUT) / 1024
     print(f"\n✓ Dashboard written: {HTML_OUT}  ({size_kb:.0f} KB)")
-    print("  Open in any modern browser — no server required.")
+    if "--serve" in sys.argv:
+        port = _cfg('dashboard_port', int, default=SERVER_PORT)
+        serve(OUTPUT_DIR, os.path.basename(HTML_OUT), SIM_FILE, port)
+    elif bundle:
+        print(f"  Keep it next to {ASSETS_DIR}/ — the page loads its code from there.")
+    else:
+        print("  Open in any modern browser — no server required.")
 
 
 if __name__ == "__main__":
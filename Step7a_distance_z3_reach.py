@@ -23,6 +23,25 @@ Workflow:
        - Full impedance trajectory (time-coloured)
   7. Saves results/zone3_<line_tag>_<run_tag>.csv  and  .png.
 
+Batch mode (--all):
+  Every line in monitored_lines.csv is evaluated at once. The reaches are
+  computed as arrays (Zone3Calculator.calculate_many). V, P and Q of all
+  lines are gathered from the binary simulation cache (sim_cache.py) as
+  one channel matrix, giving the impedance trajectories Z (lines x samples).
+  The mho encroachment test then runs over the whole matrix:
+       margin(t) = |Z(t) - Z3_reach/2 ∠phi| - Z3_reach/2      (< 0 = inside)
+  The ranked table (smallest minimum margin first, with time inside the
+  zone) is saved as results/zone3_batch_<run_tag>.csv. Lines without a
+  usable RATE_B are not prompted for; they are listed with a status unless
+  --default-rate is given.
+
+Multi-zone mode (--zones, --sweep):
+  Zone 1 / 2 / 3 mho elements, dual-blinder power-swing blocking and
+  out-of-step trip logic, evaluated on the same trajectory matrix. The
+  per-line event log is saved as results/distance_events_<run_tag>.csv.
+  With --sweep, every results/*_sim.csv is evaluated and the log is saved
+  as results/distance_events_sweep.csv.
+
 Notes:
   - All impedances are in per unit on the system MVA base (default 100 MVA).
   - P and Q channel data from PSSE are already in pu (before ×POWER_SCALE).
@@ -43,6 +62,19 @@ import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 from pathlib import Path
 
+import mode_atlas
+import sim_cache
+
+
+# ── Multi-zone scheme defaults (--zones); PSB_* can be set in simulation_config.csv
+ZONE_REACH_PCT    = {1: 0.85, 2: 1.20}    # Z1 / Z2 reach as a fraction of |Z_line|; Z3 from Zone3Calculator
+ZONE_DELAY_S      = {1: 0.0, 2: 0.3, 3: 1.0}   # s   — time delay before a zone trips
+PSB_OUTER_BLINDER = 0.8     # × outermost zone reach — perpendicular distance from the line axis
+PSB_INNER_BLINDER = 0.6     # × outermost zone reach — must clear the mho circles (0.5)
+PSB_DELAY_S       = 0.03    # s   — slower outer→inner blinder transit = power swing
+PSB_BLOCK_ZONES   = (1, 2, 3)   # zones blocked while PSB is asserted
+OOS_TRIP          = True    # trip when a detected swing leaves on the opposite side
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # ZONE 3 CALCULATOR
@@ -149,6 +181,10 @@ class Zone3Calculator:
             raise ValueError(
                 f"cos(φ − 30°) ≈ 0  (φ = {phi_deg:.2f}°) — reach undefined at this angle")
         z3_reach = z_lim / cos_val
+        if z3_reach <= 0:
+            raise ValueError(
+                f"Z3 reach ≤ 0 (φ = {phi_deg:.2f}°, e.g. series-compensated X < 0) — "
+                "no forward mho zone for this line")
 
         z3_r = z3_reach * math.cos(math.radians(phi_deg))
         z3_x = z3_reach * math.sin(math.radians(phi_deg))
@@ -174,6 +210,65 @@ class Zone3Calculator:
             'z3_reach_ohm': round(z3_reach_ohm, 4),
         }
 
+    def calculate_many(self, branches: pd.DataFrame,
+                       default_rate: float | None = None) -> pd.DataFrame:
+        """
+        Vectorized calculate() for a whole branch table (batch mode).
+
+        Nothing is prompted for. Lines whose data are unusable get NaN
+        reach values and a 'status' explaining why. If default_rate is
+        given, it replaces a missing or non-positive RATE_B_MVA.
+
+        Returns
+        -------
+        DataFrame with the calculate() columns plus 'status' ('ok' when valid).
+        """
+        def col(name):
+            return pd.to_numeric(branches[name], errors='coerce').to_numpy(dtype=float)
+
+        R, X, rate2, from_kv = col('R_PU'), col('X_PU'), col('RATE_B_MVA'), col('FROM_KV')
+        if default_rate is not None:
+            rate2 = np.where(rate2 > 0, rate2, float(default_rate))
+
+        no_rate = ~(rate2 > 0)
+        no_z    = np.isnan(R) | np.isnan(X) | ((R == 0) & (X == 0))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s_lim    = 1.5 * rate2
+            z_lim    = (0.85 ** 2) * self.s_base / s_lim
+            phi_deg  = np.degrees(np.arctan2(X, R))        # same quadrant rule as calculate()
+            cos_val  = np.cos(np.radians(phi_deg - 30.0))
+            no_reach = np.abs(cos_val) < 1e-10
+            neg_reach = ~no_reach & ~(z_lim / cos_val > 0) & ~no_rate & ~no_z   # e.g. X < 0 (series capacitor)
+            bad      = no_rate | no_z | no_reach | neg_reach
+            z3_reach = np.where(bad, np.nan, z_lim / cos_val)
+            z3_r     = z3_reach * np.cos(np.radians(phi_deg))
+            z3_x     = z3_reach * np.sin(np.radians(phi_deg))
+            z_base_ohm = np.where(from_kv > 0, from_kv ** 2 / self.s_base, np.nan)
+
+        status = np.select([no_rate, no_z, no_reach, neg_reach],
+                           ['no RATE_B', 'zero/missing impedance', 'reach undefined',
+                            'reach <= 0'],
+                           default='ok')
+        return pd.DataFrame({
+            'from_bus':     branches['FROM_BUS'].to_numpy(),
+            'to_bus':       branches['TO_BUS'].to_numpy(),
+            'ckt':          branches['CKT'].to_numpy(),
+            'from_kv':      from_kv,
+            'rate_b_mva':   rate2,
+            'R_pu':         R,
+            'X_pu':         X,
+            'phi_deg':      np.round(phi_deg, 3),
+            's_lim_mva':    np.round(s_lim, 3),
+            'z_lim_pu':     np.round(np.where(no_rate, np.nan, z_lim), 6),
+            'z3_reach_pu':  np.round(z3_reach, 6),
+            'z3_r_pu':      np.round(z3_r, 6),
+            'z3_x_pu':      np.round(z3_x, 6),
+            'z_base_ohm':   np.round(z_base_ohm, 4),
+            'z3_reach_ohm': np.round(z3_reach * z_base_ohm, 4),
+            'status':       status,
+        })
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # HELPERS
@@ -352,8 +447,19 @@ def compute_trajectory(df_sim: pd.DataFrame, t: np.ndarray,
     |S| is too small to be meaningful (near zero-load instants).
     """
     V = df_sim[volt_col].to_numpy()
-    P = df_sim[p_col].to_numpy()/100
-    Q = df_sim[q_col].to_numpy()/100 if q_col else np.zeros_like(P)
+    P = df_sim[p_col].to_numpy()
+    Q = df_sim[q_col].to_numpy() if q_col else np.zeros_like(P)
+    return impedance(V, P, Q)
+
+
+def impedance(V: np.ndarray, P: np.ndarray, Q: np.ndarray) -> tuple:
+    """
+    (R, X) of Z = V^2 / (P - jQ) for arrays of any (matching) shape, with
+    P and Q as read from the sim CSV (divided by 100 here).
+    NaN where |S| is too small to be meaningful.
+    """
+    P = P / 100
+    Q = Q / 100
 
     # Z = V² / (P - jQ)  →  R + jX = V²(P + jQ) / (P² + Q²)
     V2    = V ** 2
@@ -366,6 +472,331 @@ def compute_trajectory(df_sim: pd.DataFrame, t: np.ndarray,
     return R_traj, X_traj
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# BATCH  (all monitored lines at once)
+# ═══════════════════════════════════════════════════════════════════════════
+
+_LINE_CH = re.compile(r'^LINE_(\d+)_(\d+)_(\d+)_(P|Q)$', re.IGNORECASE)
+
+
+def channel_index(columns) -> tuple:
+    """
+    One pass over the sim column names.
+
+    Returns
+    -------
+    (volt, flow) — {bus: column position} for VOLT channels (first match,
+    as find_sim_columns) and {(from, to, ckt, 'P'|'Q'): column position}
+    """
+    volt, flow = {}, {}
+    for i, col in enumerate(columns):
+        m = _LINE_CH.match(col)
+        if m:
+            flow[(int(m.group(1)), int(m.group(2)), int(m.group(3)), m.group(4).upper())] = i
+        elif col.split() and col.split()[0].lower() == 'volt':
+            nums = [int(x) for x in re.findall(r'\b(\d{4,6})\b', col)]
+            if nums:
+                volt.setdefault(nums[0], i)
+    return volt, flow
+
+
+def _ckt_int(ckt) -> int | None:
+    try:
+        return int(float(str(ckt).strip()))
+    except ValueError:
+        return None
+
+
+def load_trajectories(sim_file: Path, lines: pd.DataFrame) -> tuple:
+    """
+    Impedance trajectories of every line from one channel matrix.
+
+    V (relay end = FROM_BUS), P and Q of all lines are gathered from the
+    simulation cache with one fancy index each; a missing Q channel is
+    taken as zero (as in the single-line mode).
+
+    Returns
+    -------
+    (t, Z, found) — t shifted to start at 0, Z complex (n_lines, n_samples)
+    (NaN rows for lines without channels), found boolean (n_lines,)
+    """
+    cache      = sim_cache.SimCache.open(sim_file)
+    volt, flow = channel_index(cache.columns)
+
+    fb  = lines['from_bus'].astype(int).to_numpy()
+    tb  = lines['to_bus'].astype(int).to_numpy()
+    ckt = [_ckt_int(c) for c in lines['ckt']]
+    none = -1
+    iv = np.array([volt.get(b, none) for b in fb])
+    ip = np.array([flow.get((f, o, c, 'P'), none) for f, o, c in zip(fb, tb, ckt)])
+    iq = np.array([flow.get((f, o, c, 'Q'), none) for f, o, c in zip(fb, tb, ckt)])
+    found = (iv != none) & (ip != none)
+
+    t    = cache.time()
+    t    = t - t[0]
+    data = np.vstack([cache.data, np.full((1, cache.n_samples), np.nan),
+                      np.zeros((1, cache.n_samples))])     # extra rows: NaN (missing V/P), 0 (missing Q)
+    zero = data.shape[0] - 1
+    nan  = zero - 1
+    V = data[np.where(iv != none, iv, nan)]
+    P = data[np.where(ip != none, ip, nan)]
+    Q = data[np.where(iq != none, iq, zero)]
+    R, X = impedance(V, P, Q)
+    return t, R + 1j * X, found
+
+
+def mho_margin(Z: np.ndarray, reach: np.ndarray, phi_deg: np.ndarray) -> np.ndarray:
+    """
+    Distance of every trajectory point outside the mho circle (pu):
+    |Z - reach/2 ∠phi| - reach/2, negative inside the zone.
+
+    Z : (n_lines, n_samples) complex;  reach, phi_deg : (n_lines,)
+    """
+    reach  = np.asarray(reach, dtype=float)[:, None]
+    centre = 0.5 * reach * np.exp(1j * np.radians(np.asarray(phi_deg, dtype=float)))[:, None]
+    return np.abs(Z - centre) - 0.5 * reach
+
+
+def encroachment(t: np.ndarray, margin: np.ndarray) -> dict:
+    """
+    Per-line summary of a margin matrix (n_lines, n_samples).
+
+    Returns
+    -------
+    dict of (n_lines,) arrays: min_margin_pu, t_min_margin_s,
+    t_first_entry_s, time_in_zone_s, samples_in_zone
+    """
+    dt      = np.diff(t, append=t[-1])                       # each sample holds until the next
+    m       = np.where(np.isnan(margin), np.inf, margin)
+    i_min   = np.argmin(m, axis=1)
+    m_min   = m[np.arange(len(m)), i_min]
+    inside  = m < 0
+    entered = inside.any(axis=1)
+    return {
+        'min_margin_pu':   np.where(np.isinf(m_min), np.nan, m_min),
+        't_min_margin_s':  np.where(np.isinf(m_min), np.nan, t[i_min]),
+        't_first_entry_s': np.where(entered, t[np.argmax(inside, axis=1)], np.nan),
+        'time_in_zone_s':  inside @ dt,
+        'samples_in_zone': inside.sum(axis=1),
+    }
+
+
+def run_batch(branches: pd.DataFrame, calc: Zone3Calculator, sim_file: Path,
+              results_dir: Path, run_tag: str, default_rate: float | None = None) -> pd.DataFrame:
+    """Zone 3 reach and encroachment for every line; writes the ranked table."""
+    table = calc.calculate_many(branches, default_rate)
+    n_ok  = int((table['status'] == 'ok').sum())
+    print(f"  Zone 3 reach computed for {n_ok} of {len(table)} lines")
+    for status, n in table.loc[table['status'] != 'ok', 'status'].value_counts().items():
+        print(f"  {n:>4} lines skipped: {status}")
+
+    if sim_file.exists():
+        print("\nLoading simulation channels…")
+        t, Z, found = load_trajectories(sim_file, table)
+        margin = mho_margin(Z, table['z3_reach_pu'].to_numpy(), table['phi_deg'].to_numpy())
+        for key, values in encroachment(t, margin).items():
+            table[key] = values
+        table['min_margin_pct'] = np.round(100 * table['min_margin_pu'] / table['z3_reach_pu'], 3)
+        table.loc[(table['status'] == 'ok') & ~found, 'status'] = 'no sim channels'
+        print(f"  Trajectories for {int(found.sum())} lines, {len(t)} samples")
+    else:
+        print(f"\nWARNING: Simulation file not found ({sim_file}). Reach table only.")
+        table['min_margin_pct'] = np.nan
+
+    # lines that enter the zone always rank above those that never do
+    in_zone = table['samples_in_zone'] > 0 if 'samples_in_zone' in table else False
+    table = (table.assign(_out_of_zone=np.where(in_zone, 0, 1))
+                  .sort_values(['_out_of_zone', 'min_margin_pct', 'z3_reach_pu'],
+                               na_position='last', kind='stable')
+                  .drop(columns='_out_of_zone').reset_index(drop=True))
+    out = results_dir / f"zone3_batch_{run_tag}.csv"
+    table.to_csv(out, index=False)
+
+    ranked = table.dropna(subset=['min_margin_pct']).head(10)
+    if not ranked.empty:
+        print("\n── Closest to Zone 3 (min margin, % of reach) ────────────────")
+        for _, r in ranked.iterrows():
+            inside = (f"inside {r['time_in_zone_s']:.3f} s from t={r['t_first_entry_s']:.3f} s"
+                      if r['samples_in_zone'] else "")
+            print(f"  {int(r['from_bus']):>6} → {int(r['to_bus']):<6} ckt {_ckt_int(r['ckt'])}  "
+                  f"{r['min_margin_pct']:>8.2f} %   {inside}")
+        print("──────────────────────────────────────────────────────────────")
+    print(f"\n-> Batch Zone 3 table saved: {out}")
+    return table
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MULTI-ZONE / POWER-SWING EVALUATION  (--zones, --sweep)
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# Every characteristic is evaluated on the whole (lines x samples) trajectory
+# matrix. Timers and latches are expressed through run starts, so no
+# per-sample loop is needed. A "run" is a stretch of consecutive samples
+# where a condition holds; a sample counts until the next one.
+
+def run_start(B: np.ndarray) -> np.ndarray:
+    """Index of the first sample of the current True run, per element of B (lines x samples)."""
+    n     = B.shape[1]
+    reset = np.where(B, 0, np.arange(1, n + 1))
+    return np.minimum(np.maximum.accumulate(reset, axis=1), n - 1)
+
+
+def runs(B: np.ndarray) -> tuple:
+    """(row, start, end) of every True run in B, end exclusive, in row-major order."""
+    P = np.zeros((B.shape[0], B.shape[1] + 2), dtype=np.int8)
+    P[:, 1:-1] = B
+    d = np.diff(P, axis=1)
+    rows, starts = np.nonzero(d == 1)
+    _, ends      = np.nonzero(d == -1)
+    return rows, starts, ends
+
+
+def _run_reduce(ufunc, A: np.ndarray, rows, starts, ends) -> np.ndarray:
+    """ufunc.reduce of A over each run (rows, starts, ends) in one reduceat call."""
+    n    = A.shape[1]
+    flat = np.append(A.ravel(), A.ravel()[:1])               # sentinel so end == size is valid
+    idx  = np.column_stack([rows * n + starts, rows * n + ends]).ravel()
+    return ufunc.reduceat(flat, idx)[::2] if len(idx) else np.empty(0, dtype=A.dtype)
+
+
+def zone_reaches(table: pd.DataFrame) -> dict:
+    """{zone: (n_lines,) mho reach in pu along the line angle}."""
+    z_line = np.hypot(table['R_pu'].to_numpy(dtype=float), table['X_pu'].to_numpy(dtype=float))
+    reach  = {zone: pct * z_line for zone, pct in ZONE_REACH_PCT.items()}
+    reach[3] = table['z3_reach_pu'].to_numpy(dtype=float)
+    return reach
+
+
+def power_swing(t: np.ndarray, Z: np.ndarray, phi_deg: np.ndarray, reach: np.ndarray,
+                outer: float, inner: float, delay: float) -> tuple:
+    """
+    Dual-blinder power-swing detection and out-of-step trip points.
+
+    The blinders are parallel to the line angle at ±outer·reach and
+    ±inner·reach. A swing is declared when Z needs at least `delay` to cross
+    from the outer to the inner blinder. PSB stays asserted from that moment
+    until Z leaves the outer blinder again. If it leaves on the side opposite
+    to the one it entered from, the swing was unstable: out-of-step.
+
+    Returns
+    -------
+    (psb, oos) — psb boolean (lines x samples); oos boolean, True at the
+    sample where an unstable swing leaves the outer blinder
+    """
+    n    = Z.shape[1]
+    d    = (Z * np.exp(-1j * np.radians(phi_deg))[:, None]).imag     # signed distance from line axis
+    ad   = np.abs(d)                                                  # NaN (no flow) = outside
+    r    = np.asarray(reach, dtype=float)[:, None]
+    in_o = ad <= outer * r
+    in_i = ad <= inner * r
+    rows = np.arange(len(Z))[:, None]
+
+    s     = run_start(in_o)                                           # entry into the outer band
+    c     = np.cumsum(in_i, axis=1)
+    c0    = np.concatenate([np.zeros((len(Z), 1), dtype=c.dtype), c], axis=1)[rows, s]
+    first = in_i & (c - c0 == 1)                                      # first inner sample of the episode
+    entry = np.maximum.accumulate(np.where(first, np.arange(n), -1), axis=1)
+    valid = in_o & (entry >= s)
+    psb   = valid & (t[np.maximum(entry, 0)] - t[s] >= delay)
+
+    side_in = np.sign(d[rows, s])
+    exit_   = np.zeros_like(psb)
+    exit_[:, 1:] = psb[:, :-1] & ~in_o[:, 1:]
+    side_in = np.concatenate([side_in[:, :1], side_in[:, :-1]], axis=1)   # side of the episode just left
+    oos     = exit_ & (np.sign(d) == -side_in)
+    return psb, oos
+
+
+def evaluate_scheme(t: np.ndarray, Z: np.ndarray, table: pd.DataFrame, settings: dict) -> pd.DataFrame:
+    """
+    Zone 1–3 mho elements, PSB and out-of-step trip for every line at once.
+
+    Parameters
+    ----------
+    t, Z     : from load_trajectories (Z is lines x samples)
+    table    : calculate_many() output, same line order as Z
+    settings : psb_outer_blinder, psb_inner_blinder, psb_delay,
+               psb_block_zones, oos_trip
+
+    Returns
+    -------
+    Event log, one row per event: line, event ('Z1'…'Z3', 'PSB', 'OOS trip'),
+    t_start_s, t_end_s, dwell_s, psb_asserted, trip, t_trip_s
+    """
+    n     = Z.shape[1]
+    phi   = table['phi_deg'].to_numpy(dtype=float)
+    reach = zone_reaches(table)
+    outer = np.fmax.reduce([reach[z] for z in sorted(reach)])          # outermost zone per line
+
+    psb, oos = power_swing(t, Z, phi, outer, settings['psb_outer_blinder'],
+                           settings['psb_inner_blinder'], settings['psb_delay'])
+
+    key    = table[['from_bus', 'to_bus', 'ckt']].reset_index(drop=True)
+    frames = []
+
+    def log(event, rows, starts, ends, psb_any, trip, t_trip):
+        ev = key.iloc[rows].reset_index(drop=True)
+        ev['event']        = event
+        ev['t_start_s']    = t[starts]
+        ev['t_end_s']      = t[np.minimum(ends, n - 1)]          # a sample holds until the next
+        ev['dwell_s']      = ev['t_end_s'] - ev['t_start_s']
+        ev['psb_asserted'] = psb_any
+        ev['trip']         = trip
+        ev['t_trip_s']     = t_trip
+        frames.append(ev)
+
+    for zone in sorted(reach):
+        inside  = mho_margin(Z, reach[zone], phi) < 0
+        blocked = psb if zone in settings['psb_block_zones'] else np.zeros_like(psb)
+        armed   = inside & ~blocked
+        timer   = t - t[run_start(armed)]
+        trips   = armed & (timer >= ZONE_DELAY_S[zone] - 1e-9)
+        rows, starts, ends = runs(inside)
+        first  = _run_reduce(np.minimum, np.where(trips, np.arange(n), n), rows, starts, ends)
+        tripped = first < n
+        log(f"Z{zone}", rows, starts, ends,
+            _run_reduce(np.logical_or, psb, rows, starts, ends), tripped,
+            np.where(tripped, t[np.minimum(first, n - 1)], np.nan))
+
+    rows, starts, ends = runs(psb)
+    log("PSB", rows, starts, ends, np.ones(len(rows), dtype=bool),
+        np.zeros(len(rows), dtype=bool), np.full(len(rows), np.nan))
+
+    if settings['oos_trip']:
+        rows, cols = np.nonzero(oos)
+        log("OOS trip", rows, cols, cols, np.ones(len(rows), dtype=bool),
+            np.ones(len(rows), dtype=bool), t[cols])
+
+    events = pd.concat(frames, ignore_index=True)
+    return events.sort_values(['from_bus', 'to_bus', 'ckt', 't_start_s'],
+                              kind='stable').reset_index(drop=True)
+
+
+def run_zones(branches: pd.DataFrame, calc: Zone3Calculator, sim_files: list,
+              out_csv: Path, settings: dict, default_rate: float | None = None) -> pd.DataFrame:
+    """Multi-zone / PSB event log of every monitored line for one or more sim files."""
+    table  = calc.calculate_many(branches, default_rate)
+    logs   = []
+    for sim_file in sim_files:
+        t, Z, found = load_trajectories(sim_file, table)
+        events = evaluate_scheme(t, Z[found], table[found], settings)
+        events.insert(0, 'run', sim_file.name.removesuffix('_sim.csv'))
+        logs.append(events)
+        trips = events[events['trip']]
+        print(f"  {sim_file.name}: {int(found.sum())} lines, {len(events)} events, "
+              f"{trips[['from_bus', 'to_bus', 'ckt']].drop_duplicates().shape[0]} lines tripped, "
+              f"{int((events['event'] == 'PSB').sum())} PSB, "
+              f"{int((events['event'] == 'OOS trip').sum())} OOS")
+
+    log = pd.concat(logs, ignore_index=True) if logs else pd.DataFrame()
+    for c in ('t_start_s', 't_end_s', 'dwell_s', 't_trip_s'):
+        if c in log:
+            log[c] = log[c].round(6)
+    log.to_csv(out_csv, index=False)
+    print(f"\n-> Distance event log saved: {out_csv}")
+    return log
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MHO CIRCLE
 # ═══════════════════════════════════════════════════════════════════════════
@@ -514,6 +945,21 @@ def main():
     parser.add_argument(
         '--s-base', type=float, default=100.0,
         help="System MVA base (default: 100).")
+    parser.add_argument(
+        '--all', action='store_true',
+        help="Batch mode: evaluate every monitored line and write a ranked "
+             "zone3_batch_<run_tag>.csv instead of analysing one line.")
+    parser.add_argument(
+        '--default-rate', type=float, default=None,
+        help="Batch mode: RATE_B (MVA) used for lines whose rating is missing "
+             "or zero (default: such lines are skipped).")
+    parser.add_argument(
+        '--zones', action='store_true',
+        help="Zone 1/2/3 + power-swing blocking / out-of-step evaluation of every "
+             "monitored line; writes distance_events_<run_tag>.csv.")
+    parser.add_argument(
+        '--sweep', action='store_true',
+        help="As --zones, for every results/*_sim.csv; writes distance_events_sweep.csv.")
     args = parser.parse_args()
 
     # ── Config ───────────────────────────────────────────────────────────
@@ -521,7 +967,7 @@ def main():
     config      = pd.read_csv(root / "simulation_config.csv")
     case_name   = _cfg(config, 'case_name')
     bus_number  = _cfg(config, 'bus_number',            int)
-    osc_freq    = _cfg(config, 'oscillation_frequency', float)
+    osc_freq    = mode_atlas.resolve_frequency(config)   # blank -> atlas mode, as Step4
     osc_amp     = _cfg(config, 'oscillation_amplitude', float)
 
     processing_dir = root / "Processing"
@@ -540,6 +986,37 @@ def main():
     # ── Branch data ───────────────────────────────────────────────────────
     branches = load_branches(processing_dir, case_name)
 
+    if args.zones or args.sweep:
+        settings = {
+            'psb_outer_blinder': _cfg(config, 'psb_outer_blinder', float, PSB_OUTER_BLINDER),
+            'psb_inner_blinder': _cfg(config, 'psb_inner_blinder', float, PSB_INNER_BLINDER),
+            'psb_delay':         _cfg(config, 'psb_delay',         float, PSB_DELAY_S),
+            'psb_block_zones':   _cfg(config, 'psb_block_zones',
+                                      lambda v: tuple(int(z) for z in str(v).replace(',', ' ').split()),
+                                      PSB_BLOCK_ZONES),
+            'oos_trip':          _cfg(config, 'oos_trip', lambda v: bool(int(float(v))), OOS_TRIP),
+        }
+        if args.sweep:
+            sim_files = sorted(results_dir.glob('*_sim.csv'))
+            out_csv   = results_dir / "distance_events_sweep.csv"
+        else:
+            sim_files = [sim_file] if sim_file.exists() else []
+            out_csv   = results_dir / f"distance_events_{run_tag}.csv"
+        if not sim_files:
+            print(f"\nERROR: No simulation files found in {results_dir}.")
+            sys.exit(1)
+        print(f"\nEvaluating Z1/Z2/Z3 + PSB on {len(sim_files)} run(s)…")
+        run_zones(branches, Zone3Calculator(s_base=args.s_base), sim_files, out_csv,
+                  settings, args.default_rate)
+        print("\nDone.")
+        return
+
+    if args.all:
+        run_batch(branches, Zone3Calculator(s_base=args.s_base), sim_file,
+                  results_dir, run_tag, args.default_rate)
+        print("\nDone.")
+        return
+
     # ── Line selection ────────────────────────────────────────────────────
     selected = pick_line(branches, args.line)
     from_bus = int(selected['FROM_BUS'])
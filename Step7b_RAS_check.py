@@ -19,16 +19,22 @@ Trigger logic
   ABOVE threshold: signal > threshold  for a contiguous window ≥ duration_sec
   BELOW threshold: signal < threshold  for a contiguous window ≥ duration_sec
 
+  Windows are found by violation_runs, a run-length engine that works on
+  one signal or on a (signals × samples) matrix at once.
+
 Usage
 -----
   python Step8_ras_check.py                   # fully interactive
   python Step8_ras_check.py --bus 5003 --signal volt --threshold 1.05 --duration 0.5 --direction above
   python Step8_ras_check.py --line 5001-5003-1 --signal P --threshold 300 --duration 0.3 --direction above
+  python Step8_ras_check.py --rules ras_rules.csv   # every rule in the file, every results/*_sim.csv
 
 Outputs (saved to results/)
 ---------------------------
   ras_check_<element_tag>_<run_tag>.png   — annotated time-series plot
   ras_check_<element_tag>_<run_tag>.csv   — per-time-step table with violation flag
+  ras_report_<rules>.csv                  — (--rules) one row per run × rule × element
+  ras_windows_<rules>.csv                 — (--rules) every violation window
 """
 
 import os
@@ -43,9 +49,21 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from pathlib import Path
 
+import mode_atlas
+import sim_cache
+
 
 POWER_SCALE = 100.0   # pu → MW / MVar (matches Step5)
 
+# Signal names accepted on the command line and in the rule file
+SIGNAL_ALIASES = {'p': 'P', 'pflow': 'P', 'active': 'P',
+                  'q': 'Q', 'qflow': 'Q', 'reactive': 'Q',
+                  'angle': 'angle_diff', 'angle_diff': 'angle_diff',
+                  'delta': 'angle_diff', 'da': 'angle_diff'}
+VOLT_ALIASES   = ('volt', 'voltage', 'v')
+RULE_COLUMNS   = ['rule', 'element_type', 'element', 'signal',
+                  'threshold', 'direction', 'duration']
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIG HELPER
@@ -84,6 +102,30 @@ def _prefix(col: str) -> str:
     return col.split()[0].lower()
 
 
+_LINE_CH = re.compile(r'^LINE_(\d+)_(\d+)_(\d+)_(P|Q)$', re.IGNORECASE)
+
+
+def channel_index(columns) -> dict:
+    """
+    Column lookup built in one pass over the sim headers.
+
+    Keys are (prefix, bus) for bus channels such as ('volt', 5003) or
+    ('angl', 5003), and ('P'|'Q', from_bus, to_bus, ckt) for line flows.
+    The first matching column wins, as in a scan of the headers.
+    """
+    index = {}
+    for col in columns:
+        m = _LINE_CH.match(col)
+        if m:
+            key = (m.group(4).upper(), int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            index.setdefault(key, col)
+            continue
+        nums = _extract_bus_nums(col)
+        if nums and col.split():
+            index.setdefault((_prefix(col), nums[0]), col)
+    return index
+
+
 def list_buses(df: pd.DataFrame) -> list[int]:
     """All bus numbers with a VOLT channel in the sim CSV."""
     buses = []
@@ -181,19 +223,14 @@ def pick_signal(element_type: str, signal_arg: str | None) -> str:
     Returns the canonical signal name.
     """
     if element_type == 'bus':
-        if signal_arg and signal_arg.lower() not in ('volt', 'voltage', 'v'):
+        if signal_arg and signal_arg.lower() not in VOLT_ALIASES:
             print(f"WARNING: For a bus the only available signal is voltage magnitude.")
             print(f"  Ignoring --signal '{signal_arg}' and using 'volt'.")
         return 'volt'
 
     # Line signals
-    valid = {'p': 'P', 'pflow': 'P', 'active': 'P',
-             'q': 'Q', 'qflow': 'Q', 'reactive': 'Q',
-             'angle': 'angle_diff', 'angle_diff': 'angle_diff',
-             'delta': 'angle_diff', 'da': 'angle_diff'}
-
     if signal_arg:
-        canon = valid.get(signal_arg.lower())
+        canon = SIGNAL_ALIASES.get(signal_arg.lower())
         if canon:
             return canon
         print(f"WARNING: --signal '{signal_arg}' not recognised for a line.")
@@ -252,16 +289,19 @@ def prompt_direction() -> str:
 
 def extract_signal(df: pd.DataFrame, t: np.ndarray,
                    element_type: str, element_info: dict,
-                   signal: str) -> tuple[np.ndarray, str, str]:
+                   signal: str, index: dict | None = None) -> tuple[np.ndarray, str, str]:
     """
     Returns (values_array, signal_label, unit_string).
+
+    index : channel_index(df.columns); pass it when extracting many signals
+            from the same frame so the headers are parsed only once.
     """
+    if index is None:
+        index = channel_index(df.columns)
+
     if element_type == 'bus':
         bus = element_info['bus']
-        col = next((c for c in df.columns
-                    if _prefix(c) == 'volt'
-                    and _extract_bus_nums(c)
-                    and _extract_bus_nums(c)[0] == bus), None)
+        col = index.get(('volt', bus))
         if col is None:
             print(f"ERROR: VOLT channel for bus {bus} not found.")
             sys.exit(1)
@@ -273,8 +313,7 @@ def extract_signal(df: pd.DataFrame, t: np.ndarray,
     ckt = element_info['ckt']
 
     if signal == 'P':
-        pattern = re.compile(rf'^LINE_{fb}_{tb}_{ckt}_P$', re.IGNORECASE)
-        col = next((c for c in df.columns if pattern.match(c)), None)
+        col = index.get(('P', fb, tb, ckt))
         if col is None:
             print(f"ERROR: LINE_{fb}_{tb}_{ckt}_P channel not found in simulation CSV.")
             sys.exit(1)
@@ -282,8 +321,7 @@ def extract_signal(df: pd.DataFrame, t: np.ndarray,
                f"Line {fb}→{tb} ckt {ckt}  P flow", "MW"
 
     if signal == 'Q':
-        pattern = re.compile(rf'^LINE_{fb}_{tb}_{ckt}_Q$', re.IGNORECASE)
-        col = next((c for c in df.columns if pattern.match(c)), None)
+        col = index.get(('Q', fb, tb, ckt))
         if col is None:
             print(f"ERROR: LINE_{fb}_{tb}_{ckt}_Q channel not found in simulation CSV.")
             print("  Q channels are only logged if they were included in Step3b monitoring.")
@@ -293,14 +331,8 @@ def extract_signal(df: pd.DataFrame, t: np.ndarray,
 
     if signal == 'angle_diff':
         # Find ANGL channels for from_bus and to_bus
-        def angl_col(bus: int):
-            return next((c for c in df.columns
-                         if _prefix(c) == 'angl'
-                         and _extract_bus_nums(c)
-                         and _extract_bus_nums(c)[0] == bus), None)
-
-        col_from = angl_col(fb)
-        col_to   = angl_col(tb)
+        col_from = index.get(('angl', fb))
+        col_to   = index.get(('angl', tb))
 
         missing = []
         if col_from is None:
@@ -325,6 +357,63 @@ def extract_signal(df: pd.DataFrame, t: np.ndarray,
 # RAS TRIGGER LOGIC
 # ═══════════════════════════════════════════════════════════════════════════
 
+def violation_runs(values: np.ndarray, t: np.ndarray,
+                   threshold, direction, duration_sec) -> dict:
+    """
+    Run-length trigger engine for one signal or many signals on a common
+    time axis (no per-sample loop).
+
+    The condition mask is differenced to get the start / end index of
+    every window. Windows shorter than the minimum number of samples are
+    dropped. The peak of each remaining window is found with one
+    np.maximum.reduceat over all windows. 'below' signals are negated, so
+    their peak is the minimum.
+
+    Parameters
+    ----------
+    values       : (n_samples,) or (n_signals, n_samples)
+    threshold, direction, duration_sec : scalar, or one value per signal
+
+    Returns
+    -------
+    dict of equal-length int arrays, one entry per window in signal then
+    time order: signal, i_start, i_end (exclusive), i_peak
+    """
+    V    = np.atleast_2d(np.asarray(values, dtype=float))
+    k, n = V.shape
+    up   = np.broadcast_to(np.asarray(direction) == 'above', (k,))
+    sign = np.where(up, 1.0, -1.0)
+    thr  = np.broadcast_to(np.asarray(threshold, dtype=float), (k,))
+    dur  = np.broadcast_to(np.asarray(duration_sec, dtype=float), (k,))
+
+    S    = V * sign[:, None]                       # 'below' negated: both become "> threshold"
+    mask = S > (thr * sign)[:, None]
+
+    dt          = float(np.median(np.diff(t)))
+    min_samples = np.maximum(1, np.ceil(dur / dt).astype(int))
+
+    edge = np.diff(np.pad(mask, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    sig, i_start = np.nonzero(edge == 1)
+    _,   i_end   = np.nonzero(edge == -1)
+    keep = (i_end - i_start) >= min_samples[sig]
+    sig, i_start, i_end = sig[keep], i_start[keep], i_end[keep]
+    if not len(sig):
+        return {'signal': sig, 'i_start': i_start, 'i_end': i_end, 'i_peak': i_start}
+
+    # segment-wise peak value, then the first sample of each window reaching it
+    flat   = np.append(S.ravel(), 0.0)              # sentinel: a window may end at the last sample
+    lo     = sig * n + i_start
+    length = i_end - i_start
+    peak   = np.maximum.reduceat(flat, np.column_stack([lo, lo + length]).ravel())[::2]
+    offset = np.concatenate([[0], np.cumsum(length)[:-1]])
+    seg    = np.repeat(np.arange(len(sig)), length)
+    pos    = np.arange(length.sum()) - np.repeat(offset - lo, length)
+    first  = np.where(flat[pos] == peak[seg], pos, flat.size)
+    i_peak = np.minimum.reduceat(first, offset) - sig * n
+
+    return {'signal': sig, 'i_start': i_start, 'i_end': i_end, 'i_peak': i_peak}
+
+
 def find_violations(values: np.ndarray, t: np.ndarray,
                     threshold: float, direction: str,
                     duration_sec: float) -> list[dict]:
@@ -335,58 +424,225 @@ def find_violations(values: np.ndarray, t: np.ndarray,
         { 't_start', 't_end', 'duration', 'peak_value', 'peak_time',
           'indices' (slice) }
     """
-    if direction == 'above':
-        mask = values > threshold
+    runs  = violation_runs(values, t, threshold, direction, duration_sec)
+    i0, i1, ip = runs['i_start'], runs['i_end'], runs['i_peak']
+    cols  = zip(t[i0].tolist(), t[i1 - 1].tolist(), (t[i1 - 1] - t[i0]).tolist(),
+                np.asarray(values)[ip].tolist(), t[ip].tolist(), i0.tolist(), i1.tolist())
+    return [{
+        't_start':    round(ts, 4),
+        't_end':      round(te, 4),
+        'duration':   round(dur, 4),
+        'peak_value': round(pv, 4),
+        'peak_time':  round(pt, 4),
+        'i_start':    a,
+        'i_end':      b,
+    } for ts, te, dur, pv, pt, a, b in cols]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RULE FILE  (--rules: many conditions, every run)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_rules(path: Path) -> pd.DataFrame:
+    """
+    Read and validate a RAS rule file (CSV, one arming condition per row).
+
+    Columns
+    -------
+    rule          name used in the report
+    element_type  bus | line
+    element       bus number / FROM-TO-CKT, several separated by spaces or ';',
+                  or * for every element with the required channels
+    signal        volt (bus) | P, Q, angle_diff (line)  — same aliases as --signal
+    threshold     pu / MW / MVar / degrees
+    direction     above | below
+    duration      minimum sustained duration (s)
+    """
+    rules = pd.read_csv(path, dtype=str, keep_default_na=False, comment='#')
+    rules.columns = [c.strip().lower() for c in rules.columns]
+    missing = [c for c in RULE_COLUMNS if c not in rules.columns]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    rules = rules[RULE_COLUMNS].apply(lambda c: c.str.strip())
+    rules = rules[rules['rule'] != ''].reset_index(drop=True)
+
+    for i, r in rules.iterrows():
+        where = f"{path.name} rule '{r['rule']}'"
+        etype = r['element_type'].lower()
+        if etype == 'bus':
+            if r['signal'].lower() not in VOLT_ALIASES:
+                raise ValueError(f"{where}: a bus rule can only use signal 'volt'")
+            signal = 'volt'
+        elif etype == 'line':
+            signal = SIGNAL_ALIASES.get(r['signal'].lower())
+            if signal is None:
+                raise ValueError(f"{where}: unknown line signal '{r['signal']}'")
+        else:
+            raise ValueError(f"{where}: element_type must be 'bus' or 'line'")
+        if r['direction'].lower() not in ('above', 'below'):
+            raise ValueError(f"{where}: direction must be 'above' or 'below'")
+        try:
+            float(r['threshold']), float(r['duration'])
+        except ValueError:
+            raise ValueError(f"{where}: threshold and duration must be numbers") from None
+        rules.loc[i, ['element_type', 'signal', 'direction']] = \
+            [etype, signal, r['direction'].lower()]
+
+    rules['threshold'] = rules['threshold'].astype(float)
+    rules['duration']  = rules['duration'].astype(float)
+    return rules
+
+
+def _rule_elements(rule: pd.Series, index: dict) -> list[tuple]:
+    """Element keys selected by one rule: (bus,) or (from, to, ckt)."""
+    if rule['element_type'] == 'bus':
+        avail = sorted(k[1:] for k in index if k[0] == 'volt')
+    elif rule['signal'] == 'angle_diff':
+        avail = sorted(k[1:] for k in index if k[0] == 'P'
+                       and ('angl', k[1]) in index and ('angl', k[2]) in index)
     else:
-        mask = values < threshold
-
-    dt = float(np.median(np.diff(t)))
-    min_samples = max(1, int(np.ceil(duration_sec / dt)))
-
-    violations = []
-    in_window  = False
-    win_start  = 0
-
-    for i in range(len(mask)):
-        if mask[i] and not in_window:
-            in_window = True
-            win_start = i
-        elif not mask[i] and in_window:
-            in_window = False
-            length = i - win_start
-            if length >= min_samples:
-                seg   = values[win_start:i]
-                p_idx = win_start + (np.argmax(seg) if direction == 'above'
-                                     else np.argmin(seg))
-                violations.append({
-                    't_start':   round(float(t[win_start]), 4),
-                    't_end':     round(float(t[i - 1]),     4),
-                    'duration':  round(float(t[i - 1] - t[win_start]), 4),
-                    'peak_value': round(float(values[p_idx]), 4),
-                    'peak_time':  round(float(t[p_idx]), 4),
-                    'i_start':   win_start,
-                    'i_end':     i,
-                })
-
-    # Handle window still open at end of series
-    if in_window:
-        i = len(mask)
-        length = i - win_start
-        if length >= min_samples:
-            seg   = values[win_start:i]
-            p_idx = win_start + (np.argmax(seg) if direction == 'above'
-                                 else np.argmin(seg))
-            violations.append({
-                't_start':   round(float(t[win_start]), 4),
-                't_end':     round(float(t[-1]),        4),
-                'duration':  round(float(t[-1] - t[win_start]), 4),
-                'peak_value': round(float(values[p_idx]), 4),
-                'peak_time':  round(float(t[p_idx]), 4),
-                'i_start':   win_start,
-                'i_end':     i,
-            })
-
-    return violations
+        avail = sorted(k[1:] for k in index if k[0] == rule['signal'])
+
+    spec = rule['element'].replace(';', ' ').split()
+    if spec == ['*']:
+        return avail
+    keys = []
+    for item in spec:
+        try:
+            keys.append(tuple(int(x) for x in item.split('-')))
+        except ValueError:
+            raise ValueError(f"rule '{rule['rule']}': bad element '{item}'") from None
+    return keys
+
+
+def expand_rules(rules: pd.DataFrame, index: dict) -> pd.DataFrame:
+    """
+    One row per (rule, element) with the channel(s) forming its signal.
+    col_b is set for angle_diff (signal = col_a − col_b). Elements whose
+    channels are missing keep col_a = None.
+    """
+    rows = []
+    for _, r in rules.iterrows():
+        for key in _rule_elements(r, index):
+            if r['element_type'] == 'bus':
+                element      = f"bus {key[0]}"
+                col_a, col_b = index.get(('volt', key[0])), None
+            else:
+                element = f"line {'-'.join(str(k) for k in key)}"
+                if len(key) != 3:
+                    col_a = col_b = None
+                elif r['signal'] == 'angle_diff':
+                    col_a, col_b = index.get(('angl', key[0])), index.get(('angl', key[1]))
+                    if col_b is None:
+                        col_a = None
+                else:
+                    col_a, col_b = index.get((r['signal'],) + key), None
+            rows.append({'rule': r['rule'], 'element': element, 'signal': r['signal'],
+                         'threshold': r['threshold'], 'direction': r['direction'],
+                         'duration': r['duration'], 'col_a': col_a, 'col_b': col_b})
+    return pd.DataFrame(rows, columns=['rule', 'element', 'signal', 'threshold',
+                                       'direction', 'duration', 'col_a', 'col_b'])
+
+
+def evaluate_rules(sim_file: Path, rules: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluate every rule on one simulation in a single vectorized pass.
+
+    All rule signals are gathered from the simulation cache into one
+    (signals × samples) matrix and handed to violation_runs together.
+
+    Returns
+    -------
+    (report, windows) — report: one row per rule and element (triggered,
+    n_windows, first_t_start_s, total_duration_s, worst_peak, status);
+    windows: one row per violation window
+    """
+    cache = sim_cache.SimCache.open(sim_file)
+    t     = cache.time()
+    t     = t - t[0]
+    sig   = expand_rules(rules, channel_index(cache.columns))
+    ok    = sig['col_a'].notna().to_numpy()
+    sig['status'] = np.where(ok, 'ok', 'missing channel')
+
+    run  = sim_file.name.removesuffix('_sim.csv')
+    live = sig[ok]
+    ia   = np.array([cache.index[c] for c in live['col_a']], dtype=int)
+    V    = np.asarray(cache.data[ia]) if len(ia) else np.empty((0, len(t)))
+    diff = live['col_b'].notna().to_numpy()
+    if diff.any():
+        ib = np.array([cache.index[c] for c in live.loc[diff, 'col_b']], dtype=int)
+        V[diff] = V[diff] - cache.data[ib]
+
+    runs = violation_runs(V, t, live['threshold'].to_numpy(), live['direction'].to_numpy(),
+                          live['duration'].to_numpy())
+    i0, i1, ip = runs['i_start'], runs['i_end'], runs['i_peak']
+    windows = live.iloc[runs['signal']][['rule', 'element', 'signal', 'threshold',
+                                         'direction']].reset_index(drop=True)
+    windows.insert(0, 'run', run)
+    windows['t_start_s']  = np.round(t[i0], 4)
+    windows['t_end_s']    = np.round(t[i1 - 1], 4)
+    windows['duration_s'] = np.round(t[i1 - 1] - t[i0], 4)
+    windows['peak_value'] = np.round(V[runs['signal'], ip], 4)
+    windows['peak_time_s'] = np.round(t[ip], 4)
+
+    k     = len(live)
+    n_win = np.bincount(runs['signal'], minlength=k)
+    first = np.full(k, np.inf)
+    np.minimum.at(first, runs['signal'], t[i0])
+    total = np.bincount(runs['signal'], weights=t[i1 - 1] - t[i0], minlength=k)
+    above = live['direction'].to_numpy() == 'above'
+    worst = np.where(above, -np.inf, np.inf)
+    np.maximum.at(worst, runs['signal'][above[runs['signal']]],
+                  V[runs['signal'], ip][above[runs['signal']]])
+    np.minimum.at(worst, runs['signal'][~above[runs['signal']]],
+                  V[runs['signal'], ip][~above[runs['signal']]])
+
+    report = sig.drop(columns=['col_a', 'col_b'])
+    report.insert(0, 'run', run)
+    report['triggered']        = False
+    report['n_windows']        = 0
+    report['first_t_start_s']  = np.nan
+    report['total_duration_s'] = 0.0
+    report['worst_peak']       = np.nan
+    report.loc[ok, 'triggered']        = n_win > 0
+    report.loc[ok, 'n_windows']        = n_win
+    report.loc[ok, 'first_t_start_s']  = np.round(np.where(n_win > 0, first, np.nan), 4)
+    report.loc[ok, 'total_duration_s'] = np.round(total, 4)
+    report.loc[ok, 'worst_peak']       = np.round(np.where(n_win > 0, worst, np.nan), 4)
+    return report, windows
+
+
+def run_rules(rules_file: Path, sim_files: list, results_dir: Path) -> pd.DataFrame:
+    """Evaluate a rule file on every sim file; write the consolidated report."""
+    rules = load_rules(rules_file)
+    print(f"Rules    : {rules_file.name} ({len(rules)} rules)")
+    reports, windows = [], []
+    for sim_file in sim_files:
+        report, win = evaluate_rules(sim_file, rules)
+        reports.append(report)
+        windows.append(win)
+        print(f"  {sim_file.name}: {int(report['triggered'].sum())} of "
+              f"{int((report['status'] == 'ok').sum())} rule signals triggered")
+
+    report  = pd.concat(reports, ignore_index=True)
+    windows = pd.concat(windows, ignore_index=True)
+
+    print("\n── RAS rule summary ───────────────────────────────────────────")
+    for rule, grp in report.groupby('rule', sort=False):
+        hit     = grp[grp['triggered']]
+        missing = int((grp['status'] != 'ok').sum())
+        print(f"  {rule:<24} triggered in {hit['run'].nunique()}/{grp['run'].nunique()} runs, "
+              f"{hit['element'].nunique()} element(s)"
+              + (f"   [{missing} without channels]" if missing else ""))
+    print("──────────────────────────────────────────────────────────────")
+
+    report_csv  = results_dir / f"ras_report_{rules_file.stem}.csv"
+    windows_csv = results_dir / f"ras_windows_{rules_file.stem}.csv"
+    report.to_csv(report_csv, index=False)
+    windows.to_csv(windows_csv, index=False)
+    print(f"\n-> RAS report : {report_csv}")
+    print(f"-> RAS windows: {windows_csv}")
+    return report
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -531,6 +787,9 @@ def main():
     parser.add_argument('--direction', type=str,   default=None,
                         choices=['above', 'below'],
                         help="'above' = signal > threshold; 'below' = signal < threshold.")
+    parser.add_argument('--rules',     type=str,   default=None,
+                        help="Rule file (CSV) with many RAS conditions; evaluated on every "
+                             "results/*_sim.csv instead of the interactive check.")
     args = parser.parse_args()
 
     # ── Config ───────────────────────────────────────────────────────────
@@ -539,7 +798,7 @@ def main():
 
     case_name  = _cfg(config, 'case_name')
     bus_number = _cfg(config, 'bus_number',            int)
-    osc_freq   = _cfg(config, 'oscillation_frequency', float)
+    osc_freq   = mode_atlas.resolve_frequency(config)   # blank -> atlas mode, as Step4
     osc_amp    = _cfg(config, 'oscillation_amplitude', float)
 
     results_dir = root / "results"
@@ -550,6 +809,19 @@ def main():
     run_tag  = f"bus{bus_number}_{freq_str}Hz_{amp_str}MW"
     sim_file = results_dir / f"{bus_number}_{osc_freq}_Hz_{osc_amp}MW_sim.csv"
 
+    if args.rules:
+        sim_files = sorted(results_dir.glob('*_sim.csv'))
+        if not sim_files:
+            print(f"ERROR: No simulation files found in {results_dir}")
+            sys.exit(1)
+        try:
+            run_rules(Path(args.rules), sim_files, results_dir)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        print("\nDone.")
+        return
+
     if not sim_file.exists():
         print(f"ERROR: Simulation file not found: {sim_file}")
         print("  Run Step4 first to generate the simulation output.")
@@ -0,0 +1,125 @@
+"""
+case_fingerprint.py
+===================
+Skip-if-unchanged support for the case-level steps (Step1, Step2a).
+
+A fingerprint is the SHA-1 of every input file a step reads (the case
+.sav/.raw/.dyr and any upstream Processing table) plus the solver and
+study options it ran with. Each step records its fingerprint in
+Processing/case_fingerprint.json after a successful run; on the next run
+it compares the new fingerprint with the stored one and, if nothing
+changed and all outputs still exist, returns the cached results instead
+of re-solving the case. Whenever it does recompute it prints why.
+
+Usage from a step:
+    fp = case_fingerprint.fingerprint({"raw": raw_case}, {"pf_method": "FNSL"})
+    fresh, reason = case_fingerprint.check("step1", fp, outputs, data_dir)
+    if fresh:
+        ...                             # use cached outputs
+    else:
+        print(f"-> Recomputing: {reason}")
+        ...
+        case_fingerprint.record("step1", fp, outputs, data_dir)
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+
+FINGERPRINT_FILE = "case_fingerprint.json"
+CASE_EXTS        = (".sav", ".raw", ".dyr")
+HASH_CHARS       = 16      # hex characters kept from each SHA-1 digest
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents, or None if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()[:HASH_CHARS]
+
+
+def case_files(case_name, case_dir, exts=CASE_EXTS):
+    """{ext: path} for the case files of the given extensions."""
+    return {ext: Path(case_dir) / f"{case_name}{ext}" for ext in exts}
+
+
+def fingerprint(files, options=None):
+    """
+    Fingerprint of a step's inputs.
+
+    Parameters
+    ----------
+    files   : dict {label: path} of input files (missing files hash to None)
+    options : dict of solver / study options (JSON-serialisable values)
+
+    Returns
+    -------
+    dict with keys digest, files {label: sha1}, options
+    """
+    digests = {str(k): file_digest(p) for k, p in files.items()}
+    options = json.loads(json.dumps(options or {}, sort_keys=True, default=str))
+    blob    = json.dumps({"files": digests, "options": options}, sort_keys=True)
+    return {"digest":  hashlib.sha1(blob.encode()).hexdigest()[:HASH_CHARS],
+            "files":   digests,
+            "options": options}
+
+
+def _load(data_dir):
+    path = Path(data_dir) / FINGERPRINT_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def check(step, fp, outputs, data_dir):
+    """
+    Compare a fingerprint with the one recorded for `step`.
+
+    Returns
+    -------
+    (up_to_date, reason) — reason explains why the step must recompute
+    (empty string when it is up to date)
+    """
+    prev = _load(data_dir).get(step)
+    if prev is None:
+        return False, "no previous run recorded"
+
+    missing = [Path(p).name for p in outputs if not Path(p).exists()]
+    if missing:
+        return False, f"output missing: {', '.join(missing)}"
+
+    if prev.get("digest") == fp["digest"]:
+        return True, ""
+
+    changes = []
+    for label in sorted(set(prev.get("files", {})) | set(fp["files"])):
+        old, new = prev.get("files", {}).get(label), fp["files"].get(label)
+        if old != new:
+            changes.append(f"{label} " + ("added" if old is None else
+                                          "removed" if new is None else "changed"))
+    for key in sorted(set(prev.get("options", {})) | set(fp["options"])):
+        old, new = prev.get("options", {}).get(key), fp["options"].get(key)
+        if old != new:
+            changes.append(f"{key} {old} -> {new}")
+    return False, "; ".join(changes) or "fingerprint changed"
+
+
+def record(step, fp, outputs, data_dir):
+    """Store the fingerprint of a successful run of `step`."""
+    data_dir = Path(data_dir)
+    data     = _load(data_dir)
+    data[step] = dict(fp, outputs=[Path(p).name for p in outputs],
+                      created=datetime.now().isoformat(timespec="seconds"))
+    with open(data_dir / FINGERPRINT_FILE, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
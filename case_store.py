@@ -0,0 +1,248 @@
+"""
+case_store.py
+=============
+Single columnar store of the case tables extracted by Step1_extract_case_info.py.
+
+Step1 writes one CSV per element type for people and spreadsheets. The same
+tables are also written to one typed, columnar file so later steps can load
+them without re-parsing text:
+
+  <case>_case.h5    — HDF5, one group per table, one dataset per column
+                      (written when h5py is installed)
+  <case>_case.npz   — NumPy archive, keys "<table>/<column>" (fallback,
+                      needs nothing beyond NumPy)
+
+A table is a dict {column name: 1-D NumPy array}. Text columns come back as
+object arrays of str, numeric columns as int64 / float64.
+
+The CSVs stay the reference: a store older than any of its CSVs (tables
+edited or re-extracted by hand), or an .h5 store without h5py installed, is
+ignored and the loaders fall back to the CSVs.
+
+Usage:
+    python case_store.py        # build the store from existing Processing CSVs
+
+From other scripts:
+    import case_store
+    tables = case_store.load_case(data_dir, case_name)           # all tables
+    buses  = case_store.load_case_table(data_dir, case_name, "buses")
+    df     = case_store.load_case_frame(data_dir, case_name, "branches")
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+TABLES = ["buses", "branches", "generators", "loads", "areas", "interarea"]
+STORE_SUFFIXES = [".h5", ".npz"]    # preference order when writing and reading
+TEXT_COLUMNS = {"NAME", "CKT", "ID", "AREA_NAME"}   # always str, as PSS/E returns them
+_SEP = "/"                          # table/column separator in npz keys
+
+
+def store_path(data_dir, case_name, suffix):
+    return Path(data_dir) / f"{case_name}_case{suffix}"
+
+
+def store_file(data_dir, case_name):
+    """Path write_case_store() writes to (.h5 with h5py installed, else .npz)."""
+    return store_path(data_dir, case_name, ".h5" if _h5py() is not None else ".npz")
+
+
+def find_store(data_dir, case_name):
+    """Existing store file for the case, or None."""
+    for suffix in STORE_SUFFIXES:
+        path = store_path(data_dir, case_name, suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def _h5py():
+    """h5py if installed, else None (optional dependency)."""
+    try:
+        import h5py
+        return h5py
+    except ImportError:
+        return None
+
+
+def _storable(col):
+    """Text columns as fixed-width unicode (no pickling needed)."""
+    col = np.asarray(col)
+    if col.dtype == object:
+        return col.astype(str)
+    return col
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WRITE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def write_case_store(data_dir, case_name, tables):
+    """
+    Write all tables of a case to one columnar file.
+
+    Parameters
+    ----------
+    tables : dict {table name: {column name: 1-D array}}
+
+    Returns
+    -------
+    Path of the written store
+    """
+    h5py = _h5py()
+    path = store_file(data_dir, case_name)
+    if h5py is not None:
+        with h5py.File(path, "w") as f:
+            for name, table in tables.items():
+                grp = f.create_group(name)
+                grp.attrs["columns"] = list(table)
+                for col, values in table.items():
+                    values = _storable(values)
+                    if values.dtype.kind == "U":
+                        grp.create_dataset(col, data=values.astype(object),
+                                           dtype=h5py.string_dtype())
+                    else:
+                        grp.create_dataset(col, data=values)
+    else:
+        arrays = {f"{name}{_SEP}{col}": _storable(values)
+                  for name, table in tables.items() for col, values in table.items()}
+        np.savez(path, **arrays)
+
+    # drop a store of the other format so readers never pick up a stale one
+    for suffix in STORE_SUFFIXES:
+        other = store_path(data_dir, case_name, suffix)
+        if other != path and other.exists():
+            other.unlink()
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _as_column(values):
+    if values.dtype.kind in "US":
+        return values.astype(str).astype(object)
+    return values
+
+
+def _read_h5(path, names):
+    h5py = _h5py()
+    if h5py is None:
+        raise ImportError(f"h5py is required to read {path}")
+    tables = {}
+    with h5py.File(path, "r") as f:
+        for name in names or list(f):
+            if name not in f:
+                continue
+            grp = f[name]
+            cols = [str(c) for c in grp.attrs.get("columns", list(grp))]
+            tables[name] = {}
+            for col in cols:
+                ds = grp[col]
+                if h5py.check_string_dtype(ds.dtype) is not None:
+                    tables[name][col] = np.array(ds.asstr()[()], dtype=object)
+                else:
+                    tables[name][col] = ds[()]
+    return tables
+
+
+def _read_npz(path, names):
+    tables = {}
+    with np.load(path, allow_pickle=False) as z:
+        for key in z.files:                         # archive order = column order
+            name, col = key.split(_SEP, 1)
+            if names and name not in names:
+                continue
+            tables.setdefault(name, {})[col] = _as_column(z[key])
+    return tables
+
+
+def stale_csvs(path, data_dir, case_name, names=None):
+    """<case>_<table>.csv files modified after the store at `path`."""
+    mtime = path.stat().st_mtime
+    csvs  = (Path(data_dir) / f"{case_name}_{name}.csv" for name in names or TABLES)
+    return [c.name for c in csvs if c.exists() and c.stat().st_mtime > mtime]
+
+
+def load_case(data_dir, case_name, names=None):
+    """
+    Load tables from the case store.
+
+    Parameters
+    ----------
+    names : list of table names, or None for every table in the store
+
+    Returns
+    -------
+    dict {table name: {column name: 1-D array}}, or None when no usable store
+    exists (missing, older than its CSVs, or .h5 without h5py) — callers then
+    read the CSVs
+    """
+    path = find_store(data_dir, case_name)
+    if path is None:
+        return None
+    names = [names] if isinstance(names, str) else names
+    newer = stale_csvs(path, data_dir, case_name, names)
+    if newer:
+        print(f"  [!] {path.name} is older than {', '.join(newer)}; reading the CSVs")
+        return None
+    if path.suffix == ".h5":
+        if _h5py() is None:
+            print(f"  [!] h5py not installed, cannot read {path.name}; reading the CSVs")
+            return None
+        return _read_h5(path, names)
+    return _read_npz(path, names)
+
+
+def load_case_table(data_dir, case_name, name):
+    """One table from the store, or None when no usable store (or table) exists."""
+    tables = load_case(data_dir, case_name, [name])
+    return None if tables is None else tables.get(name)
+
+
+def load_case_frame(data_dir, case_name, name):
+    """One table as a DataFrame: from the store if usable, else from the CSV."""
+    table = load_case_table(data_dir, case_name, name)
+    if table is None:
+        return pd.read_csv(Path(data_dir) / f"{case_name}_{name}.csv")
+    return pd.DataFrame(table)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CSV IMPORT  (cases extracted before the store existed)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def import_csvs(data_dir, case_name):
+    """Build the store from the <case>_<table>.csv files in data_dir."""
+    tables = {}
+    for name in TABLES:
+        csv_path = Path(data_dir) / f"{case_name}_{name}.csv"
+        if not csv_path.exists():
+            continue
+        df = pd.read_csv(csv_path, keep_default_na=False, float_precision="round_trip",
+                         dtype={c: str for c in TEXT_COLUMNS})
+        tables[name] = {col: (df[col].astype(str).to_numpy(dtype=object)
+                              if col in TEXT_COLUMNS or df[col].dtype.kind not in "iufb"
+                              else df[col].to_numpy())
+                        for col in df.columns}
+    if not tables:
+        raise FileNotFoundError(f"No {case_name}_*.csv tables found in {data_dir}")
+    return write_case_store(data_dir, case_name, tables)
+
+
+if __name__ == "__main__":
+    root     = Path.cwd()
+    data_dir = root / "Processing"
+
+    config    = pd.read_csv(root / "Pre_Screening_config.csv")
+    case_name = config[config.Variable == "case_name"]["Value"].iloc[0]
+
+    path = import_csvs(data_dir, case_name)
+    for name, table in load_case(data_dir, case_name).items():
+        n = len(next(iter(table.values()))) if table else 0
+        print(f"  {name:<11}: {n} rows, {len(table)} columns")
+    print(f"-> Case store written: {path}")
@@ -0,0 +1,282 @@
+"""
+dyr_catalog.py
+==============
+Indexed catalogue of the dynamic-model records in a PSS/E .dyr file.
+
+The file is read once. Every record (bus, model name, id, parameters) is
+kept with its original text and indexed by bus, by model and by
+(bus, model, id), so questions such as "which models sit at bus 6508" or
+"all GENROU machines" are dictionary lookups. Records can be patched in
+memory (new bus, id or parameter values) and rendered back to DYR text.
+A sweep can therefore write one small per-scenario fragment, or a full
+variant of the file, without re-reading or editing the source file.
+
+Record layout (fields before the terminating '/'):
+  standard models      BUS 'MODEL' ID  CON(J) CON(J+1) ...
+  user-written models  BUS 'USRLOD' ID 'NAME' IT NI NC NS NV  ICONs CONs ...
+Parameter index p refers to the p-th field after the id; for standard
+models that is CON(J+p).
+
+Usage:
+    python dyr_catalog.py PSSE_Cases/240busWECC_2018_PSS.dyr          # model summary
+    python dyr_catalog.py PSSE_Cases/240busWECC_2018_PSS.dyr 1032     # records at a bus
+
+From other scripts:
+    cat  = dyr_catalog.DyrCatalog.read(dyr_file)
+    gens = cat.of_model('GENROU')
+    rec  = cat.patch(cat.at_bus(6508)[0], bus=7001, id='ll', params={3: 0.05})
+    text = cat.fragment([rec])
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TOKENS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _split_terminator(line):
+    """(data, comment, terminated) for one line; '/' inside quotes is data."""
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch in "'\"":
+            quoted = not quoted
+        elif ch == '/' and not quoted:
+            return line[:i], line[i:], True
+    return line, '', False
+
+
+def _tokens(text):
+    """Whitespace/comma separated tokens, quoted strings kept whole (with quotes)."""
+    out, cur, quote = [], '', None
+    for ch in text:
+        if quote:
+            cur += ch
+            if ch == quote:
+                out.append(cur)
+                cur, quote = '', None
+        elif ch in "'\"":
+            if cur:
+                out.append(cur)
+            cur, quote = ch, ch
+        elif ch in ' \t,':
+            if cur:
+                out.append(cur)
+            cur = ''
+        else:
+            cur += ch
+    if cur:
+        out.append(cur)
+    return out
+
+
+def _unquote(tok):
+    return tok[1:-1].strip() if len(tok) >= 2 and tok[0] == tok[-1] and tok[0] in "'\"" else tok
+
+
+def _value(tok):
+    """Token as int, float or str."""
+    tok = _unquote(tok)
+    try:
+        return int(tok)
+    except ValueError:
+        try:
+            return float(tok)
+        except ValueError:
+            return tok
+
+
+def _format_value(v):
+    if isinstance(v, float):
+        return f"{v:.6g}" if 1e-4 <= abs(v) < 1e6 or v == 0 else f"{v:.5E}"
+    return str(v)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CATALOGUE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class DyrCatalog:
+    """Parsed .dyr file with bus / model / key indexes.
+
+    Each record is a dict:
+      bus, model, id   header fields (model upper-case, id as written without quotes)
+      params           values after the id (int / float / str)
+      lines            token lists per physical line (tokens as written)
+      comment          trailing text from the terminating '/'
+      line_no          1-based line number of the first line in the source
+      text             original text (None once patched)
+    """
+
+    def __init__(self, records, chunks, source=None):
+        self.records = records
+        self.source  = source
+        self._chunks = chunks                          # str (passthrough) or record index
+        self.by_bus   = defaultdict(list)
+        self.by_model = defaultdict(list)
+        self.by_key   = {}
+        for i, rec in enumerate(records):
+            self.by_bus[rec['bus']].append(i)
+            self.by_model[rec['model']].append(i)
+            self.by_key.setdefault((rec['bus'], rec['model'], rec['id']), i)
+
+    # ── construction ──────────────────────────────────────────────────────
+
+    @classmethod
+    def read(cls, path):
+        """Parse a .dyr file (streamed line by line)."""
+        with open(path, 'r', errors='replace') as f:
+            return cls.parse(f, source=Path(path))
+
+    @classmethod
+    def parse(cls, lines, source=None):
+        """Parse DYR text given as an iterable of lines (or one string)."""
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        records, chunks = [], []
+        pending, start, text_lines = [], 0, []
+        for n, raw in enumerate(lines, 1):
+            line = raw.rstrip('\r\n')
+            if not pending and (not line.strip() or line.lstrip().startswith('//')):
+                chunks.append(line)
+                continue
+            data, comment, done = _split_terminator(line)
+            if not pending:
+                start, text_lines = n, []
+            pending.append(_tokens(data))
+            text_lines.append(line)
+            if not done:
+                continue
+            flat = [t for toks in pending for t in toks]
+            if len(flat) >= 3:
+                chunks.append(len(records))
+                records.append({'bus':     _value(flat[0]),
+                                'model':   _unquote(flat[1]).upper(),
+                                'id':      _unquote(flat[2]),
+                                'params':  [_value(t) for t in flat[3:]],
+                                'lines':   [toks for toks in pending if toks],
+                                'comment': comment.strip(),
+                                'line_no': start,
+                                'text':    '\n'.join(text_lines)})
+            else:
+                chunks.append(line)                    # bare '/' or malformed record
+            pending = []
+        return cls(records, chunks, source)
+
+    # ── lookups ───────────────────────────────────────────────────────────
+
+    def at_bus(self, bus):
+        """Records at a bus (any model)."""
+        return [self.records[i] for i in self.by_bus.get(int(bus), [])]
+
+    def of_model(self, model):
+        """Records of one model name (case-insensitive)."""
+        return [self.records[i] for i in self.by_model.get(str(model).upper(), [])]
+
+    def index_of(self, bus, model, id):
+        """Position of the (bus, model, id) record in self.records, or None."""
+        return self.by_key.get((int(bus), str(model).upper(), str(id).strip()))
+
+    def get(self, bus, model, id):
+        """Single record by (bus, model, id), or None."""
+        i = self.index_of(bus, model, id)
+        return None if i is None else self.records[i]
+
+    def models(self):
+        """{model: record count}, most frequent first."""
+        return dict(sorted(((m, len(ix)) for m, ix in self.by_model.items()),
+                           key=lambda kv: (-kv[1], kv[0])))
+
+    def to_frame(self):
+        """One row per record (bus, model, id, n_params, line_no) as a DataFrame."""
+        import pandas as pd
+        return pd.DataFrame([{'bus': r['bus'], 'model': r['model'], 'id': r['id'],
+                              'n_params': len(r['params']), 'line_no': r['line_no']}
+                             for r in self.records])
+
+    # ── patching / rendering ──────────────────────────────────────────────
+
+    @staticmethod
+    def patch(rec, bus=None, id=None, params=None):
+        """
+        Patched copy of a record (the catalogue itself is not modified).
+
+        Parameters
+        ----------
+        bus    : new bus number
+        id     : new id (quoted on output if the original was quoted)
+        params : {parameter index: new value}
+        """
+        lines = [list(toks) for toks in rec['lines']]
+        pos   = [(li, ti) for li, toks in enumerate(lines) for ti in range(len(toks))]
+        new   = dict(rec, lines=lines, params=list(rec['params']), text=None)
+
+        if bus is not None:
+            li, ti = pos[0]
+            lines[li][ti] = str(int(bus))
+            new['bus'] = int(bus)
+        if id is not None:
+            li, ti = pos[2]
+            q = lines[li][ti][0] if lines[li][ti][:1] in ("'", '"') else ''
+            lines[li][ti] = f"{q}{id}{q}"
+            new['id'] = str(id)
+        for p, value in (params or {}).items():
+            li, ti = pos[3 + p]
+            old = lines[li][ti]
+            q = old[0] if old[:1] in ("'", '"') else ''
+            lines[li][ti] = f"{q}{value}{q}" if q else _format_value(value)
+            new['params'][p] = value
+        return new
+
+    @staticmethod
+    def render(rec):
+        """DYR text of one record (original text unless patched, then its line layout)."""
+        if rec.get('text'):
+            return rec['text']
+        body = [' '.join(toks) for toks in rec['lines']]
+        tail = rec['comment'] or '/'
+        body[-1] = f"{body[-1]}  {tail}"
+        return '\n'.join(body)
+
+    def fragment(self, records):
+        """DYR text containing only the given records (e.g. for psspy.dyre_add)."""
+        return '\n'.join(self.render(r) for r in records) + '\n'
+
+    def variant(self, patched):
+        """
+        Full file text with some records replaced.
+
+        Parameters
+        ----------
+        patched : {record index (see index_of): patched record}
+        """
+        out = []
+        for chunk in self._chunks:
+            if isinstance(chunk, int):
+                rec = patched.get(chunk, self.records[chunk])
+                out.append(self.render(rec))
+            else:
+                out.append(chunk)
+        return '\n'.join(out) + '\n'
+
+    def write(self, path, records=None, patched=None):
+        """Write a fragment (records) or a full variant (patched) to path."""
+        text = self.fragment(records) if records is not None else self.variant(patched or {})
+        Path(path).write_text(text)
+        return Path(path)
+
+
+if __name__ == '__main__':
+    dyr_file = sys.argv[1] if len(sys.argv) > 1 else "PSSE_Cases/240busWECC_2018_PSS.dyr"
+    cat      = DyrCatalog.read(dyr_file)
+    print(f"{dyr_file}: {len(cat.records)} records, {len(cat.by_bus)} buses, "
+          f"{len(cat.by_model)} models")
+    if len(sys.argv) > 2:
+        for rec in cat.at_bus(int(sys.argv[2])):
+            print(f"  line {rec['line_no']:>6}  {rec['model']:<10} id {rec['id']:<4} "
+                  f"{len(rec['params'])} params")
+    else:
+        for model, n in cat.models().items():
+            print(f"  {model:<10} {n:>5}")
@@ -0,0 +1,327 @@
+"""
+mode_atlas.py
+=============
+System-wide store of the modes estimated by Step2c_mode_estimates.py.
+
+Step2c writes one ``mode_estimates_<bus>.csv`` per bus. The atlas collects
+those tables into a single SQLite database indexed by bus, case hash,
+frequency band and damping, so questions such as "which buses excite a
+0.2-0.4 Hz mode with damping below 5 %" become one indexed query.
+Similar modes seen from different locations can be grouped with
+``cluster_modes``.
+
+Outputs (written to Processing/):
+  mode_atlas.sqlite   — table ``modes``, one row per (case, bus, mode)
+
+Usage:
+    python mode_atlas.py                         # import Processing/mode_estimates_*.csv
+    python mode_atlas.py --fmin 0.2 --fmax 0.4 --zeta-max 0.05
+
+From other scripts:
+    import mode_atlas
+    df = mode_atlas.query_modes(freq_min=0.2, freq_max=0.4, zeta_max=0.05)
+"""
+
+import argparse
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import case_fingerprint
+
+
+ATLAS_DB     = Path.cwd() / "Processing" / "mode_atlas.sqlite"
+CASE_DIR     = Path.cwd() / "PSSE_Cases"
+FREQ_TOL     = 0.05    # relative frequency tolerance when clustering modes
+ZETA_TOL     = 0.02    # absolute damping tolerance when clustering modes
+
+# Frequency bands used to tag each mode (Hz, lower bound inclusive)
+FREQ_BANDS = [
+    ("inter-area", 0.0, 1.0),
+    ("local",      1.0, 2.0),
+    ("control",    2.0, np.inf),
+]
+
+MODE_COLUMNS = ["omega_n", "omega_d", "freq_hz", "zeta",
+                "amplitude", "phase", "omega_fft"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS modes (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_hash  TEXT    NOT NULL,
+    case_name  TEXT,
+    bus        INTEGER NOT NULL,
+    rank       INTEGER NOT NULL,
+    band       TEXT    NOT NULL,
+    freq_hz    REAL    NOT NULL,
+    zeta       REAL    NOT NULL,
+    omega_n    REAL,
+    omega_d    REAL,
+    amplitude  REAL,
+    phase      REAL,
+    omega_fft  REAL,
+    source     TEXT,
+    created    TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_modes_freq_zeta ON modes (freq_hz, zeta);
+CREATE INDEX IF NOT EXISTS ix_modes_band_zeta ON modes (band, zeta);
+CREATE INDEX IF NOT EXISTS ix_modes_bus       ON modes (bus);
+CREATE INDEX IF NOT EXISTS ix_modes_case      ON modes (case_hash, bus);
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def case_hash(case_name, case_dir=CASE_DIR):
+    """Digest of the .sav/.raw/.dyr files of a case (case_fingerprint, as used by Step1/Step2a)."""
+    return case_fingerprint.fingerprint(case_fingerprint.case_files(case_name, case_dir))["digest"]
+
+
+def freq_band(freq_hz):
+    """Band label for a frequency (scalar or array)."""
+    f      = np.asarray(freq_hz, dtype=float)
+    labels = np.full(f.shape, FREQ_BANDS[-1][0], dtype=object)
+    for name, lo, hi in reversed(FREQ_BANDS):
+        labels[(f >= lo) & (f < hi)] = name
+    return labels if labels.ndim else labels.item()
+
+
+def connect(db_path=ATLAS_DB):
+    """Open (and create if needed) the atlas database."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path)
+    con.executescript(_SCHEMA)
+    return con
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WRITING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def add_modes(modes, bus, case_hash, case_name=None, source=None, db_path=ATLAS_DB):
+    """Register the modes of one bus. Replaces any earlier entry for the same
+    (case_hash, bus) so re-running Step2c does not duplicate rows.
+
+    Parameters
+    ----------
+    modes : list of dict or DataFrame
+        Mode table as returned by ``extract_modes`` / written by Step2c.
+    bus : int
+        Bus where the impulse was injected.
+    case_hash : str
+        Case identifier, normally from ``case_hash(case_name)``.
+
+    Returns
+    -------
+    int : number of modes stored
+    """
+    df = pd.DataFrame(modes)
+    if df.empty:
+        return 0
+    df = df.reindex(columns=MODE_COLUMNS)
+    df = df.sort_values("amplitude", ascending=False).reset_index(drop=True)
+
+    rows = pd.DataFrame({
+        "case_hash": case_hash,
+        "case_name": case_name,
+        "bus":       int(bus),
+        "rank":      np.arange(len(df)),
+        "band":      freq_band(df["freq_hz"].to_numpy()),
+        **{c: df[c].astype(float) for c in MODE_COLUMNS},
+        "source":    None if source is None else str(source),
+        "created":   datetime.now().isoformat(timespec="seconds"),
+    })
+
+    con = connect(db_path)
+    with con:
+        con.execute("DELETE FROM modes WHERE case_hash = ? AND bus = ?",
+                    (case_hash, int(bus)))
+        rows.to_sql("modes", con, if_exists="append", index=False)
+    con.close()
+    return len(rows)
+
+
+def import_csv_dir(data_dir, case_hash, case_name=None, db_path=ATLAS_DB):
+    """Load every ``mode_estimates_<bus>.csv`` in data_dir into the atlas.
+    Returns the number of buses imported."""
+    n_bus = 0
+    for path in sorted(Path(data_dir).glob("mode_estimates_*.csv")):
+        m = re.match(r"mode_estimates_(\d+)\.csv$", path.name)
+        if not m:
+            continue
+        n = add_modes(pd.read_csv(path), int(m.group(1)), case_hash,
+                      case_name=case_name, source=path.name, db_path=db_path)
+        print(f"  {path.name}: {n} mode(s)")
+        n_bus += 1
+    return n_bus
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERIES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def query_modes(freq_min=None, freq_max=None, zeta_max=None, bus=None,
+                case_hash=None, band=None, db_path=ATLAS_DB):
+    """Indexed query on the atlas. Every filter is optional.
+
+    Example: all buses exciting a 0.2-0.4 Hz mode with damping < 5 %
+        query_modes(freq_min=0.2, freq_max=0.4, zeta_max=0.05)
+
+    Returns a DataFrame sorted by damping (least damped first).
+    """
+    where, args = [], []
+    if freq_min is not None:
+        where.append("freq_hz >= ?"); args.append(float(freq_min))
+    if freq_max is not None:
+        where.append("freq_hz <= ?"); args.append(float(freq_max))
+    if zeta_max is not None:
+        where.append("zeta < ?");     args.append(float(zeta_max))
+    if band is not None:
+        where.append("band = ?");     args.append(band)
+    if case_hash is not None:
+        where.append("case_hash = ?"); args.append(case_hash)
+    if bus is not None:
+        buses = [int(b) for b in np.atleast_1d(bus)]
+        where.append(f"bus IN ({','.join('?' * len(buses))})"); args.extend(buses)
+
+    sql = "SELECT * FROM modes"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY zeta, freq_hz"
+
+    if not Path(db_path).exists():
+        return pd.DataFrame(columns=["case_hash", "case_name", "bus", "rank",
+                                     "band", *MODE_COLUMNS, "source"])
+    con = connect(db_path)
+    df  = pd.read_sql_query(sql, con, params=args)
+    con.close()
+    return df
+
+
+def cluster_modes(df=None, freq_tol=FREQ_TOL, zeta_tol=ZETA_TOL, db_path=ATLAS_DB):
+    """Group similar modes seen from different locations.
+
+    Modes are sorted by frequency and a new cluster starts wherever the
+    relative gap to the previous mode exceeds freq_tol; each frequency group
+    is then split the same way on damping with the absolute zeta_tol.
+
+    Returns (modes, clusters): the input rows with a ``cluster`` column, and
+    one summary row per cluster (mean frequency, damping range, buses).
+    """
+    if df is None:
+        df = query_modes(db_path=db_path)
+    df = df.sort_values("freq_hz").reset_index(drop=True)
+    if df.empty:
+        return df.assign(cluster=pd.Series(dtype=int)), pd.DataFrame()
+
+    f        = df["freq_hz"].to_numpy()
+    rel_gap  = np.diff(f) / np.maximum(f[:-1], 1e-12)
+    f_group  = np.concatenate([[0], np.cumsum(rel_gap > freq_tol)])
+
+    df["_fg"] = f_group
+    df = df.sort_values(["_fg", "zeta"]).reset_index(drop=True)
+    z        = df["zeta"].to_numpy()
+    new_fg   = np.diff(df["_fg"].to_numpy()) != 0
+    new_z    = np.diff(z) > zeta_tol
+    df["cluster"] = np.concatenate([[0], np.cumsum(new_fg | new_z)])
+    df = df.drop(columns="_fg")
+
+    clusters = (df.groupby("cluster")
+                  .agg(freq_hz   = ("freq_hz", "mean"),
+                       freq_min  = ("freq_hz", "min"),
+                       freq_max  = ("freq_hz", "max"),
+                       zeta_min  = ("zeta", "min"),
+                       zeta_mean = ("zeta", "mean"),
+                       n_buses   = ("bus", "nunique"),
+                       buses     = ("bus", lambda b: " ".join(map(str, sorted(set(b))))))
+                  .reset_index())
+    clusters["band"] = freq_band(clusters["freq_hz"].to_numpy())
+    return df, clusters
+
+
+def sweep_frequencies(bus=None, case_hash=None, zeta_max=None, top_n=3,
+                      db_path=ATLAS_DB):
+    """Candidate oscillation frequencies (Hz) for a Step4 sweep: the least
+    damped atlas modes, optionally restricted to one bus and case."""
+    df = query_modes(zeta_max=zeta_max, bus=bus, case_hash=case_hash, db_path=db_path)
+    return [round(float(f), 3) for f in df["freq_hz"].head(top_n)]
+
+
+
+def resolve_frequency(config, db_path=ATLAS_DB, case_dir=CASE_DIR):
+    """Oscillation frequency (Hz) of the run described by simulation_config.csv.
+
+    The configured ``oscillation_frequency`` when set. When it is left blank,
+    the least-damped atlas mode seen from ``bus_number`` — the frequency Step4
+    then simulates. Every step resolves the frequency here, so the file names
+    it builds match the ones Step4 wrote.
+
+    Parameters
+    ----------
+    config : DataFrame with Variable / Value columns (simulation_config.csv)
+
+    Raises ValueError when the frequency is blank and the atlas has no entry.
+    """
+    def _value(var):
+        row = config[config.Variable == var]
+        v   = "" if row.empty else str(row["Value"].iloc[0]).strip()
+        return None if v.lower() in ("", "nan") else v
+
+    freq = _value("oscillation_frequency")
+    if freq is not None:
+        return float(freq)
+
+    bus        = int(_value("bus_number"))
+    candidates = sweep_frequencies(bus=bus, case_hash=case_hash(_value("case_name"), case_dir),
+                                   db_path=db_path)
+    if not candidates:
+        raise ValueError(f"oscillation_frequency not set and no mode atlas entry for bus {bus}. "
+                         "Run Step2c_mode_estimates.py or set the frequency in simulation_config.csv.")
+    print(f"-> Mode atlas candidates for bus {bus}: {candidates} Hz (using {candidates[0]} Hz)")
+    return candidates[0]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the mode atlas.")
+    parser.add_argument("--fmin",     type=float, default=None, help="Lower frequency bound (Hz)")
+    parser.add_argument("--fmax",     type=float, default=None, help="Upper frequency bound (Hz)")
+    parser.add_argument("--zeta-max", type=float, default=None, help="Damping ratio upper bound (e.g. 0.05)")
+    parser.add_argument("--no-import", action="store_true",     help="Query only, skip CSV import")
+    args = parser.parse_args()
+
+    root     = Path.cwd()
+    data_dir = root / "Processing"
+
+    if not args.no_import:
+        config    = pd.read_csv(root / "modal_analysis_config.csv")
+        row       = config[config.Variable == "case_name"]
+        case_name = str(row["Value"].iloc[0]).strip() if not row.empty else None
+        c_hash    = case_hash(case_name) if case_name else "unknown"
+        print(f"-> Importing mode estimates for {case_name} (case hash {c_hash})")
+        n_bus = import_csv_dir(data_dir, c_hash, case_name=case_name)
+        print(f"-> {n_bus} bus(es) in {ATLAS_DB}")
+
+    hits = query_modes(freq_min=args.fmin, freq_max=args.fmax, zeta_max=args.zeta_max)
+    print(f"\n{len(hits)} mode(s) match")
+    if not hits.empty:
+        print(hits[["bus", "band", "freq_hz", "zeta", "amplitude", "case_name"]]
+              .to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    _, clusters = cluster_modes(hits)
+    if not clusters.empty:
+        print(f"\n{len(clusters)} mode cluster(s)")
+        print(clusters.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
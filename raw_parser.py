@@ -0,0 +1,449 @@
+"""
+raw_parser.py
+=============
+Pure-Python reader for PSS/E RAW files (revisions 33, 34 and 35).
+
+Builds the same bus, branch, generator, load, area and inter-area tables as
+Step1_extract_case_info.py without a PSS/E session, so case metadata for
+Steps 3b, 5 and 7 can be produced on any platform. The file is streamed
+line by line and section by section; records are converted straight into
+column lists and reading stops after the last section that is needed.
+
+Solved quantities come from the voltage solution stored in the RAW file
+(bus VM/VA and machine PG/QG):
+  - branch flows and I^2 Z losses from the pi model of each non-transformer
+    branch (transformers are skipped, as in Step1's abrn* queries),
+  - actual load components as PSS/E reports them: P/Q + I*V + Y*V^2,
+  - machine loading as |PG + jQG| / MBASE, after the reactive output of
+    buses with several machines is re-shared the way PSS/E allocates it
+    (in proportion to PGEN, machines at QMAX / QMIN held at the limit);
+    RAW files often store an even split, which put single machines off by
+    hundreds of Mvar.
+PQBRAK/low-voltage load reduction is not modelled. Step1 re-solves the case
+before extraction, so its tables differ where the stored solution was not
+fully converged: on the 240-bus WECC case by up to 0.4 MW / 1.9 Mvar on
+branch flows, 1.7 Mvar on QGEN and 0.05 points on machine loading.
+Area PNET is the export over non-transformer tie branches.
+
+Usage:
+    python raw_parser.py PSSE_Cases/240busWECC_2018_PSS.raw   # table summary
+    (Step1_extract_case_info.py with extract_engine = raw writes the CSVs)
+
+From other scripts:
+    import raw_parser
+    tables = raw_parser.parse_raw(raw_file)       # {name: {column: array}}
+"""
+
+import csv
+import sys
+
+import numpy as np
+
+
+# Section order after the bus data (the bus section starts right after the
+# case identification / system-wide data)
+SECTIONS_V33 = ["bus", "load", "fixed_shunt", "generator", "branch",
+                "transformer", "area", "two_terminal_dc", "vsc_dc",
+                "impedance_correction", "multi_terminal_dc", "multi_section_line",
+                "zone", "interarea", "owner", "facts", "switched_shunt", "gne",
+                "induction_machine"]
+SECTIONS_V34 = ["bus", "load", "fixed_shunt", "generator", "branch",
+                "switching_device", "transformer", "area", "two_terminal_dc",
+                "vsc_dc", "impedance_correction", "multi_terminal_dc",
+                "multi_section_line", "zone", "interarea", "owner", "facts",
+                "switched_shunt", "gne", "induction_machine", "substation"]
+
+NEEDED = ("bus", "load", "generator", "branch", "area", "interarea")
+
+# Record filters matching Step1's PSS/E queries: in-service buses, loads and
+# non-transformer branches (flag 1), all machines (flag 4)
+IN_SERVICE = {
+    "bus":    lambda r, rev: _int(r, 3, 1) != 4,
+    "load":   lambda r, rev: _int(r, 2, 1) != 0,
+    "branch": lambda r, rev: _int(r, 13 if rev <= 33 else 23, 1) != 0,
+}
+
+BUS_HEADERS = ['BUS_NUM', 'NAME', 'BASKV', 'TYPE', 'AREA', 'ZONE', 'OWNER',
+               'VM_PU', 'VA_DEG', 'NVHI', 'NVLO', 'EVHI', 'EVLO']
+BRANCH_HEADERS = ['FROM_BUS', 'TO_BUS', 'CKT', 'STAT', 'R_PU', 'X_PU', 'B_PU',
+                  'RATE_A_MVA', 'RATE_B_MVA', 'RATE_C_MVA', 'LENGTH', 'MET',
+                  'FROM_KV', 'TO_KV', 'P_FROM_MW', 'Q_FROM_MVAR',
+                  'MVA', 'LOADING_PCT', 'PLOSS_MW', 'QLOSS_MVAR']
+GEN_HEADERS = ['BUS_NUM', 'ID', 'STAT', 'AREA', 'ZONE', 'PGEN_MW', 'QGEN_MVAR',
+               'PMAX_MW', 'PMIN_MW', 'QMAX_MVAR', 'QMIN_MVAR',
+               'MBASE_MVA', 'LOADING_PCT', 'BUS_KV', 'VM_PU', 'VA_DEG']
+LOAD_HEADERS = ['BUS_NUM', 'ID', 'STAT', 'AREA', 'ZONE', 'OWNER',
+                'PL_MW', 'QL_MVAR', 'IP_MW', 'IQ_MVAR', 'YP_MW', 'YQ_MVAR',
+                'PTOTAL_MW', 'QTOTAL_MVAR', 'BUS_KV', 'VM_PU', 'VA_DEG']
+AREA_HEADERS = ['AREA_NUM', 'AREA_NAME', 'ISW', 'PDES', 'PTOL', 'PNET', 'PGEN', 'PLOAD']
+INTERAREA_HEADERS = ['FROM_AREA', 'TO_AREA', 'CKT', 'PDES', 'PTOL', 'PACT']
+TRANSFORMER_HEADERS = ['FROM_BUS', 'TO_BUS', 'CKT', 'STAT', 'R_PU', 'X_PU']
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LINE / RECORD STREAMING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _strip_comment(line):
+    """Drop a trailing '/ comment' that is not inside a quoted string."""
+    if '/' not in line:
+        return line
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch in "'\"":
+            quoted = not quoted
+        elif ch == '/' and not quoted:
+            return line[:i]
+    return line
+
+
+def fields(line):
+    """Split one RAW data line into stripped fields (quotes removed)."""
+    line = _strip_comment(line).strip()
+    if not line:
+        return []
+    if ',' not in line:
+        return [f.strip("'\"") for f in line.split()]
+    row = next(csv.reader([line], quotechar="'", skipinitialspace=True))
+    return [f.strip().strip('"') for f in row]
+
+
+def _is_end(line):
+    """Section terminator: a record whose first field is exactly 0 (or Q)."""
+    head = _strip_comment(line).replace(',', ' ').split()
+    return bool(head) and head[0] in ('0', 'Q')
+
+
+def read_header(lines):
+    """
+    Consume the case identification (and, for rev >= 34, system-wide data).
+
+    Returns
+    -------
+    dict with ic, sbase, rev, basfrq, title
+    """
+    first = fields(next(lines))
+    rev   = int(float(first[2])) if len(first) > 2 and first[2] else 33
+    head  = {'ic':     int(float(first[0])) if first and first[0] else 0,
+             'sbase':  float(first[1]) if len(first) > 1 and first[1] else 100.0,
+             'rev':    rev,
+             'basfrq': float(first[5]) if len(first) > 5 and first[5] else 60.0,
+             'title':  [next(lines).rstrip('\n'), next(lines).rstrip('\n')]}
+    return head
+
+
+def iter_sections(path, sections=NEEDED):
+    """
+    Stream the RAW file and yield (section, record) for the requested sections.
+
+    A record is a list of field lists, one per physical line (transformers
+    span 4 or 5 lines, every other section used here one line). Reading stops
+    once every requested section has been passed. The first item yielded is
+    ('header', header dict).
+    """
+    wanted = set(sections)
+    with open(path, 'r', errors='replace') as f:
+        lines = (ln for ln in f if not ln.lstrip().startswith('@!'))
+        head  = read_header(lines)
+        yield 'header', head
+        order = SECTIONS_V33 if head['rev'] <= 33 else SECTIONS_V34
+
+        line = next(lines, None)
+        if head['rev'] >= 34:
+            # system-wide data block (GENERAL, GAUSS, ... RATING records)
+            while line is not None and not _is_end(line):
+                line = next(lines, None)
+            line = next(lines, None)
+
+        for name in order:
+            if not wanted:
+                return
+            while line is not None and not _is_end(line):
+                if name == 'transformer':
+                    rec = [fields(line)]
+                    k   = rec[0][2] if len(rec[0]) > 2 else '0'
+                    for _ in range(3 if k.strip() in ('0', '') else 4):
+                        rec.append(fields(next(lines, '')))
+                else:
+                    rec = [fields(line)]
+                if name in wanted:
+                    yield name, rec
+                line = next(lines, None)
+            wanted.discard(name)
+            if line is None or line.strip().startswith('Q'):
+                return
+            line = next(lines, None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TABLE ASSEMBLY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _num(rec, i, default=0.0):
+    """Field i as float (blank or missing -> default)."""
+    try:
+        v = rec[i]
+    except IndexError:
+        return default
+    return float(v) if v != '' else default
+
+
+def _int(rec, i, default=0):
+    return int(_num(rec, i, default))
+
+
+def _str(rec, i, default=''):
+    return rec[i].strip() if i < len(rec) else default
+
+
+def _column_table(headers, rows, dtypes):
+    """Lists of per-record tuples -> {column: typed array}."""
+    cols = list(zip(*rows)) if rows else [()] * len(headers)
+    return {h: np.array(c, dtype=d) for h, c, d in zip(headers, cols, dtypes)}
+
+
+def _bus_index(bus_nums, bus):
+    """Position of each bus number in the bus table (-1 if unknown)."""
+    order = np.argsort(bus_nums, kind='stable')
+    if len(order) == 0:
+        return np.full(len(bus), -1)
+    pos = np.clip(np.searchsorted(bus_nums[order], bus), 0, len(order) - 1)
+    idx = order[pos]
+    return np.where(bus_nums[idx] == bus, idx, -1)
+
+
+def _at(values, idx, default):
+    """values[idx] with default where idx == -1."""
+    if len(values) == 0:
+        return np.full(len(idx), default, dtype=np.asarray(default).dtype)
+    return np.where(idx >= 0, values[np.maximum(idx, 0)], default)
+
+
+def parse_raw(path):
+    """
+    Parse a RAW file into Step1-compatible tables.
+
+    Returns
+    -------
+    dict {buses, branches, generators, loads, areas: {column: array}},
+    plus 'header' (ic, sbase, rev, basfrq, title)
+    """
+    raw = {name: [] for name in NEEDED}
+    head = None
+    for name, rec in iter_sections(path):
+        if name == 'header':
+            head = rec
+        elif name in IN_SERVICE and not IN_SERVICE[name](rec[0], head['rev']):
+            continue
+        else:
+            raw[name].append(rec[0])
+    rev, sbase = head['rev'], head['sbase']
+
+    # --- buses ---
+    buses = _column_table(BUS_HEADERS, [
+        (_int(r, 0), _str(r, 1), _num(r, 2), _int(r, 3, 1), _int(r, 4, 1),
+         _int(r, 5, 1), _int(r, 6, 1), _num(r, 7, 1.0), _num(r, 8),
+         _num(r, 9, 1.1), _num(r, 10, 0.9), _num(r, 11, 1.1), _num(r, 12, 0.9))
+        for r in raw['bus']],
+        [np.int64, object] + [float] + [np.int64] * 4 + [float] * 6)
+    nums = buses['BUS_NUM']
+    v    = buses['VM_PU'] * np.exp(1j * np.deg2rad(buses['VA_DEG']))
+
+    # --- loads ---  I, ID, STATUS, AREA, ZONE, PL, QL, IP, IQ, YP, YQ, OWNER
+    ld = _column_table(['BUS_NUM', 'ID', 'STAT', 'AREA', 'ZONE', 'PL', 'QL',
+                        'IP', 'IQ', 'YP', 'YQ', 'OWNER'], [
+        (_int(r, 0), _str(r, 1, '1'), _int(r, 2, 1), _int(r, 3), _int(r, 4),
+         _num(r, 5), _num(r, 6), _num(r, 7), _num(r, 8), _num(r, 9), _num(r, 10),
+         _int(r, 11, 1))
+        for r in raw['load']],
+        [np.int64, object] + [np.int64] * 3 + [float] * 6 + [np.int64])
+    li  = _bus_index(nums, ld['BUS_NUM'])
+    vm  = _at(buses['VM_PU'], li, 0.0)
+    on  = ld['STAT'] != 0
+    pl, ql = np.where(on, ld['PL'], 0.0), np.where(on, ld['QL'], 0.0)
+    ip, iq = np.where(on, ld['IP'] * vm, 0.0), np.where(on, ld['IQ'] * vm, 0.0)
+    yp, yq = np.where(on, ld['YP'] * vm ** 2, 0.0), np.where(on, -ld['YQ'] * vm ** 2, 0.0)
+    loads = {
+        'BUS_NUM': ld['BUS_NUM'], 'ID': ld['ID'], 'STAT': ld['STAT'],
+        'AREA': ld['AREA'], 'ZONE': ld['ZONE'], 'OWNER': ld['OWNER'],
+        'PL_MW': pl, 'QL_MVAR': ql, 'IP_MW': ip, 'IQ_MVAR': iq,
+        'YP_MW': yp, 'YQ_MVAR': yq,
+        'PTOTAL_MW': pl + ip + yp, 'QTOTAL_MVAR': ql + iq + yq,
+        'BUS_KV': _at(buses['BASKV'], li, 0.0),
+        'VM_PU': vm, 'VA_DEG': _at(buses['VA_DEG'], li, 0.0),
+    }
+
+    # --- generators ---  I, ID, PG, QG, QT, QB, VS, IREG, [NREG,] MBASE, ...
+    #     rev 35 inserts NREG after IREG, shifting MBASE onwards by one field
+    s = 1 if rev >= 35 else 0
+    gens = _column_table(['BUS_NUM', 'ID', 'PGEN_MW', 'QGEN_MVAR', 'QMAX_MVAR',
+                          'QMIN_MVAR', 'MBASE_MVA', 'STAT', 'PMAX_MW', 'PMIN_MW'], [
+        (_int(r, 0), _str(r, 1, '1'), _num(r, 2), _num(r, 3), _num(r, 4, 9999.0),
+         _num(r, 5, -9999.0), _num(r, 8 + s, sbase), _int(r, 14 + s, 1),
+         _num(r, 16 + s, 9999.0), _num(r, 17 + s, -9999.0))
+        for r in raw['generator']],
+        [np.int64, object] + [float] * 5 + [np.int64] + [float] * 2)
+    gi = _bus_index(nums, gens['BUS_NUM'])
+    gens['QGEN_MVAR'] = _share_bus_q(gi, gens['STAT'] != 0, gens['QGEN_MVAR'], gens['PGEN_MW'],
+                                     gens['QMAX_MVAR'], gens['QMIN_MVAR'])
+    mbase = gens['MBASE_MVA']
+    generators = {
+        'BUS_NUM': gens['BUS_NUM'], 'ID': gens['ID'], 'STAT': gens['STAT'],
+        'AREA': _at(buses['AREA'], gi, 0), 'ZONE': _at(buses['ZONE'], gi, 0),
+        'PGEN_MW': gens['PGEN_MW'], 'QGEN_MVAR': gens['QGEN_MVAR'],
+        'PMAX_MW': gens['PMAX_MW'], 'PMIN_MW': gens['PMIN_MW'],
+        'QMAX_MVAR': gens['QMAX_MVAR'], 'QMIN_MVAR': gens['QMIN_MVAR'],
+        'MBASE_MVA': mbase,
+        'LOADING_PCT': np.where(mbase > 0, 100.0 * np.abs(gens['PGEN_MW'] + 1j * gens['QGEN_MVAR'])
+                                / np.where(mbase > 0, mbase, 1.0), 0.0),
+        'BUS_KV': _at(buses['BASKV'], gi, 0.0),
+        'VM_PU': _at(buses['VM_PU'], gi, 0.0), 'VA_DEG': _at(buses['VA_DEG'], gi, 0.0),
+    }
+
+    # --- branches ---
+    #   rev 33 : I, J, CKT, R, X, B, RATEA, RATEB, RATEC, GI, BI, GJ, BJ, ST, MET, LEN
+    #   rev 34+: I, J, CKT, R, X, B, NAME, RATE1..RATE12, GI, BI, GJ, BJ, STAT, MET, LEN
+    g0 = 9 if rev <= 33 else 19
+    r0 = 6 if rev <= 33 else 7
+    br = _column_table(['FROM_BUS', 'TO_BUS', 'CKT', 'R_PU', 'X_PU', 'B_PU',
+                        'RATE_A_MVA', 'RATE_B_MVA', 'RATE_C_MVA',
+                        'GI', 'BI', 'GJ', 'BJ', 'STAT', 'MET', 'LENGTH'], [
+        (abs(_int(r, 0)), abs(_int(r, 1)), _str(r, 2, '1'), _num(r, 3), _num(r, 4), _num(r, 5),
+         _num(r, r0), _num(r, r0 + 1), _num(r, r0 + 2),
+         _num(r, g0), _num(r, g0 + 1), _num(r, g0 + 2), _num(r, g0 + 3),
+         _int(r, g0 + 4, 1), _int(r, g0 + 5, 1), _num(r, g0 + 6))
+        for r in raw['branch']],
+        [np.int64, np.int64, object] + [float] * 10 + [np.int64, np.int64, float])
+    # RAW MET: 1 = from end, 2 = to end -> metered bus number as in PSS/E
+    met = np.where(br['MET'] == 2, br['TO_BUS'], br['FROM_BUS'])
+    fi, ti = _bus_index(nums, br['FROM_BUS']), _bus_index(nums, br['TO_BUS'])
+    vf, vt = _at(v, fi, 0j), _at(v, ti, 0j)
+    z   = br['R_PU'] + 1j * br['X_PU']
+    on  = (br['STAT'] != 0) & (np.abs(z) > 0) & (fi >= 0) & (ti >= 0)
+    i_s = np.where(on, (vf - vt) / np.where(on, z, 1.0), 0j)     # series current
+    y_f = br['GI'] + 1j * (br['BI'] + br['B_PU'] / 2)
+    y_t = br['GJ'] + 1j * (br['BJ'] + br['B_PU'] / 2)
+    s_f = np.where(on, vf * np.conj(i_s + y_f * vf), 0j) * sbase
+    s_t = np.where(on, vt * np.conj(-i_s + y_t * vt), 0j) * sbase
+    loss = np.abs(i_s) ** 2 * z * sbase
+    mva  = np.abs(s_f)                                          # from end, as PSS/E 'MVA'
+    rate = br['RATE_A_MVA']
+    branches = {
+        'FROM_BUS': br['FROM_BUS'], 'TO_BUS': br['TO_BUS'], 'CKT': br['CKT'],
+        'STAT': br['STAT'], 'R_PU': br['R_PU'], 'X_PU': br['X_PU'], 'B_PU': br['B_PU'],
+        'RATE_A_MVA': rate, 'RATE_B_MVA': br['RATE_B_MVA'], 'RATE_C_MVA': br['RATE_C_MVA'],
+        'LENGTH': br['LENGTH'], 'MET': met,
+        'FROM_KV': _at(buses['BASKV'], fi, 0.0), 'TO_KV': _at(buses['BASKV'], ti, 0.0),
+        'P_FROM_MW': s_f.real, 'Q_FROM_MVAR': s_f.imag,
+        'MVA': mva,
+        'LOADING_PCT': np.where(rate > 0, 100.0 * np.maximum(mva, np.abs(s_t))
+                                / np.where(rate > 0, rate, 1.0), 0.0),
+        'PLOSS_MW': loss.real, 'QLOSS_MVAR': loss.imag,
+    }
+
+    # --- areas ---  I, ISW, PDES, PTOL, 'ARNAME'
+    ar = _column_table(['AREA_NUM', 'ISW', 'PDES', 'PTOL', 'AREA_NAME'], [
+        (_int(r, 0), _int(r, 1), _num(r, 2), _num(r, 3, 10.0), _str(r, 4))
+        for r in raw['area']],
+        [np.int64, np.int64, float, float, object])
+    a_num  = ar['AREA_NUM']
+    a_gen  = _area_sum(a_num, generators['AREA'], np.where(generators['STAT'] != 0,
+                                                           generators['PGEN_MW'], 0.0))
+    a_load = _area_sum(a_num, loads['AREA'], loads['PTOTAL_MW'])
+    # net interchange: flow leaving the area on non-transformer tie branches
+    fa, ta = _at(buses['AREA'], fi, 0), _at(buses['AREA'], ti, 0)
+    tie    = fa != ta
+    a_net  = (_area_sum(a_num, fa[tie], branches['P_FROM_MW'][tie])
+              + _area_sum(a_num, ta[tie], s_t.real[tie]))
+    areas = {'AREA_NUM': a_num, 'AREA_NAME': ar['AREA_NAME'], 'ISW': ar['ISW'],
+             'PDES': ar['PDES'], 'PTOL': ar['PTOL'],
+             'PNET': a_net, 'PGEN': a_gen, 'PLOAD': a_load}
+
+    # --- inter-area transfers ---  ARFROM, ARTO, TRID, PTRAN
+    #     only the schedule is stored in a RAW file (no tolerance or actual)
+    interarea = _column_table(INTERAREA_HEADERS, [
+        (_int(r, 0), _int(r, 1), _str(r, 2, '1'), _num(r, 3), 0.0, np.nan)
+        for r in raw['interarea']],
+        [np.int64, np.int64, object, float, float, float])
+
+    return {'header': head, 'buses': buses, 'branches': branches,
+            'generators': generators, 'loads': loads, 'areas': areas,
+            'interarea': interarea}
+
+
+def parse_transformers(path):
+    """
+    Two-winding transformers of a RAW file (Step1's tables have none).
+
+    Impedances are converted to the system base: CZ=2 values are on the
+    winding base SBASE1-2, CZ=3 gives load loss (W) and |Z| on that base.
+    STAT is 1 when the transformer is in service (RAW STAT 1), else 0.
+
+    Returns
+    -------
+    {column: array} with FROM_BUS, TO_BUS, CKT, STAT, R_PU, X_PU
+    """
+    rows, sbase = [], 100.0
+    for name, rec in iter_sections(path, ('transformer',)):
+        if name == 'header':
+            sbase = rec['sbase']
+            continue
+        r1, r2 = rec[0], rec[1]
+        if _int(r1, 2) != 0:                       # three-winding
+            continue
+        cz, r, x = _int(r1, 5, 1), _num(r2, 0), _num(r2, 1)
+        base     = _num(r2, 2, sbase) or sbase
+        if cz == 3:                                # R from load loss, X from |Z|
+            r = r / 1e6 / base
+            x = np.sqrt(max(x * x - r * r, 0.0))
+        if cz in (2, 3):
+            r, x = r * sbase / base, x * sbase / base
+        rows.append((_int(r1, 0), _int(r1, 1), _str(r1, 3),
+                     1 if _int(r1, 11, 1) == 1 else 0, r, x))
+    return _column_table(TRANSFORMER_HEADERS, rows,
+                         [np.int64, np.int64, object, np.int64, float, float])
+
+
+def _share_bus_q(bus_idx, on, qgen, pgen, qmax, qmin):
+    """
+    Reactive output of the in-service machines at each bus as PSS/E
+    allocates it after a solution: the bus total is shared in proportion to
+    PGEN, machines that would pass QMAX / QMIN are held at the limit and the
+    rest is shared again among the others. RAW files often store an even
+    split instead. Buses with one machine or no positive PGEN keep the
+    stored values.
+    """
+    q = qgen.copy()
+    buses, counts = np.unique(bus_idx[on & (bus_idx >= 0)], return_counts=True)
+    for b in buses[counts > 1]:
+        m = np.flatnonzero(on & (bus_idx == b))
+        if np.any(pgen[m] <= 0):
+            continue
+        total, free = qgen[m].sum(), np.ones(len(m), dtype=bool)
+        while free.any():
+            share = (total - q[m[~free]].sum()) * pgen[m] / pgen[m[free]].sum()
+            hi, lo = free & (share > qmax[m]), free & (share < qmin[m])
+            if not (hi.any() or lo.any()):
+                q[m[free]] = share[free]
+                break
+            q[m[hi]], q[m[lo]] = qmax[m[hi]], qmin[m[lo]]
+            free &= ~(hi | lo)
+    return q
+
+
+def _area_sum(area_nums, area, values):
+    """Sum of values grouped by area, aligned with area_nums."""
+    idx = _bus_index(np.asarray(area_nums), np.asarray(area))
+    out = np.zeros(len(area_nums))
+    np.add.at(out, idx[idx >= 0], np.asarray(values, dtype=float)[idx >= 0])
+    return out
+
+
+if __name__ == '__main__':
+    raw_file = sys.argv[1] if len(sys.argv) > 1 else "PSSE_Cases/240busWECC_2018_PSS.raw"
+    tables   = parse_raw(raw_file)
+    head     = tables.pop('header')
+    print(f"{raw_file}: RAW rev {head['rev']}, SBASE {head['sbase']} MVA")
+    for name, table in tables.items():
+        print(f"  {name:<11}: {len(next(iter(table.values())))} rows")
+    print("Run Step1_extract_case_info.py with extract_engine = raw to write the tables.")
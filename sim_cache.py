@@ -0,0 +1,183 @@
+"""
+sim_cache.py
+============
+Binary cache of a simulation CSV (results/<bus>_<freq>_Hz_<amp>MW_sim.csv)
+for fast access to single channels and time ranges.
+
+The CSV is parsed once into two files next to it:
+
+  <sim>.cache.npy   — float64 array (n_columns, n_samples), one row per CSV
+                      column (row 0 = time); opened memory-mapped, so reading
+                      one channel only touches that row
+  <sim>.cache.json  — column names plus the size and mtime of the source CSV
+
+The cache is rebuilt automatically whenever the CSV changes. Values are
+stored exactly as parsed (float64), so results match reading the CSV.
+
+Usage:
+    python sim_cache.py results/6508_1.2_Hz_100.0MW_sim.csv     # build / refresh
+
+From other scripts:
+    cache = sim_cache.SimCache.open(sim_file)
+    t, y  = cache.series("LINE_6502_6508_1_P", t0=5.0, t1=10.0, maxpts=2000)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_SUFFIX = ".cache.npy"
+META_SUFFIX  = ".cache.json"
+
+
+def cache_paths(sim_file):
+    """(data .npy, metadata .json) paths of the cache for a simulation CSV."""
+    sim_file = Path(sim_file)
+    stem     = sim_file.with_suffix("")
+    return Path(f"{stem}{CACHE_SUFFIX}"), Path(f"{stem}{META_SUFFIX}")
+
+
+def _source_stamp(sim_file):
+    st = Path(sim_file).stat()
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+def is_fresh(sim_file):
+    """True when the cache exists and was built from the current CSV."""
+    data_path, meta_path = cache_paths(sim_file)
+    if not (data_path.exists() and meta_path.exists()):
+        return False
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("source") == _source_stamp(sim_file)
+
+
+def build(sim_file):
+    """Parse the CSV and write the cache; returns the .npy path."""
+    data_path, meta_path = cache_paths(sim_file)
+    df = pd.read_csv(sim_file)
+    np.save(data_path, np.ascontiguousarray(df.to_numpy(dtype=np.float64).T))
+    with open(meta_path, "w") as f:
+        json.dump({"columns": [str(c) for c in df.columns],
+                   "source":  _source_stamp(sim_file)}, f)
+    return data_path
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DECIMATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _bucket_extrema(Y, n_buckets):
+    """Indices of the min and max of every column of Y in each of n_buckets."""
+    n, k   = Y.shape
+    size   = -(-n // n_buckets)                                   # ceil
+    padded = np.concatenate([Y, np.repeat(Y[-1:], n_buckets * size - n, axis=0)])
+    blocks = padded.reshape(n_buckets, size, k)
+    base   = (np.arange(n_buckets) * size)[:, None]
+    lo     = base + np.argmin(blocks, axis=1)                     # (n_buckets, k)
+    hi     = base + np.argmax(blocks, axis=1)
+    idx    = np.concatenate([[0], lo.ravel(), hi.ravel(), [n - 1]])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def minmax_indices(y, maxpts):
+    """
+    Sample indices that keep the minimum and maximum of every series in
+    each of a set of equal time buckets (in time order), plus the first and
+    last sample. Peaks survive decimation, unlike plain striding.
+
+    Series on one time axis usually peak at the same samples, so the
+    buckets start at maxpts/2 and are only halved while the union of the
+    selected samples exceeds maxpts. When even one bucket is too many
+    (maxpts < 2*k + 2 for k series), its extrema are thinned evenly,
+    keeping the first and last sample.
+
+    Parameters
+    ----------
+    y      : (n,) array, or (n, k) array of k series on one time axis
+    maxpts : upper bound on the number of indices returned (None = all)
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if maxpts is None or n <= maxpts:
+        return np.arange(n)
+    Y        = y.reshape(n, -1)
+    n_min    = max(1, (maxpts - 2) // (2 * Y.shape[1]))           # within budget if maxpts >= 2k+2
+    n_bucket = max(n_min, (maxpts - 2) // 2)
+    idx      = _bucket_extrema(Y, n_bucket)
+    while len(idx) > maxpts and n_bucket > n_min:
+        n_bucket = max(n_min, n_bucket // 2)
+        idx      = _bucket_extrema(Y, n_bucket)
+    if len(idx) > maxpts:
+        idx = idx[np.unique(np.linspace(0, len(idx) - 1, max(maxpts, 0)).round().astype(int))]
+    return idx
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# READER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class SimCache:
+    """Memory-mapped simulation cache.
+
+    columns : list of CSV column names (columns[0] is time)
+    data    : (n_columns, n_samples) float64 memmap
+    """
+
+    def __init__(self, data, columns):
+        self.data    = data
+        self.columns = columns
+        self.index   = {c: i for i, c in enumerate(columns)}
+
+    @classmethod
+    def open(cls, sim_file, rebuild=False):
+        """Open the cache of a simulation CSV, building it first if stale."""
+        data_path, meta_path = cache_paths(sim_file)
+        if rebuild or not is_fresh(sim_file):
+            print(f"-> Building simulation cache: {data_path.name}")
+            build(sim_file)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return cls(np.load(data_path, mmap_mode="r"), meta["columns"])
+
+    @property
+    def n_samples(self):
+        return self.data.shape[1]
+
+    def time(self):
+        return np.asarray(self.data[0])
+
+    def column(self, name):
+        """Full channel as a 1-D array (KeyError if unknown)."""
+        return np.asarray(self.data[self.index[name]])
+
+    def series(self, name, t0=None, t1=None, maxpts=None, shift=True):
+        """
+        Channel `name` restricted to t0 <= t <= t1, min/max decimated to at
+        most maxpts points. With shift=True time starts at 0 (as in the
+        Step5 time series) and t0 / t1 are on that axis.
+
+        Returns
+        -------
+        (t, y) — 1-D float64 arrays
+        """
+        t   = self.time()
+        off = t[0] if shift and len(t) else 0.0
+        lo  = 0 if t0 is None else int(np.searchsorted(t, t0 + off, side="left"))
+        hi  = len(t) if t1 is None else int(np.searchsorted(t, t1 + off, side="right"))
+        y   = np.asarray(self.data[self.index[name], lo:hi])
+        idx = minmax_indices(y, maxpts)
+        return t[lo:hi][idx] - off, y[idx]
+
+
+if __name__ == "__main__":
+    for sim_file in sys.argv[1:]:
+        cache = SimCache.open(sim_file, rebuild=True)
+        print(f"  {sim_file}: {len(cache.columns) - 1} channels, {cache.n_samples} samples")